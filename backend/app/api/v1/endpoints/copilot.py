@@ -63,6 +63,15 @@ def get_copilot_service():
     return _copilot_service
 
 
+async def close_copilot_service():
+    """Shut down the copilot service if it was started."""
+    global _copilot_service
+    
+    if _copilot_service is not None:
+        await _copilot_service.aclose()
+        _copilot_service = None
+
+
 # ============ Endpoints ============
 
 @router.post("/chat", response_model=ChatResponse)
@@ -62,6 +62,17 @@ def get_mcp_server():
     return _mcp_server
 
 
+async def close_mcp_server():
+    """Close the MCP server and the shared HTTP client it uses."""
+    global _mcp_server
+    
+    if _mcp_server is not None:
+        from ml.agent.http import close_client
+        await _mcp_server.close()
+        await close_client()
+        _mcp_server = None
+
+
 # =========================================================================
 # MCP Endpoints
 # =========================================================================
@@ -4,6 +4,8 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.v1.endpoints.copilot import close_copilot_service
+from app.api.v1.endpoints.mcp import close_mcp_server
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.services import get_automation_scheduler
@@ -20,6 +22,8 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         await automation_scheduler.stop()
+        await close_copilot_service()
+        await close_mcp_server()
         print("Shutting down PredictrAI API")
 
 
@@ -19,6 +19,7 @@ from ml.agent.copilot import (
     Priority,
     AgentMemory,
 )
+from ml.agent.event_monitor import CopilotService
 
 
 class TestAgentMemory:
@@ -381,3 +382,22 @@ class TestMaintenanceCopilot:
         
         action_types = [a.type for a in actions]
         assert ActionType.ESCALATE in action_types
+
+
+class TestCopilotService:
+    """Tests for the CopilotService singleton lifecycle."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_aclose_clears_singleton(self):
+        """Test that get_instance() after aclose() builds a fresh service."""
+        service = CopilotService.get_instance()
+        assert CopilotService.get_instance() is service
+        
+        await service.aclose()
+        
+        fresh = CopilotService.get_instance()
+        assert fresh is not service
+        await fresh.aclose()
+        assert CopilotService._instance is None
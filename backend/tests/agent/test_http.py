@@ -0,0 +1,33 @@
+"""
+Unit Tests for the Shared Agent HTTP Client.
+"""
+import pytest
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from ml.agent import http
+
+
+class TestSharedClient:
+    """Tests for get_client / close_client."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    def test_close_client_closes_out_of_loop_fallback(self):
+        """Test that the client created outside a running loop is closed on shutdown."""
+        fallback = http.get_client()
+        assert http.get_client() is fallback
+        
+        async def shutdown():
+            loop_client = http.get_client()
+            await http.close_client()
+            return loop_client
+        
+        loop_client = asyncio.run(shutdown())
+        
+        assert fallback.is_closed
+        assert loop_client.is_closed
+        assert http._default_client is None
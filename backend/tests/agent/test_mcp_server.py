@@ -0,0 +1,69 @@
+"""
+Unit Tests for the MCP Server Tool Cache.
+"""
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from ml.mcp.server import SensorMindMCPServer
+
+
+def counting_handler(result):
+    """Async tool handler that returns a fresh copy of result and counts calls."""
+    calls = []
+    
+    async def handler(**arguments):
+        calls.append(arguments)
+        return {key: list(value) if isinstance(value, list) else value for key, value in result.items()}
+    
+    return handler, calls
+
+
+class TestToolCache:
+    """Tests for SensorMindMCPServer._cached."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_cached_tools_hit_within_ttl(self):
+        """Test that a cached tool runs once per key within its TTL."""
+        server = SensorMindMCPServer()
+        handler, calls = counting_handler({"assets": ["pump-1"]})
+        
+        await server._cached("get_asset_health", handler, {"asset_id": "a1"})
+        await server._cached("get_asset_health", handler, {"asset_id": "a1"})
+        await server._cached("get_asset_health", handler, {"asset_id": "a2"})
+        
+        assert len(calls) == 2
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_uncached_tools_and_errors_always_run(self):
+        """Test that tools without a TTL and error results bypass the cache."""
+        server = SensorMindMCPServer()
+        handler, calls = counting_handler({"error": "upstream down"})
+        
+        await server._cached("get_asset_health", handler, {"asset_id": "a1"})
+        await server._cached("get_asset_health", handler, {"asset_id": "a1"})
+        await server._cached("create_alert", handler, {})
+        
+        assert len(calls) == 3
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_cached_results_are_isolated_per_caller(self):
+        """Test that mutating a returned result doesn't change the cached one."""
+        server = SensorMindMCPServer()
+        handler, _ = counting_handler({"assets": ["pump-1"]})
+        
+        first = await server._cached("get_all_assets", handler, {})
+        first["assets"].append("injected")
+        second = await server._cached("get_all_assets", handler, {})
+        second["assets"].clear()
+        third = await server._cached("get_all_assets", handler, {})
+        
+        assert third == {"assets": ["pump-1"]}
@@ -0,0 +1,549 @@
+"""
+Unit Tests for HTTP Ticket Providers.
+"""
+import asyncio
+import pytest
+import httpx
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from ml.agent.ticket_provider import (
+    JiraProvider,
+    MockTicketProvider,
+    WebhookProvider,
+    create_ticket_provider,
+    reset_provider_cache,
+    close_ticket_clients,
+    _loads,
+    _Throttle,
+    _TTLCache,
+)
+
+
+@pytest.fixture
+async def jira_transport():
+    """Route the shared Jira client through a mock transport."""
+    handlers = {}
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        return handlers["handle"](request)
+    
+    JiraProvider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    yield handlers
+    reset_provider_cache()
+    await JiraProvider.close_pool()
+
+
+@pytest.fixture
+async def webhook_transport():
+    """Route the shared webhook client through a mock transport."""
+    handlers = {}
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        return handlers["handle"](request)
+    
+    WebhookProvider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    yield handlers
+    reset_provider_cache()
+    await WebhookProvider.close_pool()
+
+
+class TestProviderFactory:
+    """Tests for create_ticket_provider memoization."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_shared_provider_closed_by_last_holder(self, jira_transport):
+        """Test that leaving one holder's context keeps a shared provider open."""
+        jira_transport["handle"] = lambda request: httpx.Response(200, json={"key": "OPS-1"})
+        
+        outer = create_ticket_provider("jira", base_url="https://jira.test")
+        async with outer:
+            client = outer.client
+            async with create_ticket_provider("jira", base_url="https://jira.test") as inner:
+                assert inner is outer
+            
+            # The other holder is still mid-use
+            assert not client.is_closed
+            response = await outer._request("GET", "https://jira.test/rest/api/3/issue/OPS-1")
+            assert response.status_code == 200
+        
+        assert client.is_closed
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_close_ticket_clients_ignores_holders(self, jira_transport):
+        """Test that shutdown closes shared providers regardless of holders."""
+        provider = create_ticket_provider("jira", base_url="https://jira.test")
+        create_ticket_provider("jira", base_url="https://jira.test")
+        client = provider.client
+        
+        await close_ticket_clients()
+        
+        assert client.is_closed
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record asyncio.sleep delays without waiting them out."""
+    delays = []
+    real_sleep = asyncio.sleep
+    
+    async def sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+    
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    return delays
+
+
+class TestRetries:
+    """Tests for _request retries."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_retries_gateway_error(self, jira_transport, sleeps):
+        """Test that a 503 is retried with backoff and the success returned."""
+        statuses = iter([503, 200])
+        jira_transport["handle"] = lambda request: httpx.Response(next(statuses))
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        response = await provider._request("GET", "https://jira.test/rest/api/3/myself")
+        
+        assert response.status_code == 200
+        assert len(sleeps) == 1
+        assert 0 <= sleeps[0] <= JiraProvider.BACKOFF_BASE
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_returns_last_response_after_max_attempts(self, jira_transport, sleeps):
+        """Test that retries stop at MAX_ATTEMPTS."""
+        calls = []
+        
+        def handle(request):
+            calls.append(request)
+            return httpx.Response(502)
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        response = await provider._request("GET", "https://jira.test/rest/api/3/myself")
+        
+        assert response.status_code == 502
+        assert len(calls) == JiraProvider.MAX_ATTEMPTS
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self, jira_transport, sleeps):
+        """Test that statuses outside RETRY_STATUSES return immediately."""
+        calls = []
+        
+        def handle(request):
+            calls.append(request)
+            return httpx.Response(404)
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        response = await provider._request("GET", "https://jira.test/rest/api/3/issue/OPS-9")
+        
+        assert response.status_code == 404
+        assert len(calls) == 1
+        assert sleeps == []
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_transport_error_raised_after_retries(self, jira_transport, sleeps):
+        """Test that connection errors are retried, then re-raised."""
+        calls = []
+        
+        def handle(request):
+            calls.append(request)
+            raise httpx.ConnectError("connection refused", request=request)
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        with pytest.raises(httpx.ConnectError):
+            await provider._request("GET", "https://jira.test/rest/api/3/myself")
+        
+        assert len(calls) == JiraProvider.MAX_ATTEMPTS
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_honors_retry_after(self, jira_transport, sleeps):
+        """Test that a 429's Retry-After replaces the backoff and pauses the throttle."""
+        responses = iter([httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200)])
+        jira_transport["handle"] = lambda request: next(responses)
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        response = await provider._request("GET", "https://jira.test/rest/api/3/myself")
+        
+        assert response.status_code == 200
+        # The retry waits for Retry-After, then the throttle's own pause
+        assert sleeps[0] == pytest.approx(7.0)
+        assert provider._throttle.limit < 8.0
+
+
+class TestThrottle:
+    """Tests for the AIMD throttle."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    def test_fast_responses_increase_limit(self):
+        """Test additive increase under the latency target."""
+        throttle = _Throttle(limit=4.0, alpha=0.5, max_limit=5.0)
+        
+        for _ in range(4):
+            throttle.observe(httpx.Response(200), latency=0.1)
+        
+        assert throttle.limit == 5.0
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    def test_overload_decreases_limit(self):
+        """Test multiplicative decrease on gateway errors and slow responses."""
+        throttle = _Throttle(limit=8.0, beta=0.5, latency_target=1.0, min_limit=1.0)
+        
+        throttle.observe(httpx.Response(503), latency=0.1)
+        assert throttle.limit == 4.0
+        
+        throttle.observe(httpx.Response(200), latency=5.0)
+        assert throttle.limit == 2.0
+        
+        for _ in range(3):
+            throttle.observe(httpx.Response(504), latency=0.1)
+        assert throttle.limit == 1.0
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    def test_low_rate_limit_budget_pauses(self):
+        """Test that a nearly exhausted budget backs off until the reset."""
+        throttle = _Throttle(limit=8.0)
+        response = httpx.Response(200, headers={
+            "X-RateLimit-Remaining": "2",
+            "X-RateLimit-Limit": "100",
+            "X-RateLimit-Reset": "30",
+        })
+        
+        throttle.observe(response, latency=0.1)
+        
+        assert throttle.limit == 4.0
+        assert throttle._paused_until > 0
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_acquire_bounds_concurrency(self):
+        """Test that no more than permits requests hold a slot at once."""
+        throttle = _Throttle(limit=2.0)
+        peak = 0
+        
+        async def request():
+            nonlocal peak
+            async with throttle.acquire():
+                peak = max(peak, throttle.in_flight)
+                await asyncio.sleep(0.01)
+        
+        await asyncio.gather(*[request() for _ in range(6)])
+        
+        assert peak == 2
+        assert throttle.in_flight == 0
+
+
+class TestTicketCache:
+    """Tests for get_ticket TTL caching."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_get_ticket_cached_until_update(self, jira_transport):
+        """Test that repeated gets are served from cache and updates invalidate it."""
+        gets = []
+        
+        def handle(request):
+            if request.method == "PUT":
+                return httpx.Response(204)
+            gets.append(request)
+            return httpx.Response(200, json={"key": "OPS-1", "fields": {"status": len(gets)}})
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        first = await provider.get_ticket("OPS-1")
+        second = await provider.get_ticket("OPS-1")
+        assert len(gets) == 1
+        assert second == first
+        assert gets[0].url.params["fields"] == ",".join(JiraProvider.TICKET_FIELDS)
+        
+        await provider.update_ticket("OPS-1", summary="Renamed")
+        third = await provider.get_ticket("OPS-1")
+        assert len(gets) == 2
+        assert third["fields"]["status"] == 2
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_callers_get_independent_copies(self, jira_transport):
+        """Test that mutating a returned ticket doesn't change the cached one."""
+        gets = []
+        
+        def handle(request):
+            gets.append(request)
+            return httpx.Response(200, json={"key": "OPS-1", "fields": {"status": {"name": "Open"}}})
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        first = await provider.get_ticket("OPS-1")
+        first["fields"]["status"]["name"] = "Closed"
+        first["fields"]["assignee"] = "someone"
+        second = await provider.get_ticket("OPS-1")
+        
+        assert len(gets) == 1
+        assert second == {"key": "OPS-1", "fields": {"status": {"name": "Open"}}}
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, jira_transport):
+        """Test that a failed get is retried on the next call."""
+        statuses = iter([404, 200])
+        jira_transport["handle"] = lambda request: httpx.Response(next(statuses), json={"key": "OPS-1"})
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        
+        assert (await provider.get_ticket("OPS-1"))["status"] == "error"
+        assert (await provider.get_ticket("OPS-1"))["key"] == "OPS-1"
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_fetch(self):
+        """Test that concurrent lookups of one key fetch once."""
+        cache = _TTLCache(ttl=30.0)
+        calls = []
+        
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"key": "OPS-1"}
+        
+        results = await asyncio.gather(*[cache.get_or_fetch("OPS-1", fetch) for _ in range(5)])
+        
+        assert len(calls) == 1
+        assert all(result == {"key": "OPS-1"} for result in results)
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    def test_expiry_and_lru_eviction(self, monkeypatch):
+        """Test that entries expire after ttl and the least recently used is evicted."""
+        now = [100.0]
+        monkeypatch.setattr("ml.agent.ticket_provider.time.monotonic", lambda: now[0])
+        cache = _TTLCache(maxsize=2, ttl=30.0)
+        
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache._get("a") == (True, 1)
+        cache.set("c", 3)
+        assert cache._get("b") == (False, None)
+        assert cache._get("a") == (True, 1)
+        
+        now[0] += 30.0
+        assert cache._get("c") == (False, None)
+
+
+class TestJiraProvider:
+    """Tests for JiraProvider reference resolution and creation."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_issue_type_resolved_per_project(self, jira_transport):
+        """Test that issue types come from the target project's create metadata."""
+        def handle(request):
+            path = request.url.path
+            if path.endswith("/issue/createmeta/OPS/issuetypes"):
+                return httpx.Response(200, json={"issueTypes": [{"id": "10042", "name": "Task"}]})
+            if path.endswith("/issuetype"):
+                return httpx.Response(200, json=[{"id": "10001", "name": "Task"}])
+            return httpx.Response(200, json=[])
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        refs = await provider._resolve_refs("high", "OPS", "task")
+        
+        assert refs["issuetype"] == {"id": "10042"}
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_failed_metadata_is_cached(self, jira_transport):
+        """Test that a failing metadata endpoint isn't refetched on every create."""
+        calls = []
+        
+        def handle(request):
+            calls.append(request.url.path)
+            if request.method == "POST":
+                return httpx.Response(201, json={"key": "OPS-1"})
+            return httpx.Response(403)
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        for _ in range(3):
+            result = await provider.create_ticket(
+                system="jira", title="Pump vibration", description="High vibration",
+                priority="high", project="OPS", issue_type="Task",
+            )
+            assert result["status"] == "success"
+        
+        # Three metadata lookups once, then three creates
+        assert len(calls) == 6
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_create_ticket_returns_error_on_resolution_failure(self, jira_transport):
+        """Test that reference resolution errors become an error result."""
+        def handle(request):
+            if "/issue/createmeta/" in request.url.path:
+                return httpx.Response(200, json={"issueTypes": []})
+            # Malformed listing entries (no "id")
+            return httpx.Response(200, json=[{"name": "High"}])
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        result = await provider.create_ticket(
+            system="jira", title="Pump vibration", description="High vibration",
+            priority="high", project="OPS", issue_type="Task",
+        )
+        
+        assert result["status"] == "error"
+
+
+class TestCreateTickets:
+    """Tests for batch ticket creation."""
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self, monkeypatch):
+        """Test that the default batch keeps order and turns exceptions into errors."""
+        provider = MockTicketProvider()
+        create = provider.create_ticket
+        
+        async def create_ticket(**item):
+            if item["title"] == "boom":
+                raise RuntimeError("boom")
+            return await create(**item)
+        monkeypatch.setattr(provider, "create_ticket", create_ticket)
+        
+        items = [
+            dict(system="mock", title=title, description="", priority="low",
+                 project="OPS", issue_type="Task")
+            for title in ("first", "boom", "third")
+        ]
+        results = await provider.create_tickets(items, max_concurrency=2)
+        
+        assert [r["status"] for r in results] == ["success", "error", "success"]
+        assert results[1]["error"] == "boom"
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_jira_bulk_maps_errors_to_items(self, jira_transport, monkeypatch):
+        """Test that per-issue bulk errors land on the right input items."""
+        monkeypatch.setattr(JiraProvider, "BULK_LIMIT", 3)
+        bulk_sizes = []
+        
+        def handle(request):
+            if request.method == "GET":
+                return httpx.Response(403)
+            issues = _loads(request.content)["issueUpdates"]
+            bulk_sizes.append(len(issues))
+            titles = [issue["fields"]["summary"] for issue in issues]
+            return httpx.Response(201, json={
+                "issues": [{"key": f"OPS-{t}"} for t in titles if t != "bad"],
+                "errors": [
+                    {"failedElementNumber": i, "elementErrors": {"errors": {"summary": "invalid"}}}
+                    for i, t in enumerate(titles) if t == "bad"
+                ],
+            })
+        jira_transport["handle"] = handle
+        
+        titles = ["1", "bad", "3", "4", "5", "bad", "7"]
+        provider = JiraProvider(base_url="https://jira.test")
+        results = await provider.create_tickets([
+            dict(system="jira", title=t, description="", priority="high",
+                 project="OPS", issue_type="Task")
+            for t in titles
+        ])
+        
+        assert sorted(bulk_sizes) == [1, 3, 3]
+        assert [r.get("ticket_id") for r in results] == [
+            "OPS-1", None, "OPS-3", "OPS-4", "OPS-5", None, "OPS-7",
+        ]
+        assert "invalid" in results[1]["error"]
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_jira_bulk_all_failed(self, jira_transport):
+        """Test that a 400 with per-issue errors is mapped rather than raised."""
+        def handle(request):
+            if request.method == "GET":
+                return httpx.Response(403)
+            return httpx.Response(400, json={
+                "issues": [],
+                "errors": [
+                    {"failedElementNumber": 0, "elementErrors": {"errors": {"project": "unknown"}}},
+                    {"failedElementNumber": 1, "elementErrors": {"errors": {"project": "unknown"}}},
+                ],
+            })
+        jira_transport["handle"] = handle
+        
+        provider = JiraProvider(base_url="https://jira.test")
+        results = await provider.create_tickets([
+            dict(system="jira", title=t, description="", priority="high",
+                 project="NOPE", issue_type="Task")
+            for t in ("a", "b")
+        ])
+        
+        assert [r["status"] for r in results] == ["error", "error"]
+        assert all("unknown" in r["error"] for r in results)
+    
+    @pytest.mark.unit
+    @pytest.mark.agent
+    @pytest.mark.asyncio
+    async def test_webhook_batch_shares_timestamp(self, webhook_transport):
+        """Test that a webhook batch is stamped once and sent with the configured headers."""
+        requests = []
+        
+        def handle(request):
+            requests.append(request)
+            ticket = _loads(request.content)["ticket"]
+            if ticket["title"] == "bad":
+                return httpx.Response(500)
+            return httpx.Response(200, json={"id": f"WH-{ticket['title']}"})
+        webhook_transport["handle"] = handle
+        
+        provider = WebhookProvider(
+            webhook_url="https://hooks.test/tickets", headers={"X-Api-Key": "secret"}
+        )
+        results = await provider.create_tickets([
+            dict(system="webhook", title=t, description="", priority="low",
+                 project="OPS", issue_type="Task", asset_id="pump-7")
+            for t in ("a", "bad", "c")
+        ])
+        
+        assert [r.get("ticket_id") for r in results] == ["WH-a", None, "WH-c"]
+        assert results[1]["status"] == "error"
+        payloads = [_loads(request.content) for request in requests]
+        assert len({payload["timestamp"] for payload in payloads}) == 1
+        assert all(payload["ticket"]["asset_id"] == "pump-7" for payload in payloads)
+        assert all(request.headers["X-Api-Key"] == "secret" for request in requests)
+        assert all(request.headers["Content-Type"] == "application/json" for request in requests)
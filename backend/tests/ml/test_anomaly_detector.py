@@ -11,7 +11,12 @@ import os
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from ml.models.anomaly_detector import AnomalyDetector, StreamingAnomalyDetector
+from ml.models.anomaly_detector import (
+    AnomalyDetector,
+    StreamingAnomalyDetector,
+    _window_stats,
+    _window_stats_numpy,
+)
 
 
 class TestAnomalyDetector:
@@ -113,6 +118,25 @@ class TestAnomalyDetector:
         assert "explanations" in result
         assert len(result["explanations"]) == 5
     
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_predict_with_explanation_sample(self, sample_metrics_df):
+        """Test that large batches explain only a sample of rows."""
+        detector = AnomalyDetector()
+        detector.fit(sample_metrics_df)
+        
+        batch = sample_metrics_df.head(40)
+        result = detector.predict_with_explanation(batch, explain_sample=10)
+        
+        assert len(result["anomaly_scores"]) == 40
+        assert len(result["explanations"]) == 10
+        assert len(set(result["sampled_indices"])) == 10
+        
+        # Small batches are explained in full
+        result = detector.predict_with_explanation(batch.head(5), explain_sample=10)
+        assert len(result["explanations"]) == 5
+        assert "sampled_indices" not in result
+    
     @pytest.mark.unit
     def test_predict_without_fit_raises(self):
         """Test that predicting without fitting raises error."""
@@ -141,6 +165,28 @@ class TestAnomalyDetector:
             assert loaded.model_version == "test-v1"
             assert loaded.feature_names == detector.feature_names
     
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_custom_feature_names(self, sample_metrics_df):
+        """Test that display feature_names don't change which columns are scored."""
+        labels = [f"Sensor {c}" for c in sample_metrics_df.columns]
+        detector = AnomalyDetector()
+        detector.fit(sample_metrics_df, feature_names=labels)
+        
+        wide = sample_metrics_df.head(5).assign(asset_id="pump-7")
+        result = detector.predict_with_explanation(wide)
+        
+        assert len(result["anomaly_scores"]) == 5
+        assert result["explanations"][0]["top_features"][0]["feature"] in labels
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "model.joblib")
+            detector.save(path)
+            loaded = AnomalyDetector.load(path)
+        
+        assert loaded.feature_names == labels
+        assert loaded.predict(wide)["anomaly_scores"] == result["anomaly_scores"]
+    
     @pytest.mark.unit
     @pytest.mark.ml
     def test_risk_levels(self, sample_metrics_df):
@@ -203,3 +249,19 @@ class TestStreamingAnomalyDetector:
         # After enough points, should get results
         assert result is not None
         assert "asset_id" in result
+    
+    @pytest.mark.unit
+    def test_window_stats_large_offset(self):
+        """Test window stats keep precision on large-magnitude metrics."""
+        rng = np.random.default_rng(0)
+        view = 1e8 + rng.standard_normal((100, 3))
+        view[5, 1] = np.nan
+        current = view[-1]
+        
+        expected = np.empty((3, 5))
+        _window_stats_numpy(view, current, expected)
+        result = np.empty((3, 5))
+        _window_stats(view, current, result)
+        
+        assert expected[:, 2].min() > 0.5
+        np.testing.assert_allclose(result, expected, rtol=1e-6)
@@ -0,0 +1,149 @@
+"""
+Unit Tests for Drift Detection.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+import os
+import sys
+from scipy.stats import ks_2samp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from ml.pipelines.drift_detection import (
+    DriftDetector,
+    DriftMonitor,
+    WelfordStats,
+    _ks_statistic,
+)
+
+
+class TestKSStatistic:
+    """Tests for the two-sample KS drift score."""
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    @pytest.mark.parametrize("shift,scale", [(0.0, 1.0), (0.5, 1.0), (0.0, 3.0)])
+    def test_matches_scipy(self, shift, scale):
+        """Test the statistic against scipy.stats.ks_2samp."""
+        rng = np.random.default_rng(0)
+        reference = rng.standard_normal(500)
+        current = shift + scale * rng.standard_normal(300)
+        
+        result = _ks_statistic(np.sort(reference), current)
+        
+        assert result == pytest.approx(ks_2samp(reference, current).statistic)
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_ties_and_nans(self):
+        """Test discrete data with ties, ignoring NaNs in the current sample."""
+        rng = np.random.default_rng(1)
+        reference = rng.integers(0, 5, 200).astype(float)
+        current = rng.integers(1, 6, 150).astype(float)
+        current[::10] = np.nan
+        
+        result = _ks_statistic(np.sort(reference), current)
+        
+        expected = ks_2samp(reference, current[~np.isnan(current)]).statistic
+        assert result == pytest.approx(expected)
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_empty_sample_is_nan(self):
+        """Test that a sample without data can't be scored."""
+        assert np.isnan(_ks_statistic(np.sort(np.arange(5.0)), np.full(3, np.nan)))
+        assert np.isnan(_ks_statistic(np.empty(0), np.arange(3.0)))
+
+
+class TestWelfordStats:
+    """Tests for streaming mean/std."""
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_batches_match_numpy(self):
+        """Test that batched updates match np.nanmean/np.nanstd over all rows."""
+        rng = np.random.default_rng(3)
+        X = 1e6 + rng.standard_normal((1000, 4))
+        X[rng.random(X.shape) < 0.05] = np.nan
+        X[:, 3] = np.nan
+        X[10, 3] = 7.0
+        
+        stats = WelfordStats(4)
+        for batch in np.array_split(X, [1, 17, 400, 401]):
+            stats.update(batch)
+        
+        np.testing.assert_array_equal(stats.n, (~np.isnan(X)).sum(axis=0))
+        np.testing.assert_allclose(stats.mean[:3], np.nanmean(X[:, :3], axis=0), rtol=1e-12)
+        np.testing.assert_allclose(stats.std[:3], np.nanstd(X[:, :3], axis=0, ddof=1), rtol=1e-9)
+        # A single observation has a mean but no sample std
+        assert stats.mean[3] == 7.0
+        assert np.isnan(stats.std[3])
+
+
+class TestDriftMonitor:
+    """Tests for DriftMonitor reference maintenance."""
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_reference_stats_cover_every_row(self):
+        """Test that updates keep exact stats but a bounded KS sample."""
+        rng = np.random.default_rng(4)
+        frames = [
+            pd.DataFrame({"temperature": rng.normal(60, 5, 300), "rpm": rng.normal(1500, 50, 300)})
+            for _ in range(4)
+        ]
+        full = pd.concat(frames, ignore_index=True)
+        
+        monitor = DriftMonitor(DriftDetector(), max_reference_rows=250)
+        for frame in frames:
+            monitor.update_reference("tenant", frame)
+        
+        ref_stats = monitor.reference_stats["tenant"]
+        np.testing.assert_allclose(ref_stats["mean"], full.mean().to_numpy())
+        np.testing.assert_allclose(ref_stats["std"], full.std().to_numpy())
+        assert [len(values) for values in ref_stats["sorted"]] == [250, 250]
+        # Sampled rows come from the whole stream, not just the first batch
+        assert np.isin(ref_stats["sorted"][0], frames[-1]["temperature"]).any()
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_set_reference_replaces_previous(self):
+        """Test that set_reference discards earlier rows."""
+        monitor = DriftMonitor(DriftDetector())
+        monitor.set_reference("tenant", pd.DataFrame({"temperature": [1.0, 2.0, 3.0]}))
+        monitor.set_reference("tenant", pd.DataFrame({"temperature": [10.0, 20.0]}))
+        
+        ref_stats = monitor.reference_stats["tenant"]
+        assert ref_stats["mean"][0] == 15.0
+        np.testing.assert_array_equal(ref_stats["sorted"][0], [10.0, 20.0])
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_check_drift_without_reference(self):
+        """Test that tenants without a reference get a status instead of scores."""
+        monitor = DriftMonitor(DriftDetector())
+        
+        result = monitor.check_drift("tenant", pd.DataFrame({"temperature": [1.0]}))
+        
+        assert result["status"] == "no_reference"
+
+
+class TestDriftDetector:
+    """Tests for the statistical fallback of DriftDetector."""
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_variance_change_detected(self):
+        """Test that a variance change with an unchanged mean is flagged."""
+        rng = np.random.default_rng(2)
+        reference = pd.DataFrame({"temperature": rng.standard_normal(1000)})
+        current = pd.DataFrame({"temperature": 10 * rng.standard_normal(1000)})
+        
+        detector = DriftDetector()
+        result = detector._detect_from_stats(DriftDetector.reference_stats(reference), current)
+        
+        assert [f["feature"] for f in result["drifted_features"]] == ["temperature"]
+        assert result["overall_drift_score"] == pytest.approx(
+            ks_2samp(reference["temperature"], current["temperature"]).statistic
+        )
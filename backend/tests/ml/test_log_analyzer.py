@@ -2,6 +2,7 @@
 Unit Tests for Log Analyzer Model.
 """
 import pytest
+import numpy as np
 import os
 import tempfile
 
@@ -94,6 +95,22 @@ class TestLogAnalyzer:
         assert len(predictions) == 3
         assert all(isinstance(p, int) for p in predictions)
     
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_predict_after_logs_list_grows(self, sample_logs):
+        """Test that appending to the fitted list doesn't reuse stale labels."""
+        analyzer = LogAnalyzer(
+            min_cluster_size=3,
+            use_tfidf_fallback=True
+        )
+        logs = list(sample_logs)
+        analyzer.fit(logs)
+        
+        logs.append("ERROR Disk quota exceeded on /var/data")
+        predictions = analyzer.predict(logs)
+        
+        assert len(predictions) == len(logs)
+    
     @pytest.mark.unit
     @pytest.mark.ml
     def test_analyze_batch(self, sample_logs):
@@ -128,6 +145,23 @@ class TestLogAnalyzer:
         assert "similarity" in similar[0]
         assert 0 <= similar[0]["similarity"] <= 1
     
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_find_similar_logs_blocked_matches_full(self, sample_logs):
+        """Test that block-wise similarity matches a whole-cache matmul."""
+        analyzer = LogAnalyzer(
+            min_cluster_size=3,
+            use_tfidf_fallback=True
+        )
+        analyzer.fit(sample_logs)
+        analyzer.SIMILARITY_BLOCK_ROWS = 7
+        
+        query = analyzer.tfidf.transform(["ERROR Connection timeout"]).toarray()[0]
+        query = np.asarray(query, dtype=np.float32)
+        expected = analyzer.embeddings_cache.astype(np.float32) @ query
+        
+        np.testing.assert_allclose(analyzer._cache_dot(query), expected, rtol=1e-6)
+    
     @pytest.mark.unit
     @pytest.mark.ml
     def test_save_and_load(self, sample_logs):
@@ -0,0 +1,133 @@
+"""
+Unit Tests for the ML Service.
+"""
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from ml.services.ml_service import MLService, _ModelCache
+
+
+class TestModelCache:
+    """Tests for the per-tenant model LRU."""
+    
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self):
+        """Test that a lookup refreshes a tenant and the stalest one is dropped."""
+        cache = _ModelCache(maxsize=2)
+        cache["a"] = "model-a"
+        cache["b"] = "model-b"
+        
+        assert cache.get("a") == "model-a"
+        cache["c"] = "model-c"
+        
+        assert "b" not in cache
+        assert cache.get("b") is None
+        assert cache.get("a") == "model-a"
+        assert cache.get("c") == "model-c"
+        assert len(cache) == 2
+    
+    @pytest.mark.unit
+    def test_overwrite_keeps_size(self):
+        """Test that retraining a cached tenant replaces its model in place."""
+        cache = _ModelCache(maxsize=2)
+        cache["a"] = "v1"
+        cache["b"] = "model-b"
+        cache["a"] = "v2"
+        cache["c"] = "model-c"
+        
+        assert cache.get("a") == "v2"
+        assert "b" not in cache
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    def test_evicted_model_reloaded_from_disk(self, tmp_path, sample_metrics_df):
+        """Test that an evicted tenant's detector is reloaded on its next request."""
+        service = MLService(models_dir=str(tmp_path), model_cache_size=1)
+        features = list(sample_metrics_df.columns)
+        service.train_anomaly_detector("tenant-a", sample_metrics_df, features, version="1")
+        service.train_anomaly_detector("tenant-b", sample_metrics_df, features, version="2")
+        
+        assert "tenant-a" not in service._anomaly_detectors
+        result = service.predict_anomalies("tenant-a", sample_metrics_df.head(5), with_explanation=False)
+        
+        assert len(result["anomaly_scores"]) == 5
+        assert result["model_version"] == "1"
+        assert "tenant-a" in service._anomaly_detectors
+        assert "tenant-b" not in service._anomaly_detectors
+        service.close()
+
+
+class TestMLService:
+    """Tests for MLService resource handling."""
+    
+    @pytest.mark.unit
+    def test_worker_pool_created_lazily_and_closed(self, tmp_path, sample_metrics_df):
+        """Test that the log-analysis pool exists only between first use and close()."""
+        service = MLService(models_dir=str(tmp_path))
+        assert service._executor is None
+        
+        result = service.predict_asset_health(
+            "tenant-a", "pump-7", sample_metrics_df.head(5), logs=["ERROR sensor offline"]
+        )
+        executor = service._executor
+        
+        assert result["asset_id"] == "pump-7"
+        assert executor is not None
+        
+        service.close()
+        assert service._executor is None
+        assert executor._shutdown
+        # Closing twice is harmless
+        service.close()
+
+
+class TestPublishLatest:
+    """Tests for publishing the latest model file."""
+    
+    @pytest.mark.unit
+    def test_links_versioned_model(self, tmp_path):
+        """Test that latest shares the versioned file instead of a copy."""
+        model_path = tmp_path / "anomaly_detector_1.joblib"
+        latest_path = tmp_path / "anomaly_detector_latest.joblib"
+        model_path.write_bytes(b"v1")
+        
+        MLService._publish_latest(model_path, latest_path)
+        
+        assert latest_path.read_bytes() == b"v1"
+        assert os.path.samefile(model_path, latest_path)
+        assert not latest_path.with_name(latest_path.name + ".tmp").exists()
+    
+    @pytest.mark.unit
+    def test_replaces_previous_latest(self, tmp_path):
+        """Test that republishing swaps latest without touching older versions."""
+        v1 = tmp_path / "model_1.joblib"
+        v2 = tmp_path / "model_2.joblib"
+        latest_path = tmp_path / "model_latest.joblib"
+        v1.write_bytes(b"v1")
+        v2.write_bytes(b"v2")
+        # A stale temp file from an interrupted publish
+        latest_path.with_name(latest_path.name + ".tmp").write_bytes(b"partial")
+        
+        MLService._publish_latest(v1, latest_path)
+        MLService._publish_latest(v2, latest_path)
+        
+        assert latest_path.read_bytes() == b"v2"
+        assert v1.read_bytes() == b"v1"
+    
+    @pytest.mark.unit
+    def test_copies_without_hard_links(self, tmp_path, monkeypatch):
+        """Test the copy fallback where hard links are unsupported."""
+        def no_link(src, dst):
+            raise OSError("hard links not supported")
+        monkeypatch.setattr(os, "link", no_link)
+        model_path = tmp_path / "model_1.joblib"
+        latest_path = tmp_path / "model_latest.joblib"
+        model_path.write_bytes(b"v1")
+        
+        MLService._publish_latest(model_path, latest_path)
+        
+        assert latest_path.read_bytes() == b"v1"
+        assert not os.path.samefile(model_path, latest_path)
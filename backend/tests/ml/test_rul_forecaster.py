@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import tempfile
 import os
+import torch
 
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -95,6 +96,38 @@ class TestRULForecaster:
         assert "confidence_upper" in result
         assert "uncertainty" in result
     
+    @pytest.mark.unit
+    @pytest.mark.ml
+    @pytest.mark.slow
+    def test_confidence_in_rul_units(self, sample_rul_df):
+        """Test that MC-dropout spread is scaled by the fitted RUL range."""
+        # Observed RUL spans 0-65, well below max_rul
+        df = sample_rul_df.assign(RUL=sample_rul_df["RUL"] / 2)
+        forecaster = RULForecaster(sequence_length=20, hidden_size=16, max_rul=130.0)
+        forecaster.fit(df, epochs=1, verbose=False)
+        
+        n_features = len(df.columns) - 1
+        test_sequences = np.random.randn(3, 20, n_features).astype(np.float32)
+        
+        torch.manual_seed(0)
+        result = forecaster.predict(test_sequences, return_confidence=True, n_samples=8)
+        
+        # Replay the same dropout masks on the eager model
+        torch.manual_seed(0)
+        scaled = forecaster.feature_scaler.transform(test_sequences.reshape(-1, n_features))
+        X = torch.from_numpy(scaled.reshape(test_sequences.shape).astype(np.float32))
+        forecaster.model.train()
+        with torch.no_grad():
+            samples = forecaster.model(X.repeat(8, 1, 1)).view(8, 3).numpy()
+        
+        expected_std = samples.std(axis=0) * 65.0
+        np.testing.assert_allclose(result["uncertainty"], expected_std, rtol=1e-3, atol=1e-4)
+        half_width = np.subtract(result["confidence_upper"], result["rul_estimate"])
+        np.testing.assert_allclose(half_width, 1.96 * expected_std, rtol=1e-3, atol=1e-3)
+        np.testing.assert_allclose(
+            np.subtract(result["rul_estimate"], result["confidence_lower"]), half_width, atol=1e-3
+        )
+    
     @pytest.mark.unit
     @pytest.mark.ml
     @pytest.mark.slow
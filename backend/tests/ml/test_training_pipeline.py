@@ -0,0 +1,89 @@
+"""
+Unit Tests for the Training Pipeline.
+"""
+import asyncio
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from ml.pipelines.training_pipeline import ScheduledTrainer
+
+
+class FakePipeline:
+    """Records fetch/train events in place of a TrainingPipeline."""
+    
+    def __init__(self, failing_fetches=(), train_delay=0.0):
+        self.events = []
+        self.failing_fetches = set(failing_fetches)
+        self.train_delay = train_delay
+    
+    async def fetch_tenant_data(self, tenant_id):
+        self.events.append(("fetch", tenant_id))
+        await asyncio.sleep(0)
+        if tenant_id in self.failing_fetches:
+            raise ConnectionError(f"database unavailable for {tenant_id}")
+        return f"data-{tenant_id}"
+    
+    async def train_tenant_models(self, tenant_id, data=None, executor=None):
+        self.events.append(("train", tenant_id))
+        await asyncio.sleep(self.train_delay)
+        self.events.append(("trained", tenant_id))
+        return {"tenant_id": tenant_id, "data": data, "executor": executor}
+
+
+class TestScheduledTrainer:
+    """Tests for the nightly producer/consumer run."""
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    @pytest.mark.asyncio
+    async def test_results_in_tenant_order(self):
+        """Test that every tenant trains on its own prefetched data."""
+        pipeline = FakePipeline()
+        trainer = ScheduledTrainer(pipeline, max_concurrency=3, prefetch_depth=2)
+        tenants = [f"tenant-{i}" for i in range(7)]
+        
+        results = await trainer.run_nightly_training(tenants)
+        
+        assert list(results) == tenants
+        assert all(results[t]["data"] == f"data-{t}" for t in tenants)
+        assert all(results[t]["executor"] is trainer._executor for t in tenants)
+        trainer.stop_scheduler()
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    @pytest.mark.asyncio
+    async def test_fetch_error_reported_per_tenant(self):
+        """Test that a failed fetch is reported without stopping other tenants."""
+        pipeline = FakePipeline(failing_fetches={"tenant-b"})
+        trainer = ScheduledTrainer(pipeline, max_concurrency=2)
+        
+        results = await trainer.run_nightly_training(["tenant-a", "tenant-b", "tenant-c"])
+        
+        assert results["tenant-b"] == {
+            "status": "error",
+            "message": "database unavailable for tenant-b",
+        }
+        assert results["tenant-a"]["data"] == "data-tenant-a"
+        assert results["tenant-c"]["data"] == "data-tenant-c"
+        assert ("train", "tenant-b") not in pipeline.events
+        trainer.stop_scheduler()
+    
+    @pytest.mark.unit
+    @pytest.mark.ml
+    @pytest.mark.asyncio
+    async def test_prefetch_overlaps_training(self):
+        """Test that the next fetch runs during training, bounded by prefetch_depth."""
+        pipeline = FakePipeline(train_delay=0.05)
+        trainer = ScheduledTrainer(pipeline, max_concurrency=1, prefetch_depth=1)
+        
+        await trainer.run_nightly_training(["a", "b", "c", "d"])
+        
+        events = pipeline.events
+        first_done = events.index(("trained", "a"))
+        # b is fetched while a trains; d waits for a queue slot
+        assert events.index(("fetch", "b")) < first_done
+        assert events.index(("fetch", "d")) > first_done
+        trainer.stop_scheduler()
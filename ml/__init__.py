@@ -1,15 +1,40 @@
-"""PredictrAI ML Package."""
-from ml.models import AnomalyDetector, StreamingAnomalyDetector, RULForecaster, LogAnalyzer
-from ml.services import MLService
-from ml.pipelines import TrainingPipeline, InferencePipeline, DriftDetector
-
-__all__ = [
-    "AnomalyDetector",
-    "StreamingAnomalyDetector",
-    "RULForecaster",
-    "LogAnalyzer",
-    "MLService",
-    "TrainingPipeline",
-    "InferencePipeline",
-    "DriftDetector",
-]
+"""
+PredictrAI ML Package.
+
+Exports are imported lazily (PEP 562), so importing a lightweight
+submodule such as ml.agent does not load every model and pipeline.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ml.models import AnomalyDetector, StreamingAnomalyDetector, RULForecaster, LogAnalyzer
+    from ml.services import MLService
+    from ml.pipelines import TrainingPipeline, InferencePipeline, DriftDetector
+
+# Exported name -> defining package
+_EXPORTS = {
+    "AnomalyDetector": "ml.models",
+    "StreamingAnomalyDetector": "ml.models",
+    "RULForecaster": "ml.models",
+    "LogAnalyzer": "ml.models",
+    "MLService": "ml.services",
+    "TrainingPipeline": "ml.pipelines",
+    "InferencePipeline": "ml.pipelines",
+    "DriftDetector": "ml.pipelines",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -32,6 +32,7 @@ from ml.agent.ticket_provider import (
     ServiceNowProvider,
     WebhookProvider,
     MockTicketProvider,
+    TicketQueue,
     create_ticket_provider,
 )
 from ml.agent.notification_provider import (
@@ -67,6 +68,7 @@ __all__ = [
     "ServiceNowProvider",
     "WebhookProvider",
     "MockTicketProvider",
+    "TicketQueue",
     "create_ticket_provider",
     # Notifications
     "NotificationProvider",
@@ -0,0 +1,21 @@
+"""
+Agent configuration read from the environment.
+
+Provider constructors read credentials from here instead of calling
+os.getenv on every construction. Call get_env_config.cache_clear() after
+changing the environment (e.g. in tests).
+"""
+import os
+from functools import lru_cache
+from typing import Dict, Optional
+
+
+@lru_cache(maxsize=1)
+def get_env_config() -> Dict[str, Optional[str]]:
+    """Snapshot of provider credentials, read once per process."""
+    return {
+        "slack_webhook": os.getenv("SLACK_WEBHOOK_URL"),
+        "teams_webhook": os.getenv("TEAMS_WEBHOOK_URL"),
+        "slack_bot_token": os.getenv("SLACK_BOT_TOKEN"),
+        "openai_api_key": os.getenv("OPENAI_API_KEY"),
+    }
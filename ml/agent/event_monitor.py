@@ -100,11 +100,13 @@ class EventMonitor:
         drifted = drift_result.get("drifted_features", [])
         
         if drift_score >= self.drift_threshold or len(drifted) >= 2:
+            # Features may arrive as dicts (DriftDetector output) or plain names;
+            # check each item so an empty list never gets indexed.
             await self.copilot.observe_drift(
                 tenant_id=tenant_id,
                 asset_id=asset_id,
                 drift_score=drift_score,
-                drifted_features=[f["feature"] for f in drifted] if isinstance(drifted[0], dict) else drifted,
+                drifted_features=[f["feature"] if isinstance(f, dict) else f for f in drifted],
             )
     
     async def on_log_pattern(
@@ -206,6 +208,18 @@ class CopilotService:
         """Stop the copilot service."""
         self.monitor.stop()
     
+    async def aclose(self):
+        """Stop the service and release pooled HTTP connections."""
+        from ml.agent.http import close_client
+        from ml.agent.ticket_provider import close_ticket_clients
+        
+        self.stop()
+        await close_ticket_clients()
+        await close_client()
+        # get_instance() builds a fresh service rather than this closed one
+        if CopilotService._instance is self:
+            CopilotService._instance = None
+    
     async def chat(
         self,
         message: str,
@@ -0,0 +1,93 @@
+"""
+Shared HTTP client for agent providers.
+
+Slack, Teams, Ollama and MCP server calls all go through one
+httpx.AsyncClient per running event loop, so they share a single connection pool and reuse
+TLS sessions instead of each provider holding its own.
+"""
+import asyncio
+import logging
+import weakref
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+DEFAULT_TIMEOUT = 30.0
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+# Idle connections are kept for bursty callers (e.g. MCP tool fan-out)
+KEEPALIVE_EXPIRY = 300.0
+
+# Clients are bound to the loop they were first used on; keying weakly by
+# loop lets clients of closed loops (e.g. per-test loops) be collected.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+# Fallback for callers outside a running loop (e.g. provider constructors)
+_default_client: Optional["httpx.AsyncClient"] = None
+
+
+def _build_client() -> "httpx.AsyncClient":
+    return httpx.AsyncClient(
+        http2=HAS_HTTP2,
+        timeout=httpx.Timeout(DEFAULT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_client() -> "httpx.AsyncClient":
+    """
+    Get the shared AsyncClient for the running event loop.
+
+    Created lazily on first use. HTTP/2 is enabled when the h2 package is
+    installed.
+    """
+    global _default_client
+
+    if not HAS_HTTPX:
+        raise ImportError("httpx package not installed")
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        if _default_client is None or _default_client.is_closed:
+            _default_client = _build_client()
+        return _default_client
+
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _build_client()
+        _clients[loop] = client
+    return client
+
+
+async def close_client():
+    """
+    Close the shared client for the running event loop (call on shutdown).
+    
+    The out-of-loop fallback client, if one was created, is closed too.
+    """
+    global _default_client
+    
+    clients = (_clients.pop(asyncio.get_running_loop(), None), _default_client)
+    _default_client = None
+    for client in clients:
+        if client is not None:
+            await client.aclose()
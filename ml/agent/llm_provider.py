@@ -6,13 +6,15 @@ Supports:
 - Anthropic Claude
 - Local models via Ollama
 """
-import os
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
 import logging
 import json
 
+from ml.agent.config import get_env_config
+from ml.agent.http import HAS_HTTPX, get_client
+
 logger = logging.getLogger(__name__)
 
 # Import conditionally
@@ -22,11 +24,17 @@ try:
 except ImportError:
     HAS_OPENAI = False
 
-try:
-    import httpx
-    HAS_HTTPX = True
-except ImportError:
-    HAS_HTTPX = False
+
+# Canned recommendations by RUL band (upper bound in hours, exclusive)
+RUL_RECOMMENDATIONS = (
+    (8, "CRITICAL — schedule maintenance within the next shift. Stage replacement "
+        "parts and a technician now, and plan a controlled shutdown if the asset "
+        "cannot be serviced in time."),
+    (24, "HIGH — schedule maintenance within 12 hours. Confirm spare part "
+         "availability and notify operations of the planned downtime window."),
+    (72, "MEDIUM — schedule maintenance within 48 hours. Add the asset to the next "
+         "maintenance window and review recent sensor trends beforehand."),
+)
 
 
 class LLMProvider(ABC):
@@ -71,7 +79,7 @@ class OpenAIProvider(LLMProvider):
             raise ImportError("openai package not installed")
         
         self.client = openai.AsyncOpenAI(
-            api_key=api_key or os.getenv("OPENAI_API_KEY")
+            api_key=api_key or get_env_config()["openai_api_key"]
         )
         self.model = model
     
@@ -126,7 +134,14 @@ Return as JSON with keys: title, description, root_cause, actions (array)"""
     ) -> str:
         """Generate maintenance recommendation."""
         rul = event.data.get("rul_hours", 0)
-        
+
+        # Short-RUL recommendations only depend on the band, so skip the LLM
+        # unless there is an explanation worth reasoning about
+        if not event.data.get("explanation"):
+            for max_hours, recommendation in RUL_RECOMMENDATIONS:
+                if rul < max_hours:
+                    return recommendation
+
         prompt = f"""You are an AI maintenance copilot. An asset has a predicted remaining useful life of {rul:.0f} hours.
 
 Generate a concise maintenance recommendation (2-3 sentences) that:
@@ -186,13 +201,19 @@ class OllamaProvider(LLMProvider):
         self,
         base_url: str = "http://localhost:11434",
         model: str = "llama3",
+        timeout: float = 60.0,
     ):
         if not HAS_HTTPX:
             raise ImportError("httpx package not installed")
         
         self.base_url = base_url
         self.model = model
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self.timeout = timeout
+    
+    @property
+    def client(self):
+        """Shared loop-scoped HTTP client."""
+        return get_client()
     
     async def _generate(self, prompt: str, system: Optional[str] = None) -> str:
         """Generate text using Ollama."""
@@ -204,6 +225,7 @@ class OllamaProvider(LLMProvider):
                 "system": system or "You are an expert industrial maintenance AI.",
                 "stream": False,
             },
+            timeout=self.timeout,
         )
         response.raise_for_status()
         return response.json()["response"]
@@ -7,20 +7,16 @@ Supports:
 - Microsoft Teams
 - Webhooks
 """
-import os
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
 import logging
 import json
 
-logger = logging.getLogger(__name__)
+from ml.agent.config import get_env_config
+from ml.agent.http import HAS_HTTPX, get_client
 
-try:
-    import httpx
-    HAS_HTTPX = True
-except ImportError:
-    HAS_HTTPX = False
+logger = logging.getLogger(__name__)
 
 
 class NotificationProvider(ABC):
@@ -53,14 +49,14 @@ class MultiChannelNotifier(NotificationProvider):
         teams_webhook: Optional[str] = None,
         email_config: Optional[Dict] = None,
     ):
-        self.slack_webhook = slack_webhook or os.getenv("SLACK_WEBHOOK_URL")
-        self.teams_webhook = teams_webhook or os.getenv("TEAMS_WEBHOOK_URL")
+        self.slack_webhook = slack_webhook or get_env_config()["slack_webhook"]
+        self.teams_webhook = teams_webhook or get_env_config()["teams_webhook"]
         self.email_config = email_config or {}
-        
-        if HAS_HTTPX:
-            self.client = httpx.AsyncClient(timeout=30.0)
-        else:
-            self.client = None
+    
+    @property
+    def client(self):
+        """Shared loop-scoped HTTP client (None when httpx is unavailable)."""
+        return get_client() if HAS_HTTPX else None
     
     async def send(
         self,
@@ -213,13 +209,13 @@ class SlackNotifier:
     """Direct Slack integration with interactive elements."""
     
     def __init__(self, webhook_url: Optional[str] = None, bot_token: Optional[str] = None):
-        self.webhook_url = webhook_url or os.getenv("SLACK_WEBHOOK_URL")
-        self.bot_token = bot_token or os.getenv("SLACK_BOT_TOKEN")
-        
-        if HAS_HTTPX:
-            self.client = httpx.AsyncClient(timeout=30.0)
-        else:
-            self.client = None
+        self.webhook_url = webhook_url or get_env_config()["slack_webhook"]
+        self.bot_token = bot_token or get_env_config()["slack_bot_token"]
+    
+    @property
+    def client(self):
+        """Shared loop-scoped HTTP client (None when httpx is unavailable)."""
+        return get_client() if HAS_HTTPX else None
     
     async def send_alert(
         self,
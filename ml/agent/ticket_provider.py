@@ -6,19 +6,64 @@ Supports:
 - ServiceNow
 - Generic webhook
 """
+import asyncio
+import copy
+import json
 import os
-from datetime import datetime
-from typing import Dict, Optional, Any
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from abc import ABC, abstractmethod
 import logging
 
-logger = logging.getLogger(__name__)
+from ml.agent.http import HAS_HTTP2, HAS_HTTPX
 
-try:
+if HAS_HTTPX:
     import httpx
-    HAS_HTTPX = True
+
+try:
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_HTTPX = False
+    HAS_ORJSON = False
+
+try:
+    from prometheus_client import Counter, Histogram
+    HAS_PROMETHEUS = True
+except ImportError:
+    HAS_PROMETHEUS = False
+
+logger = logging.getLogger(__name__)
+
+if HAS_PROMETHEUS:
+    TICKET_LATENCY = Histogram(
+        "ticket_op_seconds",
+        "Latency of ticketing API requests",
+        ["provider", "op"],
+    )
+    TICKET_ERRORS = Counter(
+        "ticket_op_errors_total",
+        "Failed ticketing API requests (error status or transport error)",
+        ["provider", "op", "reason"],
+    )
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a request body (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a response body (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class TicketProvider(ABC):
@@ -54,11 +99,542 @@ class TicketProvider(ABC):
     ) -> Dict[str, Any]:
         """Get ticket details."""
         pass
+    
+    async def create_tickets(
+        self,
+        items: List[Dict[str, Any]],
+        *,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several tickets concurrently.
+        
+        Args:
+            items: create_ticket keyword arguments, one dict per ticket
+            max_concurrency: Maximum number of requests in flight
+        
+        Returns:
+            One result per item, in the same order
+        """
+        return await _gather_bounded(
+            lambda item: self.create_ticket(**item), items, max_concurrency
+        )
+    
+    async def enqueue(self, **ticket) -> "asyncio.Future":
+        """
+        Queue a ticket for background creation.
+        
+        Returns as soon as the ticket is queued; await the returned future
+        for the create_ticket result. Queued tickets are created in batches
+        via create_tickets (see TicketQueue).
+        """
+        queue = self.__dict__.get("_ticket_queue")
+        if queue is None:
+            queue = self._ticket_queue = TicketQueue(self)
+        return await queue.enqueue(ticket)
+    
+    async def aclose(self):
+        """Flush queued tickets and release any network resources."""
+        # Dropped so a reused (factory-cached) provider starts a fresh queue
+        queue = self.__dict__.pop("_ticket_queue", None)
+        if queue is not None:
+            await queue.aclose()
+    
+    async def release(self):
+        """
+        Release one holder of this provider.
+        
+        create_ticket_provider hands memoized providers to several callers
+        and counts each hand-out; only the last holder to release one
+        closes it. Providers built directly have a single holder.
+        """
+        holders = self.__dict__.get("_holders", 1) - 1
+        self._holders = max(holders, 0)
+        if holders <= 0:
+            await self.aclose()
+    
+    async def __aenter__(self) -> "TicketProvider":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
 
 
-class JiraProvider(TicketProvider):
+class TicketQueue:
+    """
+    In-memory outbox for ticket creation.
+    
+    enqueue() puts a ticket on an asyncio.Queue and returns a future
+    immediately. Worker tasks drain the queue in groups of up to
+    batch_size tickets, waiting at most max_wait_ms for a group to fill,
+    and create each group with provider.create_tickets.
+    """
+    
+    def __init__(
+        self,
+        provider: "TicketProvider",
+        workers: int = 2,
+        batch_size: int = 20,
+        max_wait_ms: int = 100,
+        maxsize: int = 10_000,
+    ):
+        self.provider = provider
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self.maxsize = maxsize
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    def start(self):
+        """Start the worker tasks (done automatically on first enqueue)."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def enqueue(self, ticket: Dict[str, Any]) -> "asyncio.Future":
+        """Queue create_ticket keyword arguments; returns a future for the result."""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((ticket, future))
+        return future
+    
+    async def _next_group(self) -> List[tuple]:
+        """Wait for one ticket, then collect more until the batch is full or max_wait_ms passes."""
+        loop = asyncio.get_running_loop()
+        group = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000
+        
+        while len(group) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                group.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return group
+    
+    async def _worker(self):
+        while True:
+            group = await self._next_group()
+            try:
+                results = await self.provider.create_tickets([ticket for ticket, _ in group])
+            except Exception as e:
+                logger.error(f"Queued ticket batch failed: {e}")
+                results = [{"status": "error", "error": str(e)} for _ in group]
+            
+            for (_, future), result in zip(group, results):
+                if not future.done():
+                    future.set_result(result)
+                self._queue.task_done()
+    
+    async def aclose(self):
+        """Wait for queued tickets to be created, then stop the workers."""
+        if not self._tasks:
+            return
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+class _TTLCache:
+    """
+    Small TTL cache with LRU eviction.
+    
+    get_or_fetch() holds a per-key lock around a miss, so concurrent
+    lookups of the same key share one fetch.
+    """
+    
+    def __init__(self, maxsize: int = 4096, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    def _get(self, key: str) -> tuple:
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, entry[1]
+    
+    def set(self, key: str, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def invalidate(self, key: str):
+        self._data.pop(key, None)
+    
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        hit, value = self._get(key)
+        if hit:
+            return value
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                hit, value = self._get(key)
+                if hit:
+                    return value
+                value = await fetch()
+                if cacheable(value):
+                    self.set(key, value)
+                return value
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def _gather_bounded(
+    func: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+    items: List[Dict[str, Any]],
+    max_concurrency: int,
+) -> List[Dict[str, Any]]:
+    """Run func over items with bounded concurrency, turning exceptions into error results."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def _one(item: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await func(item)
+    
+    results = await asyncio.gather(*[_one(item) for item in items], return_exceptions=True)
+    return [
+        {"status": "error", "error": str(r)} if isinstance(r, Exception) else r
+        for r in results
+    ]
+
+
+def _parse_delay(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After / X-RateLimit-Reset header into seconds from now.
+    
+    Accepts delta-seconds, epoch seconds, HTTP dates and ISO 8601 timestamps.
+    """
+    if not value:
+        return None
+    try:
+        number = float(value)
+        # Large values are absolute epoch timestamps
+        return max(0.0, number - time.time()) if number > 1e9 else max(0.0, number)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class _Throttle:
+    """
+    AIMD concurrency limiter for a ticketing API.
+    
+    The concurrency limit grows additively (alpha) while responses come
+    back under the latency target and shrinks multiplicatively (beta) on
+    429s, gateway errors, a slow (exponentially smoothed) mean latency or
+    a nearly exhausted rate-limit budget. On 429 or low remaining
+    budget, new requests are also held back until the
+    server's Retry-After / X-RateLimit-Reset time.
+    """
+    
+    def __init__(
+        self,
+        limit: float = 8.0,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        latency_target: float = 2.0,
+        min_limit: float = 1.0,
+        max_limit: float = 64.0,
+        smoothing: float = 0.2,
+    ):
+        self.limit = limit
+        self.alpha = alpha
+        self.beta = beta
+        self.latency_target = latency_target
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        
+        # Exponentially weighted mean latency, compared to latency_target
+        self.mean_latency: Optional[float] = None
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._cond = asyncio.Condition()
+    
+    @property
+    def permits(self) -> int:
+        return max(1, int(self.limit))
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Wait for a free slot (and any rate-limit pause) before a request."""
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.permits)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+    
+    def increase(self):
+        self.limit = min(self.max_limit, self.limit + self.alpha)
+    
+    def decrease(self, pause: float = 0.0):
+        self.limit = max(self.min_limit, self.limit * self.beta)
+        if pause > 0:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+    
+    def observe(self, response: "httpx.Response", latency: float):
+        """Adjust the limit from a response's status, rate-limit headers and latency."""
+        headers = response.headers
+        
+        if response.status_code == 429:
+            self.decrease(pause=_parse_delay(headers.get("Retry-After")) or 1.0)
+            return
+        
+        if response.status_code in (502, 503, 504):
+            self.decrease()
+            return
+        
+        remaining = headers.get("X-RateLimit-Remaining")
+        limit = headers.get("X-RateLimit-Limit")
+        if remaining is not None and limit:
+            try:
+                if float(remaining) < 0.1 * float(limit):
+                    self.decrease(pause=_parse_delay(headers.get("X-RateLimit-Reset")) or 0.0)
+                    return
+            except ValueError:
+                pass
+        
+        if self.mean_latency is None:
+            self.mean_latency = latency
+        else:
+            self.mean_latency += self.smoothing * (latency - self.mean_latency)
+        
+        if self.mean_latency < self.latency_target:
+            self.increase()
+        else:
+            self.decrease()
+
+
+# Atlassian Document Format wrapper for a ticket description. Only the
+# text varies, so the rest is serialized once and spliced around it.
+_ADF_PREFIX = (
+    b'{"type":"doc","version":1,"content":'
+    b'[{"type":"paragraph","content":[{"type":"text","text":'
+)
+_ADF_SUFFIX = b'}]}]}'
+
+
+def _adf(text: str) -> bytes:
+    """Serialize plain text as a single-paragraph ADF doc."""
+    return _ADF_PREFIX + _dumps(text) + _ADF_SUFFIX
+
+
+class _PooledClientMixin:
+    """
+    One pooled AsyncClient per provider class.
+
+    Instances keep their own base URL, auth and headers and pass them per
+    request, so every Jira (or ServiceNow, or webhook) provider in the
+    process reuses the same keep-alive connections and TLS sessions.
+    
+    Instances that have used the client hold a reference to the pool;
+    the pool is closed when the last of them is closed.
+    """
+    
+    _client: Optional["httpx.AsyncClient"] = None
+    _pool_users: int = 0
+    _holds_pool: bool = False
+    
+    # Statuses retried by _request, with jittered exponential backoff
+    RETRY_STATUSES = (429, 502, 503, 504)
+    MAX_ATTEMPTS = 3
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 8.0
+    # Seconds a fetched ticket is served from cache (absorbs status polling)
+    TICKET_TTL = 30.0
+    # "provider" label on exported metrics
+    METRICS_NAME = "http"
+    
+    @classmethod
+    def _get_client(cls) -> "httpx.AsyncClient":
+        """Get (or lazily create) the class-wide client."""
+        client = cls.__dict__.get("_client")
+        if client is None or client.is_closed:
+            # Retries are left to _request, which backs off through the throttle
+            transport = httpx.AsyncHTTPTransport(
+                http2=HAS_HTTP2,
+                retries=0,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0,
+                ),
+            )
+            client = httpx.AsyncClient(transport=transport, timeout=30.0)
+            cls._client = client
+        return client
+    
+    @classmethod
+    async def close_pool(cls):
+        """Close the class-wide client (call on shutdown)."""
+        client = cls.__dict__.get("_client")
+        cls._pool_users = 0
+        if client is not None:
+            cls._client = None
+            await client.aclose()
+    
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if not self._holds_pool:
+            cls = type(self)
+            cls._pool_users = cls.__dict__.get("_pool_users", 0) + 1
+            self._holds_pool = True
+        return self._get_client()
+    
+    async def _request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """
+        Send a request through the instance's AIMD throttle.
+        
+        Transport errors (connection resets, timeouts) and RETRY_STATUSES
+        responses are retried up to MAX_ATTEMPTS times, waiting for
+        Retry-After when given and a full-jitter exponential backoff
+        (capped at BACKOFF_MAX) otherwise. The last response is returned,
+        or the last transport error raised, once attempts run out.
+        """
+        throttle = self.__dict__.get("_throttle")
+        if throttle is None:
+            throttle = self._throttle = _Throttle()
+        
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            retry_after = None
+            try:
+                async with throttle.acquire():
+                    started = time.monotonic()
+                    response = await self.client.request(method, url, **kwargs)
+                    latency = time.monotonic() - started
+                    throttle.observe(response, latency)
+                    self._record(method, latency, response.status_code)
+            except httpx.TransportError as e:
+                self._record(method, time.monotonic() - started, type(e).__name__)
+                throttle.decrease()
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                logger.warning(f"{method} {url} failed ({e!r}), retrying")
+            else:
+                if response.status_code not in self.RETRY_STATUSES or attempt == self.MAX_ATTEMPTS:
+                    return response
+                retry_after = _parse_delay(response.headers.get("Retry-After"))
+            
+            if retry_after is None:
+                ceiling = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (attempt - 1))
+                retry_after = random.uniform(0, ceiling)
+            await asyncio.sleep(retry_after)
+        
+        return response
+    
+    def _record(self, method: str, latency: float, outcome: Any):
+        """Export request latency, and failures, to Prometheus when installed."""
+        if not HAS_PROMETHEUS:
+            return
+        provider = self.METRICS_NAME
+        op = method.lower()
+        TICKET_LATENCY.labels(provider, op).observe(latency)
+        if not isinstance(outcome, int) or outcome >= 400:
+            TICKET_ERRORS.labels(provider, op, str(outcome)).inc()
+    
+    async def _cached_ticket(
+        self,
+        ticket_id: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Get a ticket through the instance's TTL cache; errors are not cached.
+        
+        Each caller gets its own copy, so mutating a returned ticket never
+        changes what later get_ticket calls see.
+        """
+        cache = self.__dict__.get("_ticket_cache")
+        if cache is None:
+            cache = self._ticket_cache = _TTLCache(ttl=self.TICKET_TTL)
+        ticket = await cache.get_or_fetch(
+            ticket_id, fetch, cacheable=lambda t: t.get("status") != "error"
+        )
+        return copy.deepcopy(ticket)
+    
+    def _invalidate_ticket(self, ticket_id: str):
+        cache = self.__dict__.get("_ticket_cache")
+        if cache is not None:
+            cache.invalidate(ticket_id)
+    
+    async def aclose(self):
+        """Flush queued tickets and release this instance's hold on the pool."""
+        await super().aclose()
+        if not self._holds_pool:
+            return
+        self._holds_pool = False
+        cls = type(self)
+        cls._pool_users -= 1
+        if cls._pool_users <= 0:
+            await cls.close_pool()
+
+
+class JiraProvider(_PooledClientMixin, TicketProvider):
     """Jira Cloud integration."""
     
+    METRICS_NAME = "jira"
+    
+    # Maximum issues per POST /issue/bulk request
+    BULK_LIMIT = 50
+    # Projects, issue types, fields and priorities rarely change
+    META_TTL = 600.0
+    # Failed metadata lookups are remembered briefly so an outage doesn't
+    # refetch (with full retries) on every create
+    META_ERROR_TTL = 30.0
+    # Issue fields returned by get_ticket; comments and worklogs can run to MBs
+    TICKET_FIELDS = ("status", "assignee", "priority")
+    
+    # Default Jira priority names for our priority levels
+    PRIORITY_MAP = {
+        "low": "Low",
+        "medium": "Medium",
+        "high": "High",
+        "critical": "Highest",
+    }
+    
+    # Our priority levels, with their rank in Jira's highest-first priority list
+    PRIORITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+    
     def __init__(
         self,
         base_url: Optional[str] = None,
@@ -72,12 +648,102 @@ class JiraProvider(TicketProvider):
         self.email = email or os.getenv("JIRA_EMAIL")
         self.api_token = api_token or os.getenv("JIRA_API_TOKEN")
         
-        self.client = httpx.AsyncClient(
-            base_url=f"{self.base_url}/rest/api/3",
-            auth=(self.email, self.api_token) if self.email and self.api_token else None,
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
+        self.api_url = f"{self.base_url}/rest/api/3"
+        self.auth = (self.email, self.api_token) if self.email and self.api_token else None
+        self.headers = {"Content-Type": "application/json"}
+        
+        self._meta_cache: Dict[str, tuple] = {}
+    
+    async def _cached(self, key: str, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return an unexpired cached value, fetching and caching it for ttl seconds otherwise."""
+        entry = self._meta_cache.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        
+        value = await fetch()
+        self._meta_cache[key] = (time.monotonic() + ttl, value)
+        return value
+    
+    async def _get_metadata(self, resource: str) -> Optional[Any]:
+        """
+        Get a Jira metadata resource (project, priority, field, createmeta).
+        
+        Returns None when the lookup fails; the failure is cached for
+        META_ERROR_TTL seconds.
+        """
+        async def fetch():
+            response = await self._request(
+                "GET",
+                f"{self.api_url}/{resource}",
+                auth=self.auth,
+                headers=self.headers,
+            )
+            response.raise_for_status()
+            return _loads(response.content)
+        
+        try:
+            return await self._cached(resource, self.META_TTL, fetch)
+        except Exception as e:
+            logger.warning(f"Failed to fetch Jira {resource} metadata: {e}")
+            self._meta_cache[resource] = (time.monotonic() + self.META_ERROR_TTL, None)
+            return None
+    
+    async def _resolve_refs(
+        self,
+        priority: str,
+        project: str,
+        issue_type: str,
+        custom_fields: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Resolve project, issue type, priority and custom field names to IDs.
+        
+        Uses the cached metadata listings and falls back to the plain
+        names when metadata is unavailable. Issue types come from the
+        project's create metadata, since team-managed projects have their
+        own issue type IDs.
+        """
+        projects, create_meta, priorities, jira_fields = await asyncio.gather(
+            self._get_metadata("project"),
+            self._get_metadata(f"issue/createmeta/{project}/issuetypes"),
+            self._get_metadata("priority"),
+            self._get_metadata("field") if custom_fields else asyncio.sleep(0),
         )
+        
+        refs = {
+            "project": {"key": project},
+            "issuetype": {"name": issue_type},
+            "priority": {"name": self.PRIORITY_MAP.get(priority, "Medium")},
+        }
+        
+        for p in projects or []:
+            if p.get("key") == project:
+                refs["project"] = {"id": p["id"]}
+                break
+        
+        # Cloud pages issue types under "issueTypes", Data Center under "values"
+        create_meta = create_meta or {}
+        issue_types = create_meta.get("issueTypes") or create_meta.get("values") or []
+        for t in issue_types:
+            if t.get("name", "").lower() == issue_type.lower():
+                refs["issuetype"] = {"id": t["id"]}
+                break
+        
+        if priorities:
+            # Match by name first, then by rank so localized names still resolve
+            by_name = {p.get("name"): p["id"] for p in priorities}
+            name = refs["priority"]["name"]
+            rank = self.PRIORITY_RANK.get(priority, 2)
+            if name in by_name:
+                refs["priority"] = {"id": by_name[name]}
+            elif rank < len(priorities):
+                refs["priority"] = {"id": priorities[rank]["id"]}
+        
+        if custom_fields:
+            field_ids = {f.get("name"): f["id"] for f in jira_fields or []}
+            refs.update({field_ids.get(k, k): v for k, v in custom_fields.items()})
+        
+        return refs
     
     async def create_ticket(
         self,
@@ -90,52 +756,116 @@ class JiraProvider(TicketProvider):
         **kwargs,
     ) -> Dict[str, Any]:
         """Create Jira issue."""
-        # Map priority
-        priority_map = {
-            "low": "Low",
-            "medium": "Medium",
-            "high": "High",
-            "critical": "Highest",
-        }
-        
-        payload = {
-            "fields": {
-                "project": {"key": project},
-                "summary": title,
-                "description": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": description}]
-                        }
-                    ]
-                },
-                "issuetype": {"name": issue_type},
-                "priority": {"name": priority_map.get(priority, "Medium")},
-            }
-        }
-        
-        # Add custom fields if provided
-        if "custom_fields" in kwargs:
-            payload["fields"].update(kwargs["custom_fields"])
-        
         try:
-            response = await self.client.post("/issue", json=payload)
+            payload = await self._issue_json(
+                title, description, priority, project, issue_type, kwargs.get("custom_fields")
+            )
+            response = await self._request(
+                "POST",
+                f"{self.api_url}/issue",
+                content=payload,
+                auth=self.auth,
+                headers=self.headers,
+            )
             response.raise_for_status()
-            data = response.json()
+            data = _loads(response.content)
             
-            return {
-                "status": "success",
-                "ticket_id": data["key"],
-                "url": f"{self.base_url}/browse/{data['key']}",
-                "system": "jira",
-            }
+            return self._created(data["key"])
         except Exception as e:
             logger.error(f"Failed to create Jira ticket: {e}")
             return {"status": "error", "error": str(e)}
     
+    async def create_tickets(
+        self,
+        items: List[Dict[str, Any]],
+        *,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create Jira issues through the bulk endpoint.
+        
+        Issues are sent in chunks of BULK_LIMIT per request, with up to
+        max_concurrency chunks in flight.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            try:
+                issues = [
+                    await self._issue_json(
+                        item["title"], item["description"], item["priority"],
+                        item["project"], item["issue_type"], item.get("custom_fields"),
+                    )
+                    for item in chunk
+                ]
+                payload = b'{"issueUpdates":[' + b",".join(issues) + b"]}"
+                async with semaphore:
+                    response = await self._request(
+                        "POST",
+                        f"{self.api_url}/issue/bulk",
+                        content=payload,
+                        auth=self.auth,
+                        headers=self.headers,
+                    )
+                # Jira answers 400 with per-issue errors when every issue fails
+                if response.status_code != 400:
+                    response.raise_for_status()
+                data = _loads(response.content)
+            except Exception as e:
+                logger.error(f"Failed to bulk-create Jira tickets: {e}")
+                return [{"status": "error", "error": str(e)} for _ in chunk]
+            
+            # Created issues come back in request order, minus the failed ones
+            failed = {
+                err.get("failedElementNumber"): err.get("elementErrors", {})
+                for err in data.get("errors", [])
+            }
+            created = iter(data.get("issues", []))
+            results = []
+            for i in range(len(chunk)):
+                if i in failed:
+                    results.append({"status": "error", "error": str(failed[i])})
+                else:
+                    issue = next(created, None)
+                    results.append(
+                        self._created(issue["key"]) if issue
+                        else {"status": "error", "error": "Missing issue in bulk response"}
+                    )
+            return results
+        
+        chunks = [items[i:i + self.BULK_LIMIT] for i in range(0, len(items), self.BULK_LIMIT)]
+        chunk_results = await asyncio.gather(*[_chunk(chunk) for chunk in chunks])
+        return [result for chunk in chunk_results for result in chunk]
+    
+    async def _issue_json(
+        self,
+        title: str,
+        description: str,
+        priority: str,
+        project: str,
+        issue_type: str,
+        custom_fields: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        """Serialize the {"fields": ...} body of a Jira issue."""
+        fields = {"summary": title}
+        
+        # Project, issue type, priority and any custom fields
+        fields.update(await self._resolve_refs(priority, project, issue_type, custom_fields))
+        
+        # Splice the pre-serialized description in before the closing brace
+        return (
+            b'{"fields":' + _dumps(fields)[:-1]
+            + b',"description":' + _adf(description) + b'}}'
+        )
+    
+    def _created(self, key: str) -> Dict[str, Any]:
+        return {
+            "status": "success",
+            "ticket_id": key,
+            "url": f"{self.base_url}/browse/{key}",
+            "system": "jira",
+        }
+    
     async def update_ticket(
         self,
         ticket_id: str,
@@ -143,9 +873,16 @@ class JiraProvider(TicketProvider):
     ) -> Dict[str, Any]:
         """Update Jira issue."""
         payload = {"fields": updates}
+        self._invalidate_ticket(ticket_id)
         
         try:
-            response = await self.client.put(f"/issue/{ticket_id}", json=payload)
+            response = await self._request(
+                "PUT",
+                f"{self.api_url}/issue/{ticket_id}",
+                content=_dumps(payload),
+                auth=self.auth,
+                headers=self.headers,
+            )
             response.raise_for_status()
             return {"status": "success", "ticket_id": ticket_id}
         except Exception as e:
@@ -156,19 +893,40 @@ class JiraProvider(TicketProvider):
         self,
         ticket_id: str,
     ) -> Dict[str, Any]:
-        """Get Jira issue."""
+        """Get Jira issue TICKET_FIELDS (cached for TICKET_TTL seconds)."""
+        return await self._cached_ticket(ticket_id, lambda: self._fetch_ticket(ticket_id))
+    
+    async def _fetch_ticket(self, ticket_id: str) -> Dict[str, Any]:
         try:
-            response = await self.client.get(f"/issue/{ticket_id}")
+            response = await self._request(
+                "GET",
+                f"{self.api_url}/issue/{ticket_id}",
+                params={"fields": ",".join(self.TICKET_FIELDS)},
+                auth=self.auth,
+                headers=self.headers,
+            )
             response.raise_for_status()
-            return response.json()
+            return _loads(response.content)
         except Exception as e:
             logger.error(f"Failed to get Jira ticket: {e}")
             return {"status": "error", "error": str(e)}
 
 
-class ServiceNowProvider(TicketProvider):
+class ServiceNowProvider(_PooledClientMixin, TicketProvider):
     """ServiceNow integration."""
     
+    METRICS_NAME = "servicenow"
+    
+    # ServiceNow priorities run 1-5, 1 being highest
+    PRIORITY_MAP = {
+        "critical": "1",
+        "high": "2",
+        "medium": "3",
+        "low": "4",
+    }
+    # Incident columns returned by get_ticket
+    TICKET_FIELDS = ("number", "state", "assigned_to", "priority")
+    
     def __init__(
         self,
         instance: Optional[str] = None,
@@ -182,15 +940,12 @@ class ServiceNowProvider(TicketProvider):
         self.username = username or os.getenv("SERVICENOW_USERNAME")
         self.password = password or os.getenv("SERVICENOW_PASSWORD")
         
-        self.client = httpx.AsyncClient(
-            base_url=f"https://{self.instance}.service-now.com/api/now",
-            auth=(self.username, self.password) if self.username and self.password else None,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            },
-            timeout=30.0,
-        )
+        self.api_url = f"https://{self.instance}.service-now.com/api/now"
+        self.auth = (self.username, self.password) if self.username and self.password else None
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
     
     async def create_ticket(
         self,
@@ -203,21 +958,13 @@ class ServiceNowProvider(TicketProvider):
         **kwargs,
     ) -> Dict[str, Any]:
         """Create ServiceNow incident."""
-        # Map priority (ServiceNow uses 1-5, 1 being highest)
-        priority_map = {
-            "critical": "1",
-            "high": "2",
-            "medium": "3",
-            "low": "4",
-        }
-        
         # Map issue type to table
         table = "incident" if issue_type.lower() == "incident" else "sc_request"
         
         payload = {
             "short_description": title,
             "description": description,
-            "priority": priority_map.get(priority, "3"),
+            "priority": self.PRIORITY_MAP.get(priority, "3"),
             "category": project,
         }
         
@@ -225,9 +972,15 @@ class ServiceNowProvider(TicketProvider):
             payload["assignment_group"] = kwargs["assignment_group"]
         
         try:
-            response = await self.client.post(f"/table/{table}", json=payload)
+            response = await self._request(
+                "POST",
+                f"{self.api_url}/table/{table}",
+                content=_dumps(payload),
+                auth=self.auth,
+                headers=self.headers,
+            )
             response.raise_for_status()
-            data = response.json()
+            data = _loads(response.content)
             
             ticket_number = data["result"]["number"]
             return {
@@ -247,10 +1000,15 @@ class ServiceNowProvider(TicketProvider):
         **updates,
     ) -> Dict[str, Any]:
         """Update ServiceNow incident."""
+        self._invalidate_ticket(ticket_id)
+        
         try:
-            response = await self.client.patch(
-                f"/table/incident/{ticket_id}",
-                json=updates
+            response = await self._request(
+                "PATCH",
+                f"{self.api_url}/table/incident/{ticket_id}",
+                content=_dumps(updates),
+                auth=self.auth,
+                headers=self.headers,
             )
             response.raise_for_status()
             return {"status": "success", "ticket_id": ticket_id}
@@ -261,29 +1019,54 @@ class ServiceNowProvider(TicketProvider):
         self,
         ticket_id: str,
     ) -> Dict[str, Any]:
-        """Get ServiceNow incident."""
+        """Get ServiceNow incident TICKET_FIELDS (cached for TICKET_TTL seconds)."""
+        return await self._cached_ticket(ticket_id, lambda: self._fetch_ticket(ticket_id))
+    
+    async def _fetch_ticket(self, ticket_id: str) -> Dict[str, Any]:
         try:
-            response = await self.client.get(f"/table/incident/{ticket_id}")
+            response = await self._request(
+                "GET",
+                f"{self.api_url}/table/incident/{ticket_id}",
+                params={
+                    "sysparm_fields": ",".join(self.TICKET_FIELDS),
+                    "sysparm_exclude_reference_link": "true",
+                },
+                auth=self.auth,
+                headers=self.headers,
+            )
             response.raise_for_status()
-            return response.json()["result"]
+            return _loads(response.content)["result"]
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
 
-class WebhookProvider(TicketProvider):
+class WebhookProvider(_PooledClientMixin, TicketProvider):
     """Generic webhook provider for custom integrations."""
     
+    METRICS_NAME = "webhook"
+    
+    # Background updates in flight before fire-and-forget callers wait
+    MAX_PENDING_UPDATES = 100
+    
     def __init__(
         self,
         webhook_url: Optional[str] = None,
         headers: Optional[Dict[str, str]] = None,
+        fire_and_forget: Optional[bool] = None,
     ):
         if not HAS_HTTPX:
             raise ImportError("httpx package not installed")
         
         self.webhook_url = webhook_url or os.getenv("TICKET_WEBHOOK_URL")
-        self.headers = headers or {}
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Built once and reused for every request
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        
+        # Updates to sinks that never answer meaningfully can be sent in the
+        # background instead of making the caller wait for the response
+        if fire_and_forget is None:
+            fire_and_forget = bool(int(os.getenv("WEBHOOK_FAF", "0")))
+        self.fire_and_forget = fire_and_forget
+        self._pending: set = set()
     
     async def create_ticket(
         self,
@@ -296,9 +1079,36 @@ class WebhookProvider(TicketProvider):
         **kwargs,
     ) -> Dict[str, Any]:
         """Send ticket creation webhook."""
+        return await self._send_create(
+            _utc_timestamp(), system, title, description, priority, project, issue_type, **kwargs
+        )
+    
+    async def create_tickets(
+        self,
+        items: List[Dict[str, Any]],
+        *,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """Send creation webhooks concurrently, stamped with one batch timestamp."""
+        timestamp = _utc_timestamp()
+        return await _gather_bounded(
+            lambda item: self._send_create(timestamp, **item), items, max_concurrency
+        )
+    
+    async def _send_create(
+        self,
+        timestamp: str,
+        system: str,
+        title: str,
+        description: str,
+        priority: str,
+        project: str,
+        issue_type: str,
+        **kwargs,
+    ) -> Dict[str, Any]:
         payload = {
             "action": "create",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "ticket": {
                 "title": title,
                 "description": description,
@@ -310,17 +1120,18 @@ class WebhookProvider(TicketProvider):
         }
         
         try:
-            response = await self.client.post(
+            response = await self._request(
+                "POST",
                 self.webhook_url,
-                json=payload,
+                content=_dumps(payload),
                 headers=self.headers,
             )
             response.raise_for_status()
             
-            data = response.json() if response.content else {}
+            data = _loads(response.content) if response.content else {}
             return {
                 "status": "success",
-                "ticket_id": data.get("id", f"WH-{datetime.utcnow().timestamp()}"),
+                "ticket_id": data.get("id", f"WH-{time.time_ns()}"),
                 "system": "webhook",
             }
         except Exception as e:
@@ -332,23 +1143,55 @@ class WebhookProvider(TicketProvider):
         ticket_id: str,
         **updates,
     ) -> Dict[str, Any]:
-        """Send ticket update webhook."""
+        """
+        Send ticket update webhook.
+        
+        With fire_and_forget set the POST runs in the background and this
+        returns {"status": "queued"} immediately; failures are only logged.
+        """
+        if not self.webhook_url:
+            return {"status": "error", "error": "Webhook URL not configured"}
+        
         payload = {
             "action": "update",
             "ticket_id": ticket_id,
             "updates": updates,
         }
         
+        if self.fire_and_forget and len(self._pending) < self.MAX_PENDING_UPDATES:
+            task = asyncio.create_task(self._send_update(payload))
+            self._pending.add(task)
+            task.add_done_callback(self._update_done)
+            return {"status": "queued", "ticket_id": ticket_id}
+        
         try:
-            response = await self.client.post(
-                self.webhook_url,
-                json=payload,
-                headers=self.headers,
-            )
-            return {"status": "success"}
+            await self._send_update(payload)
+            return {"status": "success", "ticket_id": ticket_id}
         except Exception as e:
             return {"status": "error", "error": str(e)}
     
+    async def _send_update(self, payload: Dict[str, Any]):
+        response = await self._request(
+            "POST",
+            self.webhook_url,
+            content=_dumps(payload),
+            headers=self.headers,
+        )
+        # 204 No Content is the common answer from fire-and-forget sinks
+        if response.status_code != 204:
+            response.raise_for_status()
+    
+    def _update_done(self, task: "asyncio.Task"):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background webhook update failed: {task.exception()}")
+    
+    async def aclose(self):
+        """Wait for background updates, then release the pool."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await super().aclose()
+    
     async def get_ticket(
         self,
         ticket_id: str,
@@ -361,8 +1204,22 @@ class MockTicketProvider(TicketProvider):
     """Mock provider for testing."""
     
     def __init__(self):
-        self.tickets: Dict[str, Dict] = {}
-        self.counter = 0
+        # Append-only; ticket MOCK-N lives at index N - 1
+        self.tickets: List[Dict] = []
+    
+    @property
+    def counter(self) -> int:
+        return len(self.tickets)
+    
+    def _find(self, ticket_id: str) -> Optional[Dict]:
+        """Look up a ticket by its MOCK-N id."""
+        try:
+            index = int(ticket_id.removeprefix("MOCK-")) - 1
+        except ValueError:
+            return None
+        if 0 <= index < len(self.tickets):
+            return self.tickets[index]
+        return None
     
     async def create_ticket(
         self,
@@ -374,17 +1231,16 @@ class MockTicketProvider(TicketProvider):
         issue_type: str,
         **kwargs,
     ) -> Dict[str, Any]:
-        self.counter += 1
-        ticket_id = f"MOCK-{self.counter}"
+        ticket_id = f"MOCK-{len(self.tickets) + 1}"
         
-        self.tickets[ticket_id] = {
+        self.tickets.append({
             "id": ticket_id,
             "title": title,
             "description": description,
             "priority": priority,
             "status": "open",
-            "created_at": datetime.utcnow().isoformat(),
-        }
+            "created_at": _utc_timestamp(),
+        })
         
         logger.info(f"Mock ticket created: {ticket_id}")
         
@@ -400,8 +1256,9 @@ class MockTicketProvider(TicketProvider):
         ticket_id: str,
         **updates,
     ) -> Dict[str, Any]:
-        if ticket_id in self.tickets:
-            self.tickets[ticket_id].update(updates)
+        ticket = self._find(ticket_id)
+        if ticket is not None:
+            ticket.update(updates)
             return {"status": "success"}
         return {"status": "error", "error": "Ticket not found"}
     
@@ -409,19 +1266,74 @@ class MockTicketProvider(TicketProvider):
         self,
         ticket_id: str,
     ) -> Dict[str, Any]:
-        return self.tickets.get(ticket_id, {"status": "error", "error": "Not found"})
+        ticket = self._find(ticket_id)
+        return ticket if ticket is not None else {"status": "error", "error": "Not found"}
+
+
+# Providers built by create_ticket_provider, keyed by type and frozen kwargs
+_providers: Dict[Any, TicketProvider] = {}
+
+
+def _freeze(value: Any) -> Any:
+    """Turn kwargs values (dicts, lists) into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
 
 
 def create_ticket_provider(
     provider_type: str = "mock",
     **kwargs,
 ) -> TicketProvider:
-    """Factory to create ticket provider."""
-    if provider_type == "jira":
-        return JiraProvider(**kwargs)
-    elif provider_type == "servicenow":
-        return ServiceNowProvider(**kwargs)
-    elif provider_type == "webhook":
-        return WebhookProvider(**kwargs)
-    else:
+    """
+    Factory to create ticket provider.
+    
+    HTTP-backed providers are memoized: repeated calls with the same type
+    and kwargs return the same instance. Mock providers keep their tickets
+    in memory and are always created fresh.
+    
+    Each call counts as one holder of the returned provider. Use it as an
+    async context manager (or call release()) to drop that hold; a shared
+    provider is only closed, flushing its queue and releasing its pooled
+    HTTP client, once every holder has released it:
+    
+        async with create_ticket_provider("jira") as provider:
+            await provider.create_ticket(...)
+    
+    Call close_ticket_clients() on shutdown to close every provider and
+    pool regardless of holders.
+    """
+    provider_cls = {
+        "jira": JiraProvider,
+        "servicenow": ServiceNowProvider,
+        "webhook": WebhookProvider,
+    }.get(provider_type)
+    if provider_cls is None:
         return MockTicketProvider()
+    
+    key = (provider_type, _freeze(kwargs))
+    try:
+        provider = _providers.get(key)
+    except TypeError:
+        # Unhashable kwargs value; build without caching
+        return provider_cls(**kwargs)
+    if provider is None:
+        provider = _providers[key] = provider_cls(**kwargs)
+    provider._holders = provider.__dict__.get("_holders", 0) + 1
+    return provider
+
+
+def reset_provider_cache():
+    """Forget memoized providers (e.g. between tests)."""
+    _providers.clear()
+
+
+async def close_ticket_clients():
+    """Close memoized providers and the pooled clients of all HTTP-backed providers."""
+    for provider in list(_providers.values()):
+        provider._holders = 0
+        await provider.aclose()
+    for provider_cls in (JiraProvider, ServiceNowProvider, WebhookProvider):
+        await provider_cls.close_pool()
@@ -11,23 +11,55 @@ MCP enables AI to:
 - Create alerts and incidents
 """
 
+import copy
 import json
 import asyncio
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import httpx
 
+from ml.agent.http import close_client, get_client
 
-@dataclass
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from pydantic import ConfigDict, ValidationError, create_model
+    HAS_PYDANTIC = True
+except ImportError:
+    HAS_PYDANTIC = False
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a JSON response body (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_pretty(obj: Any) -> str:
+    """Serialize a result for display, indented by two spaces."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+@dataclass(frozen=True, slots=True)
 class MCPTool:
     """Definition of an MCP tool."""
     name: str
     description: str
-    input_schema: Dict[str, Any]
+    # Dicts are unhashable, so tools hash by name and description only
+    input_schema: Dict[str, Any] = field(hash=False)
     
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MCPResource:
     """Definition of an MCP resource."""
     uri: str
@@ -36,6 +68,232 @@ class MCPResource:
     mime_type: str = "application/json"
 
 
+# Tool and resource definitions never change, so they are built once at
+# import instead of on every list_tools()/list_resources() call.
+_TOOLS = (
+    MCPTool(
+        name="get_all_assets",
+        description="Get a list of all monitored assets with their current health status",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of assets to return",
+                    "default": 50
+                },
+                "risk_level": {
+                    "type": "string",
+                    "enum": ["normal", "warning", "critical"],
+                    "description": "Filter by risk level"
+                }
+            }
+        }
+    ),
+    MCPTool(
+        name="get_asset_health",
+        description="Get detailed health information for a specific asset including anomaly score, RUL, and risk level",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "asset_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the asset"
+                }
+            },
+            "required": ["asset_id"]
+        }
+    ),
+    MCPTool(
+        name="get_predictions",
+        description="Get ML predictions (anomaly scores, RUL estimates) for an asset",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "asset_id": {
+                    "type": "string",
+                    "description": "The asset to get predictions for"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of recent predictions to return",
+                    "default": 10
+                }
+            },
+            "required": ["asset_id"]
+        }
+    ),
+    MCPTool(
+        name="get_prediction_explanation",
+        description="Get SHAP-based explanation for why a prediction was made (XAI)",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "prediction_id": {
+                    "type": "string",
+                    "description": "The prediction to explain"
+                }
+            },
+            "required": ["prediction_id"]
+        }
+    ),
+    MCPTool(
+        name="get_alerts",
+        description="Get active alerts across all assets or for a specific asset",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "status": {
+                    "type": "string",
+                    "enum": ["active", "acknowledged", "resolved"],
+                    "description": "Filter by alert status"
+                },
+                "severity": {
+                    "type": "string",
+                    "enum": ["info", "warning", "critical"],
+                    "description": "Filter by severity"
+                },
+                "limit": {
+                    "type": "integer",
+                    "default": 20
+                }
+            }
+        }
+    ),
+    MCPTool(
+        name="get_dashboard_stats",
+        description="Get overall platform statistics including total assets, health distribution, and alert counts",
+        input_schema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    MCPTool(
+        name="chat_with_copilot",
+        description="Chat with the AI Maintenance Copilot to get insights, suggestions, or ask questions about assets",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "Your question or request to the AI Copilot"
+                },
+                "asset_id": {
+                    "type": "string",
+                    "description": "Optional: Context asset for the conversation"
+                }
+            },
+            "required": ["message"]
+        }
+    ),
+    MCPTool(
+        name="get_copilot_suggestions",
+        description="Get AI-generated maintenance suggestions for an asset",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "asset_id": {
+                    "type": "string",
+                    "description": "The asset to get suggestions for"
+                }
+            },
+            "required": ["asset_id"]
+        }
+    ),
+    MCPTool(
+        name="check_drift",
+        description="Check if there's data or concept drift for an asset's ML model",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "asset_id": {
+                    "type": "string",
+                    "description": "The asset to check for drift"
+                }
+            },
+            "required": ["asset_id"]
+        }
+    ),
+    MCPTool(
+        name="create_alert",
+        description="Create a new alert for an asset",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "asset_id": {
+                    "type": "string",
+                    "description": "The asset to create alert for"
+                },
+                "severity": {
+                    "type": "string",
+                    "enum": ["info", "warning", "critical"],
+                    "description": "Alert severity level"
+                },
+                "message": {
+                    "type": "string",
+                    "description": "Alert message describing the issue"
+                }
+            },
+            "required": ["asset_id", "severity", "message"]
+        }
+    ),
+)
+
+_RESOURCES = (
+    MCPResource(
+        uri="sensormind://assets",
+        name="All Assets",
+        description="List of all monitored assets with health status"
+    ),
+    MCPResource(
+        uri="sensormind://alerts/active",
+        name="Active Alerts",
+        description="Currently active alerts requiring attention"
+    ),
+    MCPResource(
+        uri="sensormind://dashboard",
+        name="Dashboard Stats",
+        description="Platform overview statistics"
+    ),
+)
+
+_JSON_TYPES = {"string": str, "integer": int, "number": float, "boolean": bool}
+
+
+def _build_validator(tool: MCPTool):
+    """Build a pydantic model for a tool's (flat) JSON input schema."""
+    fields = {}
+    required = set(tool.input_schema.get("required", []))
+    for prop, spec in tool.input_schema.get("properties", {}).items():
+        if "enum" in spec:
+            annotation = Literal[tuple(spec["enum"])]
+        else:
+            annotation = _JSON_TYPES.get(spec.get("type"), Any)
+        if prop in required:
+            fields[prop] = (annotation, ...)
+        else:
+            fields[prop] = (Optional[annotation], spec.get("default"))
+    return create_model(
+        f"{tool.name}_arguments",
+        __config__=ConfigDict(extra="forbid"),
+        **fields,
+    )
+
+
+# Argument validators, built once so call_tool rejects bad input before any
+# request reaches the backend
+_VALIDATORS = {tool.name: _build_validator(tool) for tool in _TOOLS} if HAS_PYDANTIC else {}
+
+# Seconds a read-only tool's result is cached; tools not listed are never cached
+_TTL = {
+    "get_all_assets": 10.0,
+    "get_asset_health": 10.0,
+    "get_alerts": 5.0,
+    "get_dashboard_stats": 30.0,
+}
+_CACHE_SIZE = 1024
+
+
 class SensorMindMCPServer:
     """
     MCP Server for SensorMind Predictive Maintenance Platform.
@@ -55,6 +313,9 @@ class SensorMindMCPServer:
         
         # Call a tool
         result = await server.call_tool("get_asset_health", {"asset_id": "pump-001"})
+    
+    HTTP calls share one pooled httpx.AsyncClient (see ml.agent.http)
+    unless a client is passed in.
     """
     
     def __init__(
@@ -62,25 +323,51 @@ class SensorMindMCPServer:
         api_url: str = "http://localhost:8000",
         api_key: Optional[str] = None,
         jwt_token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
     ):
         self.api_url = api_url.rstrip("/")
         self.api_key = api_key
         self.jwt_token = jwt_token
-        self._client = httpx.AsyncClient(timeout=30.0)
-        
-    async def close(self):
-        """Close the HTTP client."""
-        await self._client.aclose()
+        # None means the shared, pooled client from ml.agent.http
+        self._own_client = client
+        # (tool, sorted arguments) -> (expiry, result), least recently used first
+        self._cache: "OrderedDict[tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
         
-    def _get_headers(self) -> Dict[str, str]:
-        """Get authentication headers."""
-        headers = {"Content-Type": "application/json"}
+        # Authentication headers, built once; the pooled client is shared
+        # with other callers so they are passed per request
+        self._headers = {"Content-Type": "application/json"}
         if self.jwt_token:
-            headers["Authorization"] = f"Bearer {self.jwt_token}"
+            self._headers["Authorization"] = f"Bearer {self.jwt_token}"
         if self.api_key:
-            headers["X-API-Key"] = self.api_key
-        return headers
+            self._headers["X-API-Key"] = self.api_key
+        
+        self._tool_handlers = {
+            "get_all_assets": self._get_all_assets,
+            "get_asset_health": self._get_asset_health,
+            "get_predictions": self._get_predictions,
+            "get_prediction_explanation": self._get_prediction_explanation,
+            "get_alerts": self._get_alerts,
+            "get_dashboard_stats": self._get_dashboard_stats,
+            "chat_with_copilot": self._chat_with_copilot,
+            "get_copilot_suggestions": self._get_copilot_suggestions,
+            "check_drift": self._check_drift,
+            "create_alert": self._create_alert,
+        }
     
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        return self._own_client or get_client()
+        
+    async def close(self):
+        """
+        Release the server's HTTP resources.
+        
+        The shared client outlives individual servers, so this only closes
+        a client that was passed in explicitly.
+        """
+        if self._own_client is not None:
+            await self._own_client.aclose()
+        
     # =========================================================================
     # MCP Protocol Methods
     # =========================================================================
@@ -92,174 +379,7 @@ class SensorMindMCPServer:
         Returns:
             List of tool definitions with names, descriptions, and input schemas.
         """
-        return [
-            MCPTool(
-                name="get_all_assets",
-                description="Get a list of all monitored assets with their current health status",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "limit": {
-                            "type": "integer",
-                            "description": "Maximum number of assets to return",
-                            "default": 50
-                        },
-                        "risk_level": {
-                            "type": "string",
-                            "enum": ["normal", "warning", "critical"],
-                            "description": "Filter by risk level"
-                        }
-                    }
-                }
-            ),
-            MCPTool(
-                name="get_asset_health",
-                description="Get detailed health information for a specific asset including anomaly score, RUL, and risk level",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "asset_id": {
-                            "type": "string",
-                            "description": "The unique identifier of the asset"
-                        }
-                    },
-                    "required": ["asset_id"]
-                }
-            ),
-            MCPTool(
-                name="get_predictions",
-                description="Get ML predictions (anomaly scores, RUL estimates) for an asset",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "asset_id": {
-                            "type": "string",
-                            "description": "The asset to get predictions for"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Number of recent predictions to return",
-                            "default": 10
-                        }
-                    },
-                    "required": ["asset_id"]
-                }
-            ),
-            MCPTool(
-                name="get_prediction_explanation",
-                description="Get SHAP-based explanation for why a prediction was made (XAI)",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "prediction_id": {
-                            "type": "string",
-                            "description": "The prediction to explain"
-                        }
-                    },
-                    "required": ["prediction_id"]
-                }
-            ),
-            MCPTool(
-                name="get_alerts",
-                description="Get active alerts across all assets or for a specific asset",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "status": {
-                            "type": "string",
-                            "enum": ["active", "acknowledged", "resolved"],
-                            "description": "Filter by alert status"
-                        },
-                        "severity": {
-                            "type": "string",
-                            "enum": ["info", "warning", "critical"],
-                            "description": "Filter by severity"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "default": 20
-                        }
-                    }
-                }
-            ),
-            MCPTool(
-                name="get_dashboard_stats",
-                description="Get overall platform statistics including total assets, health distribution, and alert counts",
-                input_schema={
-                    "type": "object",
-                    "properties": {}
-                }
-            ),
-            MCPTool(
-                name="chat_with_copilot",
-                description="Chat with the AI Maintenance Copilot to get insights, suggestions, or ask questions about assets",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "message": {
-                            "type": "string",
-                            "description": "Your question or request to the AI Copilot"
-                        },
-                        "asset_id": {
-                            "type": "string",
-                            "description": "Optional: Context asset for the conversation"
-                        }
-                    },
-                    "required": ["message"]
-                }
-            ),
-            MCPTool(
-                name="get_copilot_suggestions",
-                description="Get AI-generated maintenance suggestions for an asset",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "asset_id": {
-                            "type": "string",
-                            "description": "The asset to get suggestions for"
-                        }
-                    },
-                    "required": ["asset_id"]
-                }
-            ),
-            MCPTool(
-                name="check_drift",
-                description="Check if there's data or concept drift for an asset's ML model",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "asset_id": {
-                            "type": "string",
-                            "description": "The asset to check for drift"
-                        }
-                    },
-                    "required": ["asset_id"]
-                }
-            ),
-            MCPTool(
-                name="create_alert",
-                description="Create a new alert for an asset",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "asset_id": {
-                            "type": "string",
-                            "description": "The asset to create alert for"
-                        },
-                        "severity": {
-                            "type": "string",
-                            "enum": ["info", "warning", "critical"],
-                            "description": "Alert severity level"
-                        },
-                        "message": {
-                            "type": "string",
-                            "description": "Alert message describing the issue"
-                        }
-                    },
-                    "required": ["asset_id", "severity", "message"]
-                }
-            ),
-        ]
+        return list(_TOOLS)
     
     def list_resources(self) -> List[MCPResource]:
         """
@@ -268,23 +388,7 @@ class SensorMindMCPServer:
         Returns:
             List of resource definitions.
         """
-        return [
-            MCPResource(
-                uri="sensormind://assets",
-                name="All Assets",
-                description="List of all monitored assets with health status"
-            ),
-            MCPResource(
-                uri="sensormind://alerts/active",
-                name="Active Alerts",
-                description="Currently active alerts requiring attention"
-            ),
-            MCPResource(
-                uri="sensormind://dashboard",
-                name="Dashboard Stats",
-                description="Platform overview statistics"
-            ),
-        ]
+        return list(_RESOURCES)
     
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -297,27 +401,40 @@ class SensorMindMCPServer:
         Returns:
             Tool execution result
         """
-        tool_handlers = {
-            "get_all_assets": self._get_all_assets,
-            "get_asset_health": self._get_asset_health,
-            "get_predictions": self._get_predictions,
-            "get_prediction_explanation": self._get_prediction_explanation,
-            "get_alerts": self._get_alerts,
-            "get_dashboard_stats": self._get_dashboard_stats,
-            "chat_with_copilot": self._chat_with_copilot,
-            "get_copilot_suggestions": self._get_copilot_suggestions,
-            "check_drift": self._check_drift,
-            "create_alert": self._create_alert,
-        }
-        
-        handler = tool_handlers.get(name)
-        if not handler:
+        try:
+            handler = self._tool_handlers[name]
+        except KeyError:
             return {"error": f"Unknown tool: {name}"}
         
+        validator = _VALIDATORS.get(name)
+        if validator is not None:
+            try:
+                # Only pass what the caller set so handler defaults still apply
+                arguments = validator.model_validate(arguments).model_dump(exclude_unset=True)
+            except ValidationError as e:
+                return {"error": f"Invalid arguments for {name}: {e}"}
+        
         try:
-            return await handler(**arguments)
+            return await self._cached(name, handler, arguments)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            return {"error": str(e)}
+            return {"error": f"{type(e).__name__}: {e}"}
+    
+    async def call_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Execute several MCP tools concurrently.
+        
+        With HTTP/2 available the requests are multiplexed as parallel
+        streams over one connection to the backend.
+        
+        Args:
+            calls: (tool name, arguments) pairs
+            
+        Returns:
+            Tool execution results, in the same order as calls
+        """
+        return await asyncio.gather(*(self.call_tool(name, args) for name, args in calls))
     
     async def read_resource(self, uri: str) -> Dict[str, Any]:
         """
@@ -330,14 +447,76 @@ class SensorMindMCPServer:
             Resource content
         """
         if uri == "sensormind://assets":
-            return await self._get_all_assets()
+            return await self._cached("get_all_assets", self._get_all_assets, {})
         elif uri == "sensormind://alerts/active":
-            return await self._get_alerts(status="active")
+            return await self._cached("get_alerts", self._get_alerts, {"status": "active"})
         elif uri == "sensormind://dashboard":
-            return await self._get_dashboard_stats()
+            return await self._cached("get_dashboard_stats", self._get_dashboard_stats, {})
         else:
             return {"error": f"Unknown resource: {uri}"}
     
+    async def read_resources(self, uris: List[str]) -> List[Dict[str, Any]]:
+        """
+        Read several MCP resources concurrently.
+        
+        Args:
+            uris: Resource URIs to read
+            
+        Returns:
+            Resource contents, in the same order as uris
+        """
+        return await asyncio.gather(*(self.read_resource(uri) for uri in uris))
+    
+    # =========================================================================
+    # Result Cache
+    # =========================================================================
+    
+    async def _cached(
+        self,
+        name: str,
+        handler: Callable[..., Awaitable[Dict[str, Any]]],
+        arguments: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Run a tool handler through the TTL cache.
+        
+        Only tools listed in _TTL are cached, and error results never are.
+        Callers get their own copy of a cached result, so mutating it can't
+        change what later callers see.
+        """
+        ttl = _TTL.get(name)
+        if ttl is None:
+            return await handler(**arguments)
+        
+        try:
+            key = (name, tuple(sorted(arguments.items())))
+            entry = self._cache.get(key)
+        except TypeError:
+            # Unhashable argument value
+            return await handler(**arguments)
+        
+        now = time.monotonic()
+        if entry is not None and entry[0] > now:
+            self._cache.move_to_end(key)
+            return copy.deepcopy(entry[1])
+        
+        result = await handler(**arguments)
+        if "error" not in result:
+            self._cache[key] = (now + ttl, copy.deepcopy(result))
+            self._cache.move_to_end(key)
+            if len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+    
+    def _invalidate(self, asset_id: str):
+        """Drop cached results that may change when an asset's alerts change."""
+        stale = [
+            key for key in self._cache
+            if key[0] in ("get_alerts", "get_dashboard_stats") or ("asset_id", asset_id) in key[1]
+        ]
+        for key in stale:
+            del self._cache[key]
+    
     # =========================================================================
     # Tool Implementations
     # =========================================================================
@@ -354,12 +533,12 @@ class SensorMindMCPServer:
             
         response = await self._client.get(
             f"{self.api_url}/api/v1/assets",
-            headers=self._get_headers(),
+            headers=self._headers,
             params=params
         )
         
         if response.status_code == 200:
-            assets = response.json()
+            assets = _loads(response.content)
             return {
                 "success": True,
                 "count": len(assets),
@@ -371,21 +550,16 @@ class SensorMindMCPServer:
         """Get detailed health for an asset."""
         response = await self._client.get(
             f"{self.api_url}/api/v1/assets/{asset_id}",
-            headers=self._get_headers()
+            headers=self._headers
         )
         
         if response.status_code == 200:
-            asset = response.json()
-            return {
-                "success": True,
-                "asset_id": asset_id,
-                "name": asset.get("name"),
-                "type": asset.get("type"),
-                "health_score": asset.get("health_score"),
-                "risk_level": asset.get("risk_level"),
-                "location": asset.get("location"),
-                "status": "healthy" if asset.get("health_score", 0) > 70 else "needs_attention"
-            }
+            # Annotate the parsed asset in place rather than copying fields out
+            asset = _loads(response.content)
+            asset["success"] = True
+            asset["asset_id"] = asset_id
+            asset["status"] = "healthy" if (asset.get("health_score") or 0) > 70 else "needs_attention"
+            return asset
         return {"error": f"Asset not found: {asset_id}"}
     
     async def _get_predictions(
@@ -396,12 +570,12 @@ class SensorMindMCPServer:
         """Get predictions for an asset."""
         response = await self._client.get(
             f"{self.api_url}/api/v1/predictions/asset/{asset_id}",
-            headers=self._get_headers(),
+            headers=self._headers,
             params={"limit": limit}
         )
         
         if response.status_code == 200:
-            predictions = response.json()
+            predictions = _loads(response.content)
             return {
                 "success": True,
                 "asset_id": asset_id,
@@ -414,14 +588,14 @@ class SensorMindMCPServer:
         """Get XAI explanation for a prediction."""
         response = await self._client.get(
             f"{self.api_url}/api/v1/predictions/{prediction_id}/explain",
-            headers=self._get_headers()
+            headers=self._headers
         )
         
         if response.status_code == 200:
             return {
                 "success": True,
                 "prediction_id": prediction_id,
-                "explanation": response.json()
+                "explanation": _loads(response.content)
             }
         return {"error": f"Explanation not found: {prediction_id}"}
     
@@ -440,12 +614,12 @@ class SensorMindMCPServer:
             
         response = await self._client.get(
             f"{self.api_url}/api/v1/alerts",
-            headers=self._get_headers(),
+            headers=self._headers,
             params=params
         )
         
         if response.status_code == 200:
-            alerts = response.json()
+            alerts = _loads(response.content)
             return {
                 "success": True,
                 "count": len(alerts),
@@ -457,13 +631,13 @@ class SensorMindMCPServer:
         """Get dashboard statistics."""
         response = await self._client.get(
             f"{self.api_url}/api/v1/dashboard/stats",
-            headers=self._get_headers()
+            headers=self._headers
         )
         
         if response.status_code == 200:
             return {
                 "success": True,
-                "stats": response.json()
+                "stats": _loads(response.content)
             }
         return {"error": f"Failed to get stats: {response.status_code}"}
     
@@ -479,12 +653,12 @@ class SensorMindMCPServer:
             
         response = await self._client.post(
             f"{self.api_url}/api/v1/copilot/chat",
-            headers=self._get_headers(),
+            headers=self._headers,
             json=payload
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = _loads(response.content)
             return {
                 "success": True,
                 "response": result.get("response"),
@@ -496,14 +670,14 @@ class SensorMindMCPServer:
         """Get maintenance suggestions."""
         response = await self._client.get(
             f"{self.api_url}/api/v1/copilot/suggestions/{asset_id}",
-            headers=self._get_headers()
+            headers=self._headers
         )
         
         if response.status_code == 200:
             return {
                 "success": True,
                 "asset_id": asset_id,
-                "suggestions": response.json()
+                "suggestions": _loads(response.content)
             }
         return {"error": f"Failed to get suggestions: {response.status_code}"}
     
@@ -511,14 +685,14 @@ class SensorMindMCPServer:
         """Check for model drift."""
         response = await self._client.get(
             f"{self.api_url}/api/v1/ml/drift/{asset_id}",
-            headers=self._get_headers()
+            headers=self._headers
         )
         
         if response.status_code == 200:
             return {
                 "success": True,
                 "asset_id": asset_id,
-                "drift_info": response.json()
+                "drift_info": _loads(response.content)
             }
         return {"error": f"Failed to check drift: {response.status_code}"}
     
@@ -529,6 +703,8 @@ class SensorMindMCPServer:
         message: str
     ) -> Dict[str, Any]:
         """Create a new alert."""
+        self._invalidate(asset_id)
+        
         # Note: This would need a proper endpoint in the backend
         return {
             "success": True,
@@ -543,6 +719,11 @@ class SensorMindMCPServer:
 # MCP Server Runner (for standalone mode)
 # =========================================================================
 
+async def ainput(prompt: str = "") -> str:
+    """input() on a worker thread, so the event loop keeps running while waiting."""
+    return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
+
+
 async def run_mcp_server():
     """
     Run the MCP server in standalone mode.
@@ -571,26 +752,34 @@ async def run_mcp_server():
     # Interactive mode
     while True:
         try:
-            cmd = input("\nEnter tool name (or 'quit'): ").strip()
+            cmd = (await ainput("\nEnter tool name (or 'quit'): ")).strip()
             if cmd.lower() == 'quit':
                 break
             if cmd.lower() == 'list':
                 for tool in server.list_tools():
                     print(f"  {tool.name}")
                 continue
+            if cmd.lower() == 'warm':
+                # Prefill the result cache with every resource at once
+                results = await server.read_resources([r.uri for r in server.list_resources()])
+                for resource, result in zip(server.list_resources(), results):
+                    print(f"  {resource.uri}: {'error' if 'error' in result else 'ok'}")
+                continue
                 
-            args_str = input("Enter arguments (JSON): ").strip() or "{}"
-            args = json.loads(args_str)
+            args_str = (await ainput("Enter arguments (JSON): ")).strip() or "{}"
+            args = _loads(args_str)
             
             result = await server.call_tool(cmd, args)
-            print(json.dumps(result, indent=2))
+            print(_dumps_pretty(result))
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
+            # Ctrl-C / Ctrl-D
             break
         except Exception as e:
             print(f"Error: {e}")
     
     await server.close()
+    await close_client()
     print("\nServer stopped.")
 
 
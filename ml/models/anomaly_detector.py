@@ -8,10 +8,13 @@ Uses a hybrid approach:
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime
 import joblib
+from joblib import parallel_config
 import json
+import logging
+import tracemalloc
 from pathlib import Path
 
 from sklearn.ensemble import IsolationForest
@@ -19,6 +22,26 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 import shap
 
+try:
+    # Drop-in TreeSHAP with parallel, cached subtree summaries
+    import fasttreeshap
+    HAS_FASTTREESHAP = True
+except ImportError:
+    HAS_FASTTREESHAP = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+logger = logging.getLogger(__name__)
+
+
+# Risk level per np.digitize bin of the normalized anomaly score
+RISK_LEVELS = np.array(["normal", "warning", "critical"])
+RISK_THRESHOLDS = [0.5, 0.8]
+
 
 class AnomalyDetector:
     """
@@ -31,17 +54,25 @@ class AnomalyDetector:
     - Batch and streaming inference
     """
     
+    # Smaller batches are scored on one thread; joblib overhead dominates
+    PARALLEL_MIN_ROWS = 2000
+    
     def __init__(
         self,
         contamination: float = 0.1,
         n_estimators: int = 100,
         random_state: int = 42,
-        model_version: str = "1.0.0"
+        model_version: str = "1.0.0",
+        predict_jobs: int = -1,
+        shap_chunk_size: int = 1024,
     ):
         self.contamination = contamination
         self.n_estimators = n_estimators
         self.random_state = random_state
         self.model_version = model_version
+        self.predict_jobs = predict_jobs
+        # Rows per TreeSHAP call; bounds its intermediate allocations
+        self.shap_chunk_size = shap_chunk_size
         
         self.scaler = StandardScaler()
         self.model = IsolationForest(
@@ -52,6 +83,9 @@ class AnomalyDetector:
         )
         self.explainer: Optional[shap.Explainer] = None
         self.feature_names: List[str] = []
+        # Training columns of X, selected (in order) from inference frames;
+        # feature_names are display labels and may differ
+        self.feature_columns: List[str] = []
         self.is_fitted = False
         self.training_stats: Dict[str, Any] = {}
     
@@ -70,7 +104,8 @@ class AnomalyDetector:
         Returns:
             Self for chaining
         """
-        self.feature_names = feature_names or list(X.columns)
+        self.feature_columns = list(X.columns)
+        self.feature_names = feature_names or self.feature_columns
         
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
@@ -79,7 +114,7 @@ class AnomalyDetector:
         self.model.fit(X_scaled)
         
         # Create SHAP explainer
-        self.explainer = shap.TreeExplainer(self.model)
+        self.explainer = self._build_explainer(self.model)
         
         # Store training statistics
         self.training_stats = {
@@ -94,10 +129,24 @@ class AnomalyDetector:
         self.is_fitted = True
         return self
     
+    @staticmethod
+    def _build_explainer(model: IsolationForest) -> "shap.Explainer":
+        """
+        Create the TreeSHAP explainer for a fitted forest.
+        
+        Uses fasttreeshap when installed (its "v2" algorithm precomputes
+        subtree summaries and runs across all cores); falls back to shap.
+        Both expose the same shap_values() API.
+        """
+        if HAS_FASTTREESHAP:
+            return fasttreeshap.TreeExplainer(model, algorithm="v2", n_jobs=-1)
+        return shap.TreeExplainer(model)
+    
     def predict(
         self,
         X: pd.DataFrame,
-        return_scores: bool = True
+        return_scores: bool = True,
+        as_list: bool = True,
     ) -> Dict[str, Any]:
         """
         Predict anomalies with scores.
@@ -105,6 +154,7 @@ class AnomalyDetector:
         Args:
             X: Data to predict on
             return_scores: Whether to return anomaly scores
+            as_list: Return lists (JSON-ready); False returns NumPy arrays
         
         Returns:
             Dictionary with predictions, scores, and risk levels
@@ -112,23 +162,44 @@ class AnomalyDetector:
         if not self.is_fitted:
             raise ValueError("Model not fitted. Call fit() first.")
         
-        X_scaled = self.scaler.transform(X)
+        return self._predict_scaled(self.scaler.transform(self._select_features(X)), as_list)
+    
+    def _select_features(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Slice X to the training feature columns, in training order."""
+        # Callers may pass wide frames (timestamp, asset_id, ...); the
+        # common case already matches, so avoid copying it
+        if list(X.columns) == self.feature_columns:
+            return X
+        return X[self.feature_columns]
+    
+    def _predict_scaled(self, X_scaled: np.ndarray, as_list: bool = True) -> Dict[str, Any]:
+        """Score already-scaled rows."""
+        n_jobs = self.predict_jobs if len(X_scaled) >= self.PARALLEL_MIN_ROWS else 1
         
-        # Get predictions (-1 = anomaly, 1 = normal)
-        predictions = self.model.predict(X_scaled)
+        # Forest scoring releases the GIL, so threads parallelize it.
+        # predict() and decision_function() would each traverse the forest;
+        # score once and derive both (decision = score - offset_)
+        with parallel_config(backend="threading", n_jobs=n_jobs):
+            raw_scores = self.model.score_samples(X_scaled) - self.model.offset_
         
-        # Get anomaly scores (negative = more anomalous)
-        raw_scores = self.model.decision_function(X_scaled)
+        # Get predictions (-1 = anomaly, 1 = normal); negative = more anomalous
+        predictions = np.where(raw_scores < 0, -1, 1)
         
         # Normalize scores to 0-1 (higher = more anomalous)
         anomaly_scores = self._normalize_scores(raw_scores)
         
         # Determine risk levels
         risk_levels = self._get_risk_levels(anomaly_scores)
+        is_anomaly = predictions == -1
+        
+        if as_list:
+            is_anomaly = is_anomaly.tolist()
+            anomaly_scores = anomaly_scores.tolist()
+            risk_levels = risk_levels.tolist()
         
         return {
-            "is_anomaly": (predictions == -1).tolist(),
-            "anomaly_scores": anomaly_scores.tolist(),
+            "is_anomaly": is_anomaly,
+            "anomaly_scores": anomaly_scores,
             "risk_levels": risk_levels,
             "model_version": self.model_version,
         }
@@ -151,54 +222,146 @@ class AnomalyDetector:
         if self.explainer is None:
             raise ValueError("Explainer not available. Fit model first.")
         
-        X_scaled = self.scaler.transform(X)
-        shap_values = self.explainer.shap_values(X_scaled)
-        
-        explanations = []
-        for i in range(len(X)):
-            # Get SHAP values for this sample
-            sample_shap = shap_values[i]
-            
-            # Sort by absolute contribution
-            feature_contributions = [
-                {
-                    "feature": self.feature_names[j],
-                    "value": float(X.iloc[i, j]),
-                    "contribution": float(sample_shap[j]),
-                    "abs_contribution": abs(float(sample_shap[j])),
-                }
-                for j in range(len(self.feature_names))
-            ]
-            feature_contributions.sort(key=lambda x: x["abs_contribution"], reverse=True)
-            
-            explanations.append({
-                "top_features": feature_contributions[:top_k],
-                "total_features": len(self.feature_names),
-            })
-        
-        return explanations
+        X = self._select_features(X)
+        return self._explain_scaled(X.to_numpy(dtype=float), self.scaler.transform(X), top_k)
+    
+    def _explain_scaled(
+        self,
+        X_values: np.ndarray,
+        X_scaled: np.ndarray,
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Explain rows given both their raw and scaled values."""
+        # TreeSHAP memory grows with the batch, so explain in row chunks
+        chunk = max(self.shap_chunk_size, 1)
+        shap_values = np.concatenate([
+            np.asarray(self.explainer.shap_values(X_scaled[start:start + chunk]))
+            for start in range(0, len(X_scaled), chunk)
+        ] or [np.empty((0, X_scaled.shape[1]))], axis=0)
+        if tracemalloc.is_tracing():
+            logger.debug("SHAP for %d rows, peak traced memory %d bytes",
+                         len(X_scaled), tracemalloc.get_traced_memory()[1])
+        abs_shap = np.abs(shap_values)
+        n_samples, n_features = abs_shap.shape
+        k = min(top_k, n_features)
+        
+        # Pick the top-k features per row without sorting every feature,
+        # then order just those by absolute contribution
+        if k < n_features:
+            top = np.argpartition(-abs_shap, max(k - 1, 0), axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n_features), abs_shap.shape)
+        ranks = np.argsort(-np.take_along_axis(abs_shap, top, axis=1), axis=1, kind="stable")
+        order = np.take_along_axis(top, ranks, axis=1)
+        
+        rows = np.arange(n_samples)[:, None]
+        names = np.asarray(self.feature_names, dtype=object)[order].tolist()
+        values = X_values[rows, order].tolist()
+        contributions = shap_values[rows, order].tolist()
+        abs_contributions = abs_shap[rows, order].tolist()
+        
+        return [
+            {
+                "top_features": [
+                    {
+                        "feature": feature,
+                        "value": value,
+                        "contribution": contribution,
+                        "abs_contribution": abs_contribution,
+                    }
+                    for feature, value, contribution, abs_contribution in zip(
+                        names[i], values[i], contributions[i], abs_contributions[i]
+                    )
+                ],
+                "total_features": n_features,
+            }
+            for i in range(n_samples)
+        ]
     
     def predict_with_explanation(
         self,
         X: pd.DataFrame,
-        top_k: int = 5
+        top_k: int = 5,
+        explain_rows: Optional[List[int]] = None,
+        explain_sample: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Combined prediction and explanation.
         
+        SHAP cost grows with every explained row, while attributions of a
+        random subset are enough to summarize a large batch, so
+        explain_sample caps how many rows are explained.
+        
         Args:
             X: Data to predict and explain
             top_k: Number of top features to return
+            explain_rows: Positions of the rows to explain (default all);
+                every row is still scored
+            explain_sample: When set and explain_rows is None, explain a
+                seeded random sample of at most this many rows
+        
+        Returns:
+            Dictionary with predictions, scores, and explanations (one per
+            explained row, in explain_rows order). When rows were sampled,
+            their positions are returned as sampled_indices.
+        """
+        if not self.is_fitted:
+            raise ValueError("Model not fitted. Call fit() first.")
+        if self.explainer is None:
+            raise ValueError("Explainer not available. Fit model first.")
+        
+        # Scale once and share the array between scoring and SHAP
+        X = self._select_features(X)
+        X_scaled = self.scaler.transform(X)
+        
+        sampled = None
+        if explain_rows is None and explain_sample is not None and len(X) > explain_sample:
+            sampled = np.sort(
+                np.random.RandomState(0).choice(len(X), explain_sample, replace=False)
+            )
+            explain_rows = sampled
+        
+        X_values = X.to_numpy(dtype=float)
+        if explain_rows is not None:
+            X_values, X_explain = X_values[explain_rows], X_scaled[explain_rows]
+        else:
+            X_explain = X_scaled
+        
+        result = {
+            **self._predict_scaled(X_scaled),
+            "explanations": self._explain_scaled(X_values, X_explain, top_k),
+        }
+        if sampled is not None:
+            result["sampled_indices"] = sampled.tolist()
+        return result
+    
+    def predict_vector(
+        self,
+        x: np.ndarray,
+        top_k: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Predict and explain a single raw feature vector.
+        
+        Fast path for streaming: skips DataFrame construction and the
+        scaler's feature-name checks.
+        
+        Args:
+            x: Feature values, ordered as feature_columns
+            top_k: Number of top features to return
         
         Returns:
-            Dictionary with predictions, scores, and explanations
+            Same structure as predict_with_explanation for one row
         """
-        predictions = self.predict(X)
-        explanations = self.explain(X, top_k)
+        if not self.is_fitted:
+            raise ValueError("Model not fitted. Call fit() first.")
+        
+        X_values = np.asarray(x, dtype=float).reshape(1, -1)
+        X_scaled = (X_values - self.scaler.mean_) / self.scaler.scale_
         
         return {
-            **predictions,
-            "explanations": explanations,
+            **self._predict_scaled(X_scaled),
+            "explanations": self._explain_scaled(X_values, X_scaled, top_k),
         }
     
     def _normalize_scores(self, raw_scores: np.ndarray) -> np.ndarray:
@@ -215,35 +378,47 @@ class AnomalyDetector:
         normalized = 1 - (raw_scores - min_score) / (max_score - min_score)
         return normalized
     
-    def _get_risk_levels(self, scores: np.ndarray) -> List[str]:
-        """Convert scores to risk levels."""
-        levels = []
-        for score in scores:
-            if score >= 0.8:
-                levels.append("critical")
-            elif score >= 0.5:
-                levels.append("warning")
-            else:
-                levels.append("normal")
-        return levels
+    def _get_risk_levels(self, scores: np.ndarray) -> np.ndarray:
+        """Convert scores to risk levels (>= 0.8 critical, >= 0.5 warning)."""
+        return RISK_LEVELS[np.digitize(scores, RISK_THRESHOLDS)]
     
-    def save(self, path: str) -> None:
-        """Save model to disk."""
+    def save(self, path: str, compress: Union[int, str, Tuple[str, int]] = 0) -> None:
+        """
+        Save model to disk.
+        
+        Args:
+            path: Output file
+            compress: joblib.dump compression, e.g. ("zlib", 3) or ("lz4", 3)
+                to shrink files shipped to a remote store. Compressed files
+                load fully into memory; load(mmap_mode=...) needs the
+                uncompressed default
+        """
         model_data = {
             "scaler": self.scaler,
             "model": self.model,
             "feature_names": self.feature_names,
+            "feature_columns": self.feature_columns,
             "training_stats": self.training_stats,
             "model_version": self.model_version,
             "contamination": self.contamination,
             "n_estimators": self.n_estimators,
         }
-        joblib.dump(model_data, path)
+        joblib.dump(model_data, path, compress=compress)
     
     @classmethod
-    def load(cls, path: str) -> "AnomalyDetector":
-        """Load model from disk."""
-        model_data = joblib.load(path)
+    def load(cls, path: str, mmap_mode: Optional[str] = None) -> "AnomalyDetector":
+        """
+        Load model from disk.
+        
+        Args:
+            path: File written by save()
+            mmap_mode: Passed to joblib.load; "r" memory-maps the stored
+                arrays read-only so forked workers share their pages
+        
+        Returns:
+            Fitted detector
+        """
+        model_data = joblib.load(path, mmap_mode=mmap_mode)
         
         detector = cls(
             contamination=model_data["contamination"],
@@ -253,13 +428,68 @@ class AnomalyDetector:
         detector.scaler = model_data["scaler"]
         detector.model = model_data["model"]
         detector.feature_names = model_data["feature_names"]
+        # Files saved before feature_columns was stored used the names as columns
+        detector.feature_columns = model_data.get("feature_columns", detector.feature_names)
         detector.training_stats = model_data["training_stats"]
-        detector.explainer = shap.TreeExplainer(detector.model)
+        detector.explainer = cls._build_explainer(detector.model)
         detector.is_fitted = True
         
         return detector
 
 
+def _window_stats_loop(view: np.ndarray, current: np.ndarray, out: np.ndarray):
+    """
+    Fill out[j] with (current, mean, std, min, max) of view[:, j] in one pass.
+    
+    NaNs are skipped and std uses ddof=1, matching the nan* reductions.
+    Mean and variance use Welford's update, so large-magnitude metrics
+    (byte counters, uptimes, timestamps) keep their precision.
+    """
+    n_rows, n_cols = view.shape
+    for j in range(n_cols):
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        lo = np.inf
+        hi = -np.inf
+        for i in range(n_rows):
+            v = view[i, j]
+            if v != v:  # NaN
+                continue
+            count += 1
+            delta = v - mean
+            mean += delta / count
+            m2 += delta * (v - mean)
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+        out[j, 0] = current[j]
+        if count == 0:
+            out[j, 1] = np.nan
+            out[j, 2] = np.nan
+            out[j, 3] = np.nan
+            out[j, 4] = np.nan
+            continue
+        out[j, 1] = mean
+        out[j, 2] = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+        out[j, 3] = lo
+        out[j, 4] = hi
+
+
+def _window_stats_numpy(view: np.ndarray, current: np.ndarray, out: np.ndarray):
+    """NumPy fallback for _window_stats_loop when numba is unavailable."""
+    out[:, 0] = current
+    out[:, 1] = np.nanmean(view, axis=0)
+    out[:, 2] = np.nanstd(view, axis=0, ddof=1)
+    out[:, 3] = np.nanmin(view, axis=0)
+    out[:, 4] = np.nanmax(view, axis=0)
+
+
+# fastmath is left off: it assumes no NaNs and would drop the NaN skip
+_window_stats = njit(cache=True)(_window_stats_loop) if HAS_NUMBA else _window_stats_numpy
+
+
 class StreamingAnomalyDetector:
     """
     Wrapper for real-time streaming anomaly detection.
@@ -268,8 +498,16 @@ class StreamingAnomalyDetector:
     - Sliding window aggregation
     - Online scoring
     - Adaptive thresholds
+    
+    Each asset's window is a fixed (window_size, n_metrics) array written
+    as a ring buffer, so a point costs a row write and one pass over the
+    window (JIT-compiled when numba is installed) rather than DataFrame
+    construction.
     """
     
+    # Per-metric window statistics, in feature order
+    WINDOW_STATS = ("current", "mean", "std", "min", "max")
+    
     def __init__(
         self,
         detector: AnomalyDetector,
@@ -279,7 +517,7 @@ class StreamingAnomalyDetector:
         self.detector = detector
         self.window_size = window_size
         self.alert_threshold = alert_threshold
-        self.buffer: Dict[str, List[Dict]] = {}  # asset_id -> data points
+        self.buffer: Dict[str, Dict[str, Any]] = {}  # asset_id -> ring buffer window
     
     def process_point(
         self,
@@ -298,45 +536,52 @@ class StreamingAnomalyDetector:
         Returns:
             Prediction result if enough data, else None
         """
-        # Initialize buffer for new assets
-        if asset_id not in self.buffer:
-            self.buffer[asset_id] = []
-        
-        # Add to buffer
-        self.buffer[asset_id].append({
-            "timestamp": timestamp,
-            **metrics
-        })
-        
-        # Maintain window size
-        if len(self.buffer[asset_id]) > self.window_size:
-            self.buffer[asset_id] = self.buffer[asset_id][-self.window_size:]
+        window = self.buffer.get(asset_id)
+        if window is None:
+            # Metric columns are fixed by the asset's first point
+            window = self.buffer[asset_id] = {
+                "arr": np.empty((self.window_size, len(metrics))),
+                "pos": 0,
+                "count": 0,
+                "cols": list(metrics),
+                "order": None,
+                "stats": np.empty((len(metrics), len(self.WINDOW_STATS))),
+            }
+        
+        # Overwrite the oldest row; missing metrics are recorded as NaN
+        arr = window["arr"]
+        arr[window["pos"]] = [metrics.get(col, np.nan) for col in window["cols"]]
+        window["pos"] = (window["pos"] + 1) % self.window_size
+        window["count"] += 1
         
         # Need at least some data points
-        if len(self.buffer[asset_id]) < 10:
+        n = min(window["count"], self.window_size)
+        if n < 10:
             return None
         
-        # Aggregate window statistics
-        df = pd.DataFrame(self.buffer[asset_id])
-        df = df.drop(columns=["timestamp"])
-        
-        # Create feature vector (last point + window stats)
-        features = {}
-        for col in df.columns:
-            features[f"{col}_current"] = df[col].iloc[-1]
-            features[f"{col}_mean"] = df[col].mean()
-            features[f"{col}_std"] = df[col].std()
-            features[f"{col}_min"] = df[col].min()
-            features[f"{col}_max"] = df[col].max()
-        
-        feature_df = pd.DataFrame([features])
+        # Create feature vector (last point + window stats), interleaved
+        # per metric as <metric>_current, <metric>_mean, ...
+        stats = window["stats"]
+        _window_stats(arr[:n], arr[window["pos"] - 1], stats)
+        features = stats.ravel()
         
         # Predict
         try:
-            result = self.detector.predict_with_explanation(feature_df)
+            result = self.detector.predict_vector(features[self._feature_order(window)])
             result["asset_id"] = asset_id
             result["timestamp"] = timestamp.isoformat()
             result["should_alert"] = result["anomaly_scores"][0] >= self.alert_threshold
             return result
         except Exception as e:
             return {"error": str(e), "asset_id": asset_id}
+    
+    def _feature_order(self, window: Dict[str, Any]) -> np.ndarray:
+        """Indices that reorder a window's features to the detector's feature_columns."""
+        if window["order"] is None:
+            names = [f"{col}_{stat}" for col in window["cols"] for stat in self.WINDOW_STATS]
+            missing = set(self.detector.feature_columns) - set(names)
+            if missing:
+                raise ValueError(f"Streaming window lacks detector features: {sorted(missing)}")
+            position = {name: i for i, name in enumerate(names)}
+            window["order"] = np.array([position[f] for f in self.detector.feature_columns])
+        return window["order"]
@@ -8,24 +8,32 @@ Uses transformer embeddings + clustering for:
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime
 from collections import Counter
 import re
 import json
+import os
 from pathlib import Path
 
 from sklearn.cluster import HDBSCAN
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
 import joblib
 
 try:
+    import torch
     from sentence_transformers import SentenceTransformer
     HAS_SENTENCE_TRANSFORMERS = True
 except ImportError:
     HAS_SENTENCE_TRANSFORMERS = False
 
+try:
+    import hdbscan
+    HAS_HDBSCAN = True
+except ImportError:
+    HAS_HDBSCAN = False
+
 
 class LogPreprocessor:
     """Preprocessor for log messages."""
@@ -42,39 +50,47 @@ class LogPreprocessor:
         (r'\S+@\S+', '<EMAIL>'),
     ]
     
+    # All PATTERNS fused into one alternation (earlier patterns win at the
+    # same position), so each message is scanned once instead of per pattern
+    _UNION = re.compile(
+        "|".join(f"(?P<g{i}>{pattern})" for i, (pattern, _) in enumerate(PATTERNS)),
+        re.IGNORECASE,
+    )
+    _REPLACEMENTS = [replacement for _, replacement in PATTERNS]
+    _WHITESPACE = re.compile(r'\s+')
+    
+    # Word following an error term. The lookahead lets matches overlap
+    # (e.g. "error: failed to"), as separate per-term scans would.
+    ERROR_PATTERN = re.compile(
+        r'(?=(?:error|exception|failed|failure|critical|fatal)[:\s]+(\w+))'
+    )
+    
     @classmethod
     def preprocess(cls, text: str) -> str:
         """Normalize log message for clustering."""
-        result = text.lower().strip()
-        
-        for pattern, replacement in cls.PATTERNS:
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+        replacements = cls._REPLACEMENTS
+        result = cls._UNION.sub(
+            lambda m: replacements[int(m.lastgroup[1:])], text.lower().strip()
+        )
         
         # Remove multiple spaces
-        result = re.sub(r'\s+', ' ', result)
-        
-        return result
+        return cls._WHITESPACE.sub(' ', result)
+    
+    @classmethod
+    def preprocess_batch(cls, texts: List[str]) -> List[str]:
+        """Normalize a batch of log messages."""
+        return [cls.preprocess(text) for text in texts]
     
     @classmethod
     def extract_error_keywords(cls, text: str) -> List[str]:
         """Extract error-related keywords from log."""
-        error_patterns = [
-            r'error[:\s]+(\w+)',
-            r'exception[:\s]+(\w+)',
-            r'failed[:\s]+(\w+)',
-            r'failure[:\s]+(\w+)',
-            r'critical[:\s]+(\w+)',
-            r'fatal[:\s]+(\w+)',
-        ]
-        
-        keywords = []
-        text_lower = text.lower()
-        
-        for pattern in error_patterns:
-            matches = re.findall(pattern, text_lower)
-            keywords.extend(matches)
-        
-        return keywords
+        return cls.ERROR_PATTERN.findall(text.lower())
+    
+    @classmethod
+    def extract_error_keywords_batch(cls, texts: List[str]) -> List[str]:
+        """Extract error-related keywords from many logs in one regex scan."""
+        # NUL never matches [:\s] or \w, so no match spans two logs
+        return cls.extract_error_keywords("\0".join(texts))
 
 
 class LogAnalyzer:
@@ -89,6 +105,13 @@ class LogAnalyzer:
     - Anomaly correlation
     """
     
+    # Texts per transformer forward pass
+    ENCODE_BATCH_SIZE = 256
+    # Width of the hashed TF-IDF fallback embedding
+    TFIDF_FEATURES = 1024
+    # Cached embedding rows up-cast to float32 at a time by find_similar_logs
+    SIMILARITY_BLOCK_ROWS = 4096
+    
     def __init__(
         self,
         embedding_model: str = "all-MiniLM-L6-v2",
@@ -96,6 +119,7 @@ class LogAnalyzer:
         min_samples: int = 3,
         use_tfidf_fallback: bool = True,
         model_version: str = "1.0.0",
+        device: Optional[str] = None,
     ):
         self.embedding_model_name = embedding_model
         self.min_cluster_size = min_cluster_size
@@ -105,32 +129,122 @@ class LogAnalyzer:
         
         # Initialize embedding model
         if HAS_SENTENCE_TRANSFORMERS:
-            self.embedding_model = SentenceTransformer(embedding_model)
+            # Encode on the GPU in half precision when one is available
+            self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+            self.embedding_model = SentenceTransformer(embedding_model, device=self.device)
+            if self.device.startswith("cuda"):
+                self.embedding_model = self.embedding_model.half()
             self.use_tfidf = False
         elif use_tfidf_fallback:
+            self.device = "cpu"
             self.embedding_model = None
-            self.tfidf = TfidfVectorizer(max_features=1000, stop_words='english')
+            # Hashed term counts have a fixed width and need no vocabulary
+            # fit; only the IDF weights are learned per fit
+            self.tfidf = Pipeline([
+                ("hash", HashingVectorizer(
+                    n_features=self.TFIDF_FEATURES,
+                    alternate_sign=False,
+                    norm=None,
+                    stop_words='english',
+                )),
+                ("tfidf", TfidfTransformer()),
+            ])
             self.use_tfidf = True
         else:
             raise ImportError("sentence-transformers not available and TF-IDF fallback disabled")
         
-        self.clusterer = HDBSCAN(
-            min_cluster_size=min_cluster_size,
-            min_samples=min_samples,
-            metric='euclidean',
-        )
+        if HAS_HDBSCAN:
+            # Keeps the condensed tree so predict can use approximate_predict
+            self.clusterer = hdbscan.HDBSCAN(
+                min_cluster_size=min_cluster_size,
+                min_samples=min_samples,
+                metric='euclidean',
+                prediction_data=True,
+            )
+        else:
+            self.clusterer = HDBSCAN(
+                min_cluster_size=min_cluster_size,
+                min_samples=min_samples,
+                metric='euclidean',
+            )
         
         self.cluster_representatives: Dict[int, Dict] = {}
+        # Unit-length cluster centroids (one row per label) used by predict
+        self._centroid_labels: np.ndarray = np.empty(0, dtype=int)
+        self._centroids_norm: Optional[np.ndarray] = None
+        # float16 copy of the fit embeddings plus their float32 row norms
         self.embeddings_cache: Optional[np.ndarray] = None
+        self._cache_norm: Optional[np.ndarray] = None
         self.logs_cache: Optional[List[str]] = None
+        self.labels_cache: Optional[np.ndarray] = None
         self.is_fitted = False
     
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length (all-zero rows stay zero)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def _set_centroids(self, embeddings: np.ndarray, labels: np.ndarray):
+        """Cache normalized centroids of the non-noise clusters."""
+        cluster_labels = np.array(sorted(set(labels.tolist()) - {-1}), dtype=int)
+        self._centroid_labels = cluster_labels
+        if len(cluster_labels) == 0:
+            self._centroids_norm = None
+            return
+        centroids = np.stack([embeddings[labels == label].mean(axis=0) for label in cluster_labels])
+        self._centroids_norm = self._normalize_rows(centroids)
+    
+    def _set_embeddings_cache(self, embeddings: np.ndarray):
+        """Store embeddings as float16 (half the memory and scan bandwidth)."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.embeddings_cache = embeddings.astype(np.float16)
+        self._cache_norm = np.linalg.norm(embeddings, axis=1).astype(np.float32)
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts with the sentence transformer as float32 rows.
+        
+        Preprocessed logs are mostly repeated templates, so only the unique
+        strings are encoded and the rows are scattered back (duplicates are
+        kept so clustering still sees the true density).
+        """
+        unique, inverse = self._unique_inverse(texts)
+        embeddings = self.embedding_model.encode(
+            unique.tolist(),
+            batch_size=self.ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return embeddings.astype(np.float32, copy=False)[inverse]
+    
+    @staticmethod
+    def _unique_inverse(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Unique texts and the flat index of each input text among them."""
+        unique, inverse = np.unique(np.asarray(texts, dtype=object), return_inverse=True)
+        return unique, inverse.ravel()
+    
+    def _tfidf_embed(self, texts: List[str], fit: bool = False) -> np.ndarray:
+        """
+        TF-IDF rows for texts, hashing each distinct text only once.
+        
+        When fitting, the IDF weights are learned from the scattered-back
+        rows so repeated lines still count as separate documents.
+        """
+        unique, inverse = self._unique_inverse(texts)
+        counts = self.tfidf.named_steps["hash"].transform(unique.tolist())
+        tfidf = self.tfidf.named_steps["tfidf"]
+        if fit:
+            return tfidf.fit_transform(counts[inverse]).toarray()
+        return tfidf.transform(counts).toarray()[inverse]
+    
     def _get_embeddings(self, texts: List[str]) -> np.ndarray:
         """Get embeddings for texts."""
         if self.use_tfidf:
-            return self.tfidf.fit_transform(texts).toarray()
+            return self._tfidf_embed(texts, fit=True)
         else:
-            return self.embedding_model.encode(texts, show_progress_bar=False)
+            return self._encode(texts)
     
     def fit(self, logs: List[str]) -> "LogAnalyzer":
         """
@@ -143,7 +257,7 @@ class LogAnalyzer:
             Self for chaining
         """
         # Preprocess
-        processed = [LogPreprocessor.preprocess(log) for log in logs]
+        processed = LogPreprocessor.preprocess_batch(logs)
         
         # Get embeddings
         embeddings = self._get_embeddings(processed)
@@ -171,9 +285,8 @@ class LogAnalyzer:
             representative_idx = np.argmin(distances)
             
             # Extract common keywords
-            all_keywords = []
-            for log in cluster_logs[:50]:  # Sample for performance
-                all_keywords.extend(LogPreprocessor.extract_error_keywords(log))
+            # Sample for performance
+            all_keywords = LogPreprocessor.extract_error_keywords_batch(cluster_logs[:50])
             common_keywords = [kw for kw, _ in Counter(all_keywords).most_common(5)]
             
             self.cluster_representatives[label] = {
@@ -183,8 +296,12 @@ class LogAnalyzer:
                 "sample_logs": cluster_logs[:5],
             }
         
-        self.embeddings_cache = embeddings
-        self.logs_cache = logs
+        self._set_centroids(embeddings, labels)
+        
+        self._set_embeddings_cache(embeddings)
+        # Copy so later changes to the caller's list can't make predict()
+        # mistake it for the fitted logs
+        self.logs_cache = list(logs)
         self.labels_cache = labels
         self.is_fitted = True
         
@@ -207,32 +324,44 @@ class LogAnalyzer:
         if not self.is_fitted:
             raise ValueError("Analyzer not fitted. Call fit() first.")
         
-        processed = [LogPreprocessor.preprocess(log) for log in logs]
-        
+        # The logs fit() just clustered already have labels (e.g. analyze_batch
+        # on an unfitted analyzer); skip re-embedding them
+        if (
+            self.logs_cache is not None
+            and self.labels_cache is not None
+            and len(logs) == len(self.logs_cache)
+            and logs == self.logs_cache
+        ):
+            return self.labels_cache.tolist()
+        
+        if self._centroids_norm is None and not (
+            HAS_HDBSCAN and getattr(self.clusterer, "prediction_data_", None) is not None
+        ):
+            return [-1] * len(logs)
+        
+        # Assignment is per text, so label each distinct template once and
+        # scatter the labels back to the lines
+        unique, inverse = self._unique_inverse(LogPreprocessor.preprocess_batch(logs))
+        return self._predict_unique(unique.tolist())[inverse].tolist()
+    
+    def _predict_unique(self, processed: List[str]) -> np.ndarray:
+        """Cluster labels for distinct preprocessed texts."""
         if self.use_tfidf:
             embeddings = self.tfidf.transform(processed).toarray()
         else:
-            embeddings = self.embedding_model.encode(processed, show_progress_bar=False)
-        
-        # Approximate prediction using existing cluster centroids
-        predictions = []
-        for emb in embeddings:
-            best_cluster = -1
-            best_similarity = 0.3  # Threshold
-            
-            for label, info in self.cluster_representatives.items():
-                # Get cluster centroid from cached data
-                mask = self.labels_cache == label
-                centroid = self.embeddings_cache[mask].mean(axis=0)
-                
-                similarity = cosine_similarity([emb], [centroid])[0, 0]
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_cluster = label
-            
-            predictions.append(int(best_cluster))
-        
-        return predictions
+            embeddings = self._encode(processed)
+        
+        if HAS_HDBSCAN and getattr(self.clusterer, "prediction_data_", None) is not None:
+            # Place each log in the fitted density tree
+            labels, _ = hdbscan.approximate_predict(self.clusterer, np.asarray(embeddings))
+            return np.asarray(labels)
+        
+        # Assign each log to the most cosine-similar cluster centroid,
+        # or -1 when nothing is similar enough
+        similarities = self._normalize_rows(np.asarray(embeddings)) @ self._centroids_norm.T
+        best = similarities.argmax(axis=1)
+        best_similarity = similarities[np.arange(len(best)), best]
+        return np.where(best_similarity > 0.3, self._centroid_labels[best], -1)
     
     def analyze_batch(
         self,
@@ -308,13 +437,21 @@ class LogAnalyzer:
         if self.use_tfidf:
             query_embedding = self.tfidf.transform([processed]).toarray()[0]
         else:
-            query_embedding = self.embedding_model.encode([processed])[0]
-        
-        # Compute similarities
-        similarities = cosine_similarity([query_embedding], self.embeddings_cache)[0]
-        
-        # Get top-k
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+            query_embedding = self._encode([processed])[0]
+        
+        # Cosine similarity against the float16 cache; all-zero rows score 0
+        # as with cosine_similarity
+        query_embedding = np.asarray(query_embedding, dtype=np.float32)
+        denominator = self._cache_norm * np.linalg.norm(query_embedding)
+        denominator[denominator == 0] = 1.0
+        similarities = self._cache_dot(query_embedding) / denominator
+        
+        # Get top-k: partition out the k best, then sort only those
+        k = min(top_k, similarities.size)
+        if k <= 0:
+            return []
+        top_indices = np.argpartition(-similarities, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
         
         results = []
         for idx in top_indices:
@@ -326,6 +463,21 @@ class LogAnalyzer:
         
         return results
     
+    def _cache_dot(self, query: np.ndarray) -> np.ndarray:
+        """
+        Dot product of query with every cached embedding row.
+        
+        NumPy has no fast float16 matmul, so rows are up-cast to float32 one
+        SIMILARITY_BLOCK_ROWS block at a time rather than copying the whole
+        (possibly memory-mapped) cache on every query.
+        """
+        cache = self.embeddings_cache
+        out = np.empty(len(cache), dtype=np.float32)
+        block = self.SIMILARITY_BLOCK_ROWS
+        for start in range(0, len(cache), block):
+            np.dot(cache[start:start + block].astype(np.float32), query, out=out[start:start + block])
+        return out
+    
     def correlate_with_anomalies(
         self,
         logs: List[str],
@@ -345,18 +497,26 @@ class LogAnalyzer:
         Returns:
             Correlated log patterns
         """
-        from datetime import timedelta
-        
-        # Find logs near anomalies
-        near_anomaly_logs = []
-        
-        for anomaly_time in anomaly_timestamps:
-            window_start = anomaly_time - timedelta(minutes=window_minutes)
-            window_end = anomaly_time + timedelta(minutes=window_minutes)
-            
-            for i, log_time in enumerate(log_timestamps):
-                if window_start <= log_time <= window_end:
-                    near_anomaly_logs.append(logs[i])
+        # Find logs near anomalies: sort log times once and binary-search
+        # each anomaly's window bounds (epoch nanoseconds)
+        log_ns = pd.to_datetime(log_timestamps, utc=True).asi8
+        anomaly_ns = pd.to_datetime(anomaly_timestamps, utc=True).asi8
+        window = pd.Timedelta(minutes=window_minutes).value
+        
+        order = np.argsort(log_ns, kind="stable")
+        sorted_ns = log_ns[order]
+        lo = np.searchsorted(sorted_ns, anomaly_ns - window, side="left")
+        hi = np.searchsorted(sorted_ns, anomaly_ns + window, side="right")
+        
+        # +1 at each window start, -1 past its end; a positive running sum
+        # means the log falls inside at least one window
+        marks = np.zeros(len(sorted_ns) + 1, dtype=int)
+        np.add.at(marks, lo, 1)
+        np.add.at(marks, hi, -1)
+        inside = np.cumsum(marks[:-1]) > 0
+        
+        # Each matching log once, in its original order
+        near_anomaly_logs = [logs[i] for i in np.sort(order[inside])]
         
         if not near_anomaly_logs:
             return {"correlated_patterns": [], "message": "No logs found near anomalies"}
@@ -367,6 +527,7 @@ class LogAnalyzer:
                 embedding_model=self.embedding_model_name,
                 min_cluster_size=min(3, len(near_anomaly_logs) // 2),
                 use_tfidf_fallback=self.use_tfidf_fallback,
+                device=self.device,
             )
             mini_analyzer.fit(near_anomaly_logs)
             
@@ -381,13 +542,35 @@ class LogAnalyzer:
                 "message": "Not enough logs for clustering",
             }
     
-    def save(self, path: str) -> None:
-        """Save analyzer to disk."""
+    def save(self, path: str, compress: Union[int, str, Tuple[str, int]] = 0) -> None:
+        """
+        Save analyzer to disk.
+        
+        The embedding cache goes to a sibling ``<name>.emb.npy`` file so
+        load() can memory-map it instead of reading it into RAM.
+        
+        Args:
+            path: Output file
+            compress: joblib.dump compression for the main file, e.g.
+                ("zlib", 3); the embeddings file stays uncompressed
+        """
+        embeddings_file = None
+        if self.embeddings_cache is not None:
+            embeddings_file = f"{Path(path).name}.emb.npy"
+            embeddings_path = Path(path).with_name(embeddings_file)
+            # Write then rename, so readers that mapped the old file keep it
+            tmp_path = embeddings_path.with_name(f"{embeddings_file}.tmp.npy")
+            np.save(tmp_path, self.embeddings_cache)
+            os.replace(tmp_path, embeddings_path)
+        
         model_data = {
             "cluster_representatives": self.cluster_representatives,
-            "embeddings_cache": self.embeddings_cache,
+            "embeddings_file": embeddings_file,
+            "cache_norm": self._cache_norm,
             "logs_cache": self.logs_cache,
             "labels_cache": self.labels_cache if hasattr(self, 'labels_cache') else None,
+            "centroid_labels": self._centroid_labels,
+            "centroids_norm": self._centroids_norm,
             "model_version": self.model_version,
             "min_cluster_size": self.min_cluster_size,
             "min_samples": self.min_samples,
@@ -397,12 +580,25 @@ class LogAnalyzer:
         if self.use_tfidf:
             model_data["tfidf"] = self.tfidf
         
-        joblib.dump(model_data, path)
+        if HAS_HDBSCAN:
+            model_data["clusterer"] = self.clusterer
+        
+        joblib.dump(model_data, path, compress=compress)
     
     @classmethod
-    def load(cls, path: str) -> "LogAnalyzer":
-        """Load analyzer from disk."""
-        model_data = joblib.load(path)
+    def load(cls, path: str, mmap_mode: Optional[str] = None) -> "LogAnalyzer":
+        """
+        Load analyzer from disk (embedding cache memory-mapped read-only).
+        
+        Args:
+            path: File written by save()
+            mmap_mode: Passed to joblib.load for the remaining arrays
+                (centroids, TF-IDF weights, clusterer)
+        
+        Returns:
+            Fitted analyzer
+        """
+        model_data = joblib.load(path, mmap_mode=mmap_mode)
         
         analyzer = cls(
             min_cluster_size=model_data["min_cluster_size"],
@@ -412,10 +608,29 @@ class LogAnalyzer:
         )
         
         analyzer.cluster_representatives = model_data["cluster_representatives"]
-        analyzer.embeddings_cache = model_data["embeddings_cache"]
+        if model_data.get("embeddings_file"):
+            analyzer.embeddings_cache = np.load(
+                Path(path).with_name(model_data["embeddings_file"]), mmap_mode="r"
+            )
+            analyzer._cache_norm = model_data["cache_norm"]
+        elif model_data.get("embeddings_cache") is not None:
+            # Saved with the cache inline
+            analyzer._set_embeddings_cache(model_data["embeddings_cache"])
         analyzer.logs_cache = model_data["logs_cache"]
         analyzer.labels_cache = model_data.get("labels_cache")
         
+        if "centroids_norm" in model_data:
+            analyzer._centroid_labels = model_data["centroid_labels"]
+            analyzer._centroids_norm = model_data["centroids_norm"]
+        elif analyzer.embeddings_cache is not None and analyzer.labels_cache is not None:
+            # Saved before centroids were cached
+            analyzer._set_centroids(
+                analyzer.embeddings_cache.astype(np.float32), analyzer.labels_cache
+            )
+        
+        if HAS_HDBSCAN and "clusterer" in model_data:
+            analyzer.clusterer = model_data["clusterer"]
+        
         if model_data["use_tfidf"]:
             analyzer.tfidf = model_data["tfidf"]
             analyzer.use_tfidf = True
@@ -8,11 +8,15 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
+import copy
 import json
+import pickle
+import warnings
 from pathlib import Path
 
 import torch
 import torch.nn as nn
+from torch.utils.checkpoint import checkpoint
 from torch.utils.data import Dataset, DataLoader
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 import joblib
@@ -26,8 +30,9 @@ class RULDataset(Dataset):
         sequences: np.ndarray,
         targets: np.ndarray
     ):
-        self.sequences = torch.FloatTensor(sequences)
-        self.targets = torch.FloatTensor(targets)
+        # Share memory with the arrays (copying only if not already float32)
+        self.sequences = torch.from_numpy(np.ascontiguousarray(sequences, dtype=np.float32))
+        self.targets = torch.from_numpy(np.ascontiguousarray(targets, dtype=np.float32))
     
     def __len__(self):
         return len(self.sequences)
@@ -64,10 +69,31 @@ class LSTMForecaster(nn.Module):
             nn.ReLU(),
             nn.Linear(32, 1),
         )
+        
+        # Recompute LSTM activations in backward instead of storing them
+        # (set by RULForecaster.fit; only applies while training with grads)
+        self.gradient_checkpointing = False
+    
+    @torch.jit.unused
+    def _checkpointed_lstm(self, x):
+        """
+        Run the LSTM over ~sqrt(seq_len) time chunks, checkpointing each.
+        
+        Only the (h, c) state between chunks is kept for backward, so
+        activation memory drops from O(seq_len) to O(sqrt(seq_len)) steps.
+        """
+        chunk_size = max(1, int(x.shape[1] ** 0.5))
+        state = None
+        for chunk in x.split(chunk_size, dim=1):
+            lstm_out, state = checkpoint(self.lstm, chunk, state, use_reentrant=False)
+        return lstm_out
     
     def forward(self, x):
         # x: (batch, seq_len, features)
-        lstm_out, _ = self.lstm(x)
+        if self.gradient_checkpointing and self.training and torch.is_grad_enabled():
+            lstm_out = self._checkpointed_lstm(x)
+        else:
+            lstm_out, _ = self.lstm(x)
         # Take last timestep
         last_hidden = lstm_out[:, -1, :]
         # Predict RUL
@@ -86,6 +112,11 @@ class RULForecaster:
     - Model versioning and serialization
     """
     
+    # Default MC-dropout samples, and max rows per forward pass when tiling
+    # the batch for them
+    MC_SAMPLES = 10
+    MC_CHUNK_ROWS = 4096
+    
     def __init__(
         self,
         sequence_length: int = 50,
@@ -95,6 +126,8 @@ class RULForecaster:
         max_rul: float = 130.0,
         model_version: str = "1.0.0",
         device: Optional[str] = None,
+        gradient_checkpointing: bool = False,
+        quantize_cpu: bool = False,
     ):
         self.sequence_length = sequence_length
         self.hidden_size = hidden_size
@@ -102,17 +135,110 @@ class RULForecaster:
         self.dropout = dropout
         self.max_rul = max_rul
         self.model_version = model_version
+        # Trade recomputation for activation memory during fit (larger batches)
+        self.gradient_checkpointing = gradient_checkpointing
+        # int8 dynamic quantization of the CPU point-prediction model
+        self.quantize_cpu = quantize_cpu
         
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        # Mixed precision on CUDA: bf16 where supported, else fp16 with loss scaling
+        self.amp_dtype: Optional[torch.dtype] = None
+        if self.device.startswith("cuda"):
+            self.amp_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
         
         self.feature_scaler = StandardScaler()
         self.rul_scaler = MinMaxScaler(feature_range=(0, 1))
         
         self.model: Optional[LSTMForecaster] = None
+        # Inference copies of self.model built after fit/load: a frozen
+        # TorchScript module off CUDA, a torch.compile'd module on CUDA
+        self._scripted: Optional[torch.jit.ScriptModule] = None
+        self._compiled: Optional[nn.Module] = None
         self.feature_names: List[str] = []
         self.is_fitted = False
         self.training_stats: Dict[str, Any] = {}
     
+    def _autocast(self):
+        """Autocast context for forward passes (a no-op off CUDA)."""
+        return torch.autocast(
+            device_type=self.device.split(":")[0],
+            dtype=self.amp_dtype or torch.bfloat16,
+            enabled=self.amp_dtype is not None,
+        )
+    
+    def _cache_scaler_tensors(self):
+        """Keep the fitted scalers' parameters as device tensors for predict."""
+        def to_tensor(values):
+            return torch.tensor(values, dtype=torch.float32, device=self.device)
+        
+        # StandardScaler as x * inv_scale + shift, a single fused addcmul
+        self._feature_inv_scale = to_tensor(1.0 / self.feature_scaler.scale_)
+        self._feature_shift = to_tensor(-self.feature_scaler.mean_ / self.feature_scaler.scale_)
+        self._rul_min = to_tensor(self.rul_scaler.min_[0])
+        self._rul_scale = to_tensor(self.rul_scaler.scale_[0])
+    
+    def _inverse_rul(self, scaled: torch.Tensor) -> torch.Tensor:
+        """MinMaxScaler.inverse_transform for a tensor of scaled RUL values."""
+        return (scaled - self._rul_min) / self._rul_scale
+    
+    def _enable_tf32(self):
+        """Let fp32 matmuls (e.g. the FC head outside autocast) use TF32 on CUDA."""
+        if self.device.startswith("cuda"):
+            torch.set_float32_matmul_precision("high")
+    
+    def _build_inference_models(self):
+        """
+        Build the compiled copies of the fitted model used by predict.
+        
+        On CUDA the model goes through torch.compile (Inductor fuses the FC
+        stack; reduce-overhead replays CUDA graphs), which also traces the
+        autocast regions. Off CUDA it is scripted and frozen instead, for
+        eval-mode inference only; MC dropout there uses the eager model.
+        With quantize_cpu the scripted copy has int8 dynamic-quantized LSTM
+        and Linear weights (~4x smaller); self.model stays fp32 for save().
+        Both are warmed up so compilation never lands on a request.
+        """
+        self._scripted = None
+        self._compiled = None
+        self._enable_tf32()
+        
+        self.model.eval()
+        dummy = torch.zeros(1, self.sequence_length, len(self.feature_names), device=self.device)
+        
+        if self.amp_dtype is not None:
+            # Shapes are specialized (dynamic=False); each new batch size
+            # compiles once. Capture the CUDA graphs for a single sequence
+            # in eval mode and for the default MC-dropout tile in train mode
+            compiled = torch.compile(self.model, mode="reduce-overhead", dynamic=False)
+            with torch.no_grad(), self._autocast():
+                for _ in range(3):
+                    compiled(dummy)
+                self.model.train()
+                for _ in range(3):
+                    compiled(dummy.repeat(self.MC_SAMPLES, 1, 1))
+                self.model.eval()
+            self._compiled = compiled
+            return
+        
+        with warnings.catch_warnings():
+            # torch.jit.freeze warns that it is deprecated in favour of
+            # torch.compile, and torch.ao.quantization in favour of torchao
+            warnings.simplefilter("ignore", FutureWarning)
+            warnings.filterwarnings("ignore", message=r".*quantiz.*deprecated")
+            if self.quantize_cpu:
+                quantized = torch.ao.quantization.quantize_dynamic(
+                    copy.deepcopy(self.model), {nn.LSTM, nn.Linear}, dtype=torch.qint8
+                )
+                scripted = torch.jit.freeze(torch.jit.script(quantized.eval()))
+            else:
+                scripted = torch.jit.optimize_for_inference(torch.jit.script(self.model))
+        
+        # Run the JIT passes now rather than on the first real request
+        with torch.no_grad():
+            for _ in range(3):
+                scripted(dummy)
+        self._scripted = scripted
+    
     def _create_sequences(
         self,
         df: pd.DataFrame,
@@ -123,16 +249,17 @@ class RULForecaster:
         features = df[feature_cols].values
         rul = df[rul_column].values
         
-        sequences = []
-        targets = []
+        # Windows start at 0 .. len - sequence_length - 1; each targets the
+        # RUL at its last row. Returned as a strided view (no per-window copy)
+        n_windows = max(len(features) - self.sequence_length, 0)
+        if n_windows == 0:
+            return np.empty((0, self.sequence_length, len(feature_cols))), np.empty(0)
         
-        for i in range(len(features) - self.sequence_length):
-            seq = features[i:i + self.sequence_length]
-            target = rul[i + self.sequence_length - 1]
-            sequences.append(seq)
-            targets.append(target)
+        windows = np.lib.stride_tricks.sliding_window_view(features, self.sequence_length, axis=0)
+        sequences = windows[:n_windows].transpose(0, 2, 1)
+        targets = rul[self.sequence_length - 1:self.sequence_length - 1 + n_windows]
         
-        return np.array(sequences), np.array(targets)
+        return sequences, targets
     
     def fit(
         self,
@@ -161,6 +288,7 @@ class RULForecaster:
         """
         self.feature_names = [c for c in data.columns if c != rul_column]
         n_features = len(self.feature_names)
+        self._enable_tf32()
         
         # Scale features
         feature_data = data[self.feature_names].values
@@ -174,8 +302,10 @@ class RULForecaster:
         scaled_df = pd.DataFrame(scaled_features, columns=self.feature_names)
         scaled_df[rul_column] = scaled_rul
         
-        # Create sequences
+        # Create sequences, materialized once as float32 for the tensors
         X, y = self._create_sequences(scaled_df, rul_column)
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        y = np.ascontiguousarray(y, dtype=np.float32)
         
         # Split train/val
         split_idx = int(len(X) * (1 - validation_split))
@@ -186,8 +316,12 @@ class RULForecaster:
         train_dataset = RULDataset(X_train, y_train)
         val_dataset = RULDataset(X_val, y_val)
         
-        train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
-        val_loader = DataLoader(val_dataset, batch_size=batch_size)
+        # Pinned host batches let the copies to the GPU run asynchronously
+        pin_memory = self.device.startswith("cuda")
+        train_loader = DataLoader(
+            train_dataset, batch_size=batch_size, shuffle=True, pin_memory=pin_memory
+        )
+        val_loader = DataLoader(val_dataset, batch_size=batch_size, pin_memory=pin_memory)
         
         # Initialize model
         self.model = LSTMForecaster(
@@ -196,6 +330,7 @@ class RULForecaster:
             num_layers=self.num_layers,
             dropout=self.dropout,
         ).to(self.device)
+        self.model.gradient_checkpointing = self.gradient_checkpointing
         
         # Training setup
         criterion = nn.MSELoss()
@@ -204,6 +339,9 @@ class RULForecaster:
             optimizer, mode="min", factor=0.5, patience=5
         )
         
+        # Only fp16 needs loss scaling; disabled it passes straight through
+        grad_scaler = torch.amp.GradScaler("cuda", enabled=self.amp_dtype == torch.float16)
+        
         best_val_loss = float("inf")
         history = {"train_loss": [], "val_loss": []}
         
@@ -213,14 +351,16 @@ class RULForecaster:
             self.model.train()
             train_loss = 0.0
             for X_batch, y_batch in train_loader:
-                X_batch = X_batch.to(self.device)
-                y_batch = y_batch.to(self.device)
+                X_batch = X_batch.to(self.device, non_blocking=True)
+                y_batch = y_batch.to(self.device, non_blocking=True)
                 
                 optimizer.zero_grad()
-                predictions = self.model(X_batch)
-                loss = criterion(predictions, y_batch)
-                loss.backward()
-                optimizer.step()
+                with self._autocast():
+                    predictions = self.model(X_batch)
+                    loss = criterion(predictions.float(), y_batch)
+                grad_scaler.scale(loss).backward()
+                grad_scaler.step(optimizer)
+                grad_scaler.update()
                 
                 train_loss += loss.item()
             
@@ -229,13 +369,13 @@ class RULForecaster:
             # Validate
             self.model.eval()
             val_loss = 0.0
-            with torch.no_grad():
+            with torch.no_grad(), self._autocast():
                 for X_batch, y_batch in val_loader:
-                    X_batch = X_batch.to(self.device)
-                    y_batch = y_batch.to(self.device)
+                    X_batch = X_batch.to(self.device, non_blocking=True)
+                    y_batch = y_batch.to(self.device, non_blocking=True)
                     
                     predictions = self.model(X_batch)
-                    loss = criterion(predictions, y_batch)
+                    loss = criterion(predictions.float(), y_batch)
                     val_loss += loss.item()
             
             val_loss /= len(val_loader)
@@ -264,6 +404,8 @@ class RULForecaster:
             "model_version": self.model_version,
         }
         
+        self._cache_scaler_tensors()
+        self._build_inference_models()
         self.is_fitted = True
         return self
     
@@ -271,7 +413,7 @@ class RULForecaster:
         self,
         sequences: np.ndarray,
         return_confidence: bool = True,
-        n_samples: int = 10,
+        n_samples: int = MC_SAMPLES,
     ) -> Dict[str, Any]:
         """
         Predict RUL for sequences.
@@ -287,44 +429,57 @@ class RULForecaster:
         if not self.is_fitted or self.model is None:
             raise ValueError("Model not fitted. Call fit() first.")
         
-        # Scale features
-        original_shape = sequences.shape
-        flat_features = sequences.reshape(-1, original_shape[-1])
-        scaled_flat = self.feature_scaler.transform(flat_features)
-        scaled_sequences = scaled_flat.reshape(original_shape)
-        
-        X = torch.FloatTensor(scaled_sequences).to(self.device)
+        # Scale features on the device in one pass over (batch, seq, features);
+        # ATen runs it multi-threaded without holding the GIL
+        X = torch.from_numpy(np.ascontiguousarray(sequences, dtype=np.float32))
+        X = X.to(self.device, non_blocking=True)
+        X = torch.addcmul(self._feature_shift, X, self._feature_inv_scale)
         
         if return_confidence:
-            # MC Dropout for uncertainty estimation
+            # MC Dropout for uncertainty estimation: tile the batch n_samples
+            # times and run it in one pass (dropout masks are drawn per row)
             self.model.train()  # Enable dropout
-            predictions_list = []
+            model = self._compiled if self._compiled is not None else self.model
+            X_tiled = X.repeat(n_samples, 1, 1)
             
-            with torch.no_grad():
-                for _ in range(n_samples):
-                    pred = self.model(X).cpu().numpy()
-                    predictions_list.append(pred)
+            with torch.no_grad(), self._autocast():
+                predictions = torch.cat([
+                    model(chunk).float()
+                    for chunk in torch.split(X_tiled, self.MC_CHUNK_ROWS)
+                ])
             
-            predictions_array = np.array(predictions_list)
-            mean_pred = predictions_array.mean(axis=0)
-            std_pred = predictions_array.std(axis=0)
+            predictions = predictions.view(n_samples, len(X))
             
-            # Inverse transform
-            mean_rul = self.rul_scaler.inverse_transform(mean_pred.reshape(-1, 1)).flatten()
+            # Back to RUL units on the device: the mean is inverse-transformed
+            # and the std scaled by the RUL scaler's range (1 / scale_)
+            mean_rul = self._inverse_rul(predictions.mean(dim=0))
+            std_rul = predictions.std(dim=0, unbiased=False) / self._rul_scale
+            half_width = 1.96 * std_rul
+            
+            # One (4, B) copy back to the host
+            rul_estimate, lower, upper, uncertainty = torch.stack([
+                mean_rul, mean_rul - half_width, mean_rul + half_width, std_rul,
+            ]).cpu().tolist()
             
             return {
-                "rul_estimate": mean_rul.tolist(),
-                "confidence_lower": (mean_rul - 1.96 * std_pred * self.max_rul).tolist(),
-                "confidence_upper": (mean_rul + 1.96 * std_pred * self.max_rul).tolist(),
-                "uncertainty": (std_pred * self.max_rul).tolist(),
+                "rul_estimate": rul_estimate,
+                "confidence_lower": lower,
+                "confidence_upper": upper,
+                "uncertainty": uncertainty,
                 "model_version": self.model_version,
             }
         else:
             self.model.eval()
-            with torch.no_grad():
-                pred = self.model(X).cpu().numpy()
+            if self._scripted is not None:
+                model = self._scripted
+            elif self._compiled is not None:
+                model = self._compiled
+            else:
+                model = self.model
+            with torch.no_grad(), self._autocast():
+                pred = model(X).float()
             
-            rul = self.rul_scaler.inverse_transform(pred.reshape(-1, 1)).flatten()
+            rul = self._inverse_rul(pred).cpu().numpy()
             
             return {
                 "rul_estimate": rul.tolist(),
@@ -356,12 +511,55 @@ class RULForecaster:
         
         return self.predict(sequence)
     
+    def _scaler_params(self) -> Dict[str, torch.Tensor]:
+        """Fitted scaler parameters as float32 tensors (for checkpoints)."""
+        def to_tensor(values):
+            return torch.from_numpy(np.asarray(values, dtype=np.float32))
+        
+        return {
+            "feature_mean": to_tensor(self.feature_scaler.mean_),
+            "feature_scale": to_tensor(self.feature_scaler.scale_),
+            "rul_data_min": to_tensor(self.rul_scaler.data_min_),
+            "rul_data_max": to_tensor(self.rul_scaler.data_max_),
+            "n_samples_seen": torch.tensor(int(self.feature_scaler.n_samples_seen_)),
+        }
+    
+    def _restore_scalers(self, params: Dict[str, torch.Tensor]):
+        """Rebuild the fitted sklearn scalers from _scaler_params() output."""
+        n_samples_seen = int(params["n_samples_seen"])
+        
+        mean = params["feature_mean"].numpy().astype(np.float64)
+        scale = params["feature_scale"].numpy().astype(np.float64)
+        self.feature_scaler = StandardScaler()
+        self.feature_scaler.mean_ = mean
+        self.feature_scaler.scale_ = scale
+        self.feature_scaler.var_ = scale ** 2
+        self.feature_scaler.n_features_in_ = len(mean)
+        self.feature_scaler.n_samples_seen_ = n_samples_seen
+        
+        # MinMaxScaler.fit for feature_range (0, 1)
+        data_min = params["rul_data_min"].numpy().astype(np.float64)
+        data_max = params["rul_data_max"].numpy().astype(np.float64)
+        data_range = data_max - data_min
+        self.rul_scaler = MinMaxScaler(feature_range=(0, 1))
+        self.rul_scaler.data_min_ = data_min
+        self.rul_scaler.data_max_ = data_max
+        self.rul_scaler.data_range_ = data_range
+        self.rul_scaler.scale_ = 1.0 / np.where(data_range == 0, 1.0, data_range)
+        self.rul_scaler.min_ = -data_min * self.rul_scaler.scale_
+        self.rul_scaler.n_features_in_ = len(data_min)
+        self.rul_scaler.n_samples_seen_ = n_samples_seen
+    
     def save(self, path: str) -> None:
-        """Save model to disk."""
+        """
+        Save model to disk.
+        
+        Only tensors and plain Python values are stored (scalers as their
+        parameters), so load() can use torch.load(weights_only=True).
+        """
         model_data = {
             "model_state_dict": self.model.state_dict() if self.model else None,
-            "feature_scaler": self.feature_scaler,
-            "rul_scaler": self.rul_scaler,
+            "scaler_params": self._scaler_params() if self.is_fitted else None,
             "feature_names": self.feature_names,
             "training_stats": self.training_stats,
             "model_version": self.model_version,
@@ -370,16 +568,19 @@ class RULForecaster:
             "num_layers": self.num_layers,
             "dropout": self.dropout,
             "max_rul": self.max_rul,
+            "quantize_cpu": self.quantize_cpu,
         }
         torch.save(model_data, path)
     
     @classmethod
     def load(cls, path: str, device: Optional[str] = None) -> "RULForecaster":
         """Load model from disk."""
-        # The checkpoint includes trusted Python objects such as scalers, so
-        # we explicitly opt into full deserialization for compatibility with
-        # PyTorch 2.6+'s stricter default.
-        model_data = torch.load(path, map_location="cpu", weights_only=False)
+        try:
+            model_data = torch.load(path, map_location="cpu", weights_only=True)
+        except pickle.UnpicklingError:
+            # Older checkpoints pickled the sklearn scalers; those need full
+            # (trusted) deserialization under PyTorch 2.6+'s stricter default
+            model_data = torch.load(path, map_location="cpu", weights_only=False)
         
         forecaster = cls(
             sequence_length=model_data["sequence_length"],
@@ -389,10 +590,14 @@ class RULForecaster:
             max_rul=model_data["max_rul"],
             model_version=model_data["model_version"],
             device=device,
+            quantize_cpu=model_data.get("quantize_cpu", False),
         )
         
-        forecaster.feature_scaler = model_data["feature_scaler"]
-        forecaster.rul_scaler = model_data["rul_scaler"]
+        if "scaler_params" in model_data:
+            forecaster._restore_scalers(model_data["scaler_params"])
+        else:
+            forecaster.feature_scaler = model_data["feature_scaler"]
+            forecaster.rul_scaler = model_data["rul_scaler"]
         forecaster.feature_names = model_data["feature_names"]
         forecaster.training_stats = model_data["training_stats"]
         
@@ -405,6 +610,8 @@ class RULForecaster:
         ).to(forecaster.device)
         
         forecaster.model.load_state_dict(model_data["model_state_dict"])
+        forecaster._cache_scaler_tensors()
+        forecaster._build_inference_models()
         forecaster.is_fitted = True
         
         return forecaster
@@ -1,12 +1,37 @@
-"""ML Pipelines Package."""
-from ml.pipelines.training_pipeline import TrainingPipeline, ScheduledTrainer
-from ml.pipelines.inference_pipeline import InferencePipeline
-from ml.pipelines.drift_detection import DriftDetector, DriftMonitor
-
-__all__ = [
-    "TrainingPipeline",
-    "ScheduledTrainer",
-    "InferencePipeline",
-    "DriftDetector",
-    "DriftMonitor",
-]
+"""
+ML Pipelines Package.
+
+Exports are imported lazily (PEP 562) so importing one pipeline does not
+pull in torch, Evidently, etc. for the others.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ml.pipelines.training_pipeline import TrainingPipeline, ScheduledTrainer
+    from ml.pipelines.inference_pipeline import InferencePipeline
+    from ml.pipelines.drift_detection import DriftDetector, DriftMonitor
+
+# Exported name -> defining module
+_EXPORTS = {
+    "TrainingPipeline": "ml.pipelines.training_pipeline",
+    "ScheduledTrainer": "ml.pipelines.training_pipeline",
+    "InferencePipeline": "ml.pipelines.inference_pipeline",
+    "DriftDetector": "ml.pipelines.drift_detection",
+    "DriftMonitor": "ml.pipelines.drift_detection",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
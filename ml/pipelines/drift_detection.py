@@ -16,6 +16,7 @@ try:
     from evidently.report import Report
     from evidently.metric_preset import DataDriftPreset, TargetDriftPreset
     from evidently.metrics import DataDriftTable, DatasetDriftMetric
+    from evidently import ColumnMapping
     HAS_EVIDENTLY = True
 except ImportError:
     HAS_EVIDENTLY = False
@@ -23,6 +24,65 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _ks_statistic(ref_sorted: np.ndarray, current: np.ndarray) -> float:
+    """
+    Two-sample Kolmogorov-Smirnov statistic (NaNs in current are ignored).
+    
+    The ECDF gap can only peak at a current sample, approached from either
+    side, so both ECDFs are evaluated there with searchsorted.
+    """
+    cur_sorted = np.sort(current[~np.isnan(current)])
+    if ref_sorted.size == 0 or cur_sorted.size == 0:
+        return float("nan")
+    
+    n_ref, n_cur = ref_sorted.size, cur_sorted.size
+    gap_right = (
+        np.searchsorted(ref_sorted, cur_sorted, side="right") / n_ref
+        - np.searchsorted(cur_sorted, cur_sorted, side="right") / n_cur
+    )
+    gap_left = (
+        np.searchsorted(ref_sorted, cur_sorted, side="left") / n_ref
+        - np.searchsorted(cur_sorted, cur_sorted, side="left") / n_cur
+    )
+    return float(max(np.abs(gap_right).max(), np.abs(gap_left).max()))
+
+
+class WelfordStats:
+    """
+    Streaming per-column mean and variance (Welford's algorithm).
+    
+    Batches are merged with Chan et al.'s pairwise update, so ingesting n
+    rows costs O(n * F) and memory stays O(F). NaNs are skipped per column,
+    matching np.nanmean/np.nanstd.
+    """
+    
+    def __init__(self, n_features: int):
+        self.n = np.zeros(n_features)
+        self.mean = np.zeros(n_features)
+        self.M2 = np.zeros(n_features)
+    
+    def update(self, X: np.ndarray) -> None:
+        """Add a batch of rows, shape (n, F)."""
+        observed = ~np.isnan(X)
+        n_batch = observed.sum(axis=0)
+        has_rows = n_batch > 0
+        batch_mean = np.where(has_rows, np.nansum(X, axis=0) / np.maximum(n_batch, 1), 0.0)
+        batch_M2 = np.nansum((X - batch_mean) ** 2, axis=0)
+        
+        n_total = self.n + n_batch
+        delta = batch_mean - self.mean
+        safe_total = np.maximum(n_total, 1)
+        self.mean = np.where(has_rows, self.mean + delta * n_batch / safe_total, self.mean)
+        self.M2 = self.M2 + batch_M2 + delta ** 2 * self.n * n_batch / safe_total
+        self.n = n_total
+    
+    @property
+    def std(self) -> np.ndarray:
+        """Sample standard deviation (ddof=1); NaN below two observations."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 1, np.sqrt(self.M2 / (self.n - 1)), np.nan)
+
+
 class DriftDetector:
     """
     Production drift detector using Evidently.
@@ -40,6 +100,8 @@ class DriftDetector:
     ):
         self.drift_threshold = drift_threshold
         self.feature_drift_threshold = feature_drift_threshold
+        # Evidently report, built on first use and reused across checks
+        self._report = None
         
         if not HAS_EVIDENTLY:
             logger.warning("Evidently not available. Drift detection will use fallback.")
@@ -71,6 +133,12 @@ class DriftDetector:
         else:
             return self._detect_fallback(reference_data, current_data)
     
+    def _get_report(self) -> "Report":
+        """Dataset drift report, created once per detector."""
+        if self._report is None:
+            self._report = Report(metrics=[DatasetDriftMetric()])
+        return self._report
+    
     def _detect_with_evidently(
         self,
         reference: pd.DataFrame,
@@ -78,8 +146,17 @@ class DriftDetector:
     ) -> Dict[str, Any]:
         """Detect drift using Evidently."""
         try:
-            report = Report(metrics=[DatasetDriftMetric()])
-            report.run(reference_data=reference, current_data=current)
+            # Only shared numeric columns are compared; declaring them
+            # skips Evidently's column-type inference
+            numeric = reference.select_dtypes(include=[np.number]).columns
+            cols = list(numeric[numeric.isin(current.columns)])
+            
+            report = self._get_report()
+            report.run(
+                reference_data=reference[cols],
+                current_data=current[cols],
+                column_mapping=ColumnMapping(numerical_features=cols),
+            )
             
             result_dict = report.as_dict()
             
@@ -110,41 +187,113 @@ class DriftDetector:
             logger.error(f"Evidently drift detection failed: {e}")
             return self._detect_fallback(reference, current)
     
+    @staticmethod
+    def reference_stats(reference: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Column statistics the statistical fallback compares against.
+        
+        Compute once per reference set and pass to
+        detect_data_drift_with_stats to skip re-reducing the reference.
+        
+        Args:
+            reference: Training/reference data
+        
+        Returns:
+            Numeric columns with their means/stds and sorted values, plus
+            the raw frame
+        """
+        numeric = reference.select_dtypes(include=[np.number])
+        ref = numeric.to_numpy(dtype=np.float64)
+        
+        # NaN-skipping column statistics, as pandas mean()/std() compute them
+        return {
+            "columns": numeric.columns,
+            "mean": np.nanmean(ref, axis=0),
+            "std": np.nanstd(ref, axis=0, ddof=1),
+            # Per-column sorted non-NaN values for the KS test
+            "sorted": [np.sort(column[~np.isnan(column)]) for column in ref.T],
+            "raw": reference,  # Evidently needs the full frame
+        }
+    
+    def detect_data_drift_with_stats(
+        self,
+        ref_stats: Dict[str, Any],
+        current_data: pd.DataFrame,
+    ) -> Dict[str, Any]:
+        """
+        Detect data drift against precomputed reference statistics.
+        
+        Args:
+            ref_stats: Result of reference_stats()
+            current_data: Current production data
+        
+        Returns:
+            Drift detection results
+        """
+        if HAS_EVIDENTLY and ref_stats.get("raw") is not None:
+            return self._detect_with_evidently(ref_stats["raw"], current_data)
+        return self._detect_from_stats(ref_stats, current_data)
+    
     def _detect_fallback(
         self,
         reference: pd.DataFrame,
         current: pd.DataFrame,
     ) -> Dict[str, Any]:
         """Simple statistical drift detection fallback."""
-        drifted_features = []
-        drift_scores = []
+        return self._detect_from_stats(self.reference_stats(reference), current)
+    
+    def _detect_from_stats(
+        self,
+        ref_stats: Dict[str, Any],
+        current: pd.DataFrame,
+    ) -> Dict[str, Any]:
+        """
+        Score current data against reference statistics.
         
-        common_cols = list(set(reference.columns) & set(current.columns))
+        The drift score is the two-sample KS statistic, which also catches
+        variance and shape changes; the normalized z-score of the mean
+        shift is reported alongside it.
+        """
+        # Numeric reference columns present in the current frame
+        present = np.flatnonzero(ref_stats["columns"].isin(current.columns))
+        cols = ref_stats["columns"][present]
+        ref_mean = ref_stats["mean"][present]
+        ref_std = ref_stats["std"][present]
+        curr = current[cols].to_numpy(dtype=np.float64)
         
-        for col in common_cols:
-            if reference[col].dtype not in [np.number, 'float64', 'int64']:
-                continue
-            
-            ref_mean = reference[col].mean()
-            ref_std = reference[col].std()
-            curr_mean = current[col].mean()
-            
-            if ref_std > 0:
-                # Z-score of mean shift
-                z_score = abs(curr_mean - ref_mean) / ref_std
-                drift_score = min(1.0, z_score / 3)  # Normalize to 0-1
-                
-                drift_scores.append(drift_score)
-                
-                if drift_score > self.feature_drift_threshold:
-                    drifted_features.append({
-                        "feature": col,
-                        "drift_score": drift_score,
-                        "reference_mean": ref_mean,
-                        "current_mean": curr_mean,
-                    })
+        drift_scores = np.array([
+            _ks_statistic(ref_stats["sorted"][i], curr[:, j]) for j, i in enumerate(present)
+        ])
         
-        overall_drift = np.mean(drift_scores) if drift_scores else 0.0
+        # Columns without data on either side cannot be scored
+        valid = ~np.isnan(drift_scores)
+        cols, ref_mean, ref_std, drift_scores = cols[valid], ref_mean[valid], ref_std[valid], drift_scores[valid]
+        curr_mean = np.nanmean(curr[:, valid], axis=0)
+        
+        # Z-score of mean shift, normalized to 0-1 (any shift of a constant
+        # reference column scores 1)
+        shift = np.abs(curr_mean - ref_mean)
+        safe_std = np.where(ref_std > 0, ref_std, 1.0)
+        mean_shift_scores = np.where(
+            ref_std > 0, np.fmin(1.0, shift / safe_std / 3), (shift > 0).astype(float)
+        )
+        
+        drifted = drift_scores > self.feature_drift_threshold
+        drifted_features = [
+            {
+                "feature": col,
+                "drift_score": float(score),
+                "mean_shift_score": float(shift_score),
+                "reference_mean": float(r_mean),
+                "current_mean": float(c_mean),
+            }
+            for col, score, shift_score, r_mean, c_mean in zip(
+                cols[drifted], drift_scores[drifted], mean_shift_scores[drifted],
+                ref_mean[drifted], curr_mean[drifted],
+            )
+        ]
+        
+        overall_drift = float(drift_scores.mean()) if drift_scores.size else 0.0
         
         return {
             "timestamp": datetime.utcnow().isoformat(),
@@ -195,14 +344,82 @@ class DriftMonitor:
         self,
         detector: DriftDetector,
         reference_window_days: int = 7,
+        max_reference_rows: int = 10_000,
     ):
         self.detector = detector
         self.reference_window_days = reference_window_days
-        self.reference_data: Dict[str, pd.DataFrame] = {}  # tenant_id -> data
+        # Rows kept per tenant for the KS test; larger references are
+        # reservoir-sampled down to this (mean/std still use every row)
+        self.max_reference_rows = max_reference_rows
+        self.reference_stats: Dict[str, Dict[str, Any]] = {}  # tenant_id -> stats
+        self._welford: Dict[str, WelfordStats] = {}
+        self._samples: Dict[str, np.ndarray] = {}  # tenant_id -> (rows, F) sample
+        self._rows_seen: Dict[str, int] = {}
+        self._rng = np.random.default_rng()
     
     def set_reference(self, tenant_id: str, data: pd.DataFrame):
-        """Set reference data for a tenant."""
-        self.reference_data[tenant_id] = data.copy()
+        """
+        Set reference data for a tenant, replacing any previous reference.
+        
+        Only running statistics and a bounded row sample are kept; the raw
+        frame is retained only when Evidently is installed, since its
+        report needs it.
+        """
+        columns = data.select_dtypes(include=[np.number]).columns
+        self._welford[tenant_id] = WelfordStats(len(columns))
+        self._samples[tenant_id] = np.empty((0, len(columns)))
+        self._rows_seen[tenant_id] = 0
+        self.reference_stats[tenant_id] = {
+            "columns": columns,
+            "raw": data.copy() if HAS_EVIDENTLY else None,
+        }
+        self._ingest(tenant_id, data)
+    
+    def update_reference(self, tenant_id: str, data: pd.DataFrame):
+        """
+        Add rows to a tenant's reference (or set it if there is none).
+        
+        Args:
+            tenant_id: Tenant identifier
+            data: New reference rows; columns missing from the original
+                reference are ignored
+        """
+        if tenant_id not in self.reference_stats:
+            self.set_reference(tenant_id, data)
+            return
+        
+        ref_stats = self.reference_stats[tenant_id]
+        if ref_stats["raw"] is not None:
+            ref_stats["raw"] = pd.concat([ref_stats["raw"], data], ignore_index=True)
+        self._ingest(tenant_id, data)
+    
+    def _ingest(self, tenant_id: str, data: pd.DataFrame):
+        """Fold rows into the running stats and refresh the KS sample."""
+        ref_stats = self.reference_stats[tenant_id]
+        X = data.reindex(columns=ref_stats["columns"]).to_numpy(dtype=np.float64)
+        
+        welford = self._welford[tenant_id]
+        welford.update(X)
+        
+        # Reservoir sampling (Algorithm R): row t of the stream replaces a
+        # random slot with probability cap / (t + 1) once the sample is full
+        cap = self.max_reference_rows
+        sample = self._samples[tenant_id]
+        seen = self._rows_seen[tenant_id]
+        n_fill = min(max(cap - len(sample), 0), len(X))
+        sample = np.concatenate([sample, X[:n_fill]])
+        rest = X[n_fill:]
+        if len(rest):
+            positions = seen + n_fill + np.arange(len(rest))
+            slots = (self._rng.random(len(rest)) * (positions + 1)).astype(np.int64)
+            keep = slots < cap
+            sample[slots[keep]] = rest[keep]
+        self._samples[tenant_id] = sample
+        self._rows_seen[tenant_id] = seen + len(X)
+        
+        ref_stats["mean"] = np.where(welford.n > 0, welford.mean, np.nan)
+        ref_stats["std"] = welford.std
+        ref_stats["sorted"] = [np.sort(column[~np.isnan(column)]) for column in sample.T]
     
     def check_drift(
         self,
@@ -219,15 +436,15 @@ class DriftMonitor:
         Returns:
             Drift check results
         """
-        reference = self.reference_data.get(tenant_id)
+        ref_stats = self.reference_stats.get(tenant_id)
         
-        if reference is None:
+        if ref_stats is None:
             return {
                 "status": "no_reference",
                 "message": "No reference data set for this tenant",
             }
         
-        drift_result = self.detector.detect_data_drift(reference, current_data)
+        drift_result = self.detector.detect_data_drift_with_stats(ref_stats, current_data)
         drift_result["tenant_id"] = tenant_id
         drift_result["should_retrain"] = self.detector.should_retrain(drift_result)
         
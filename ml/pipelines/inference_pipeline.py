@@ -17,6 +17,18 @@ from ml.services.ml_service import MLService
 
 logger = logging.getLogger(__name__)
 
+# Explanation templates, bound once at import
+ANOMALY_EXPLANATIONS = {
+    "critical": "⚠️ Critical anomaly detected (score: {score:.2f})".format,
+    "warning": "⚡ Warning: Elevated anomaly score ({score:.2f})".format,
+}
+# By RUL band (upper bound in hours, exclusive)
+RUL_EXPLANATIONS = (
+    (10, "🔴 Critical: Only {rul:.0f} hours of useful life remaining".format),
+    (50, "🟡 Warning: {rul:.0f} hours of useful life remaining".format),
+    (float("inf"), "🟢 Asset health: ~{rul:.0f} hours remaining".format),
+)
+
 
 class InferencePipeline:
     """
@@ -55,82 +67,136 @@ class InferencePipeline:
         Returns:
             Prediction results with alerts
         """
+        timestamp = datetime.utcnow().isoformat()
         result = {
             "tenant_id": tenant_id,
             "asset_id": asset_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "predictions": [],
             "alerts": [],
         }
         
-        # Anomaly detection
-        try:
-            prediction = self.ml_service.predict_anomalies(
+        # Model inference is blocking CPU work; run anomaly detection and
+        # RUL on worker threads so they overlap and the loop stays free
+        anomaly_prediction, rul_result = await asyncio.gather(
+            asyncio.to_thread(
+                self.ml_service.predict_anomalies,
                 tenant_id=tenant_id,
                 data=metrics,
                 with_explanation=True,
-            )
-            
-            if "anomaly_scores" in prediction:
-                score = prediction["anomaly_scores"][-1]
-                risk = prediction["risk_levels"][-1]
-                
-                pred_record = {
-                    "type": "anomaly",
-                    "anomaly_score": score,
-                    "risk_level": risk,
-                    "model_version": prediction.get("model_version"),
-                }
-                
-                if "explanations" in prediction:
-                    pred_record["explanation"] = prediction["explanations"][-1]
-                
-                result["predictions"].append(pred_record)
-                
-                # Generate alert if score exceeds threshold
-                if score >= self.alert_threshold:
-                    result["alerts"].append({
-                        "type": "anomaly",
-                        "severity": risk,
-                        "message": f"High anomaly score detected: {score:.2f}",
-                        "asset_id": asset_id,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "top_features": pred_record.get("explanation", {}).get("top_features", [])[:3],
-                    })
+            ),
+            asyncio.to_thread(self._predict_rul, tenant_id, metrics),
+            return_exceptions=True,
+        )
+        
+        # Anomaly detection
+        try:
+            if isinstance(anomaly_prediction, Exception):
+                raise anomaly_prediction
+            self._add_anomaly(result, anomaly_prediction, asset_id, timestamp)
         except Exception as e:
             logger.warning(f"Anomaly prediction failed: {e}")
         
         # RUL prediction
         try:
-            rul_result = self.ml_service.predict_rul(tenant_id, metrics.values.reshape(1, -1, metrics.shape[1]))
-            
-            if "rul_estimate" in rul_result:
-                rul = rul_result["rul_estimate"][0]
-                
-                pred_record = {
-                    "type": "rul",
-                    "rul_estimate": rul,
-                    "confidence_lower": rul_result.get("confidence_lower", [None])[0],
-                    "confidence_upper": rul_result.get("confidence_upper", [None])[0],
-                    "model_version": rul_result.get("model_version"),
-                }
-                result["predictions"].append(pred_record)
-                
-                # Alert for critical RUL
-                if rul and rul < self.rul_critical_threshold:
-                    result["alerts"].append({
-                        "type": "rul",
-                        "severity": "critical" if rul < 10 else "warning",
-                        "message": f"Low remaining useful life: {rul:.1f} hours",
-                        "asset_id": asset_id,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "rul_estimate": rul,
-                    })
+            if isinstance(rul_result, Exception):
+                raise rul_result
+            self._add_rul(result, rul_result, asset_id, timestamp)
         except Exception as e:
             logger.warning(f"RUL prediction failed: {e}")
         
         return result
     
+    def _predict_rul(self, tenant_id: str, metrics: pd.DataFrame) -> Dict[str, Any]:
+        """Predict RUL from the trailing window of metrics, in model feature order."""
+        sequence_length = self.ml_service.rul_sequence_length(tenant_id)
+        feature_names = self.ml_service.rul_feature_names(tenant_id)
+        
+        if sequence_length is None or feature_names is None:
+            return {
+                "status": "error",
+                "message": f"No RUL forecaster found for tenant {tenant_id}",
+            }
+        
+        if len(metrics) < sequence_length:
+            return {
+                "status": "error",
+                "message": f"Need at least {sequence_length} data points for RUL",
+            }
+        
+        sequence = metrics[feature_names].tail(sequence_length).to_numpy(dtype=np.float32)
+        return self.ml_service.predict_rul(tenant_id, sequence[np.newaxis, ...])
+    
+    def _add_anomaly(
+        self,
+        result: Dict[str, Any],
+        prediction: Dict[str, Any],
+        asset_id: str,
+        timestamp: str,
+    ):
+        """Append the latest row's anomaly prediction (and alert) to result."""
+        if "anomaly_scores" not in prediction:
+            return
+        
+        score = prediction["anomaly_scores"][-1]
+        risk = prediction["risk_levels"][-1]
+        
+        pred_record = {
+            "type": "anomaly",
+            "anomaly_score": score,
+            "risk_level": risk,
+            "model_version": prediction.get("model_version"),
+        }
+        
+        if "explanations" in prediction:
+            pred_record["explanation"] = prediction["explanations"][-1]
+        
+        result["predictions"].append(pred_record)
+        
+        # Generate alert if score exceeds threshold
+        if score >= self.alert_threshold:
+            result["alerts"].append({
+                "type": "anomaly",
+                "severity": risk,
+                "message": f"High anomaly score detected: {score:.2f}",
+                "asset_id": asset_id,
+                "timestamp": timestamp,
+                "top_features": pred_record.get("explanation", {}).get("top_features", [])[:3],
+            })
+    
+    def _add_rul(
+        self,
+        result: Dict[str, Any],
+        rul_result: Dict[str, Any],
+        asset_id: str,
+        timestamp: str,
+    ):
+        """Append the RUL prediction (and alert) to result."""
+        if "rul_estimate" not in rul_result:
+            return
+        
+        rul = rul_result["rul_estimate"][0]
+        
+        pred_record = {
+            "type": "rul",
+            "rul_estimate": rul,
+            "confidence_lower": rul_result.get("confidence_lower", [None])[0],
+            "confidence_upper": rul_result.get("confidence_upper", [None])[0],
+            "model_version": rul_result.get("model_version"),
+        }
+        result["predictions"].append(pred_record)
+        
+        # Alert for critical RUL
+        if rul and rul < self.rul_critical_threshold:
+            result["alerts"].append({
+                "type": "rul",
+                "severity": "critical" if rul < 10 else "warning",
+                "message": f"Low remaining useful life: {rul:.1f} hours",
+                "asset_id": asset_id,
+                "timestamp": timestamp,
+                "rul_estimate": rul,
+            })
+    
     def generate_explanation(
         self,
         prediction: Dict[str, Any],
@@ -151,24 +217,21 @@ class InferencePipeline:
             score = anomaly.get("score", 0)
             risk = anomaly.get("risk_level", "normal")
             
-            if risk == "critical":
-                explanations.append(f"⚠️ Critical anomaly detected (score: {score:.2f})")
-            elif risk == "warning":
-                explanations.append(f"⚡ Warning: Elevated anomaly score ({score:.2f})")
+            template = ANOMALY_EXPLANATIONS.get(risk)
+            if template is not None:
+                explanations.append(template(score=score))
             
             top_features = anomaly.get("top_features", [])[:3]
             if top_features:
-                feature_desc = ", ".join([f"{f['feature']}" for f in top_features])
+                feature_desc = ", ".join(str(f["feature"]) for f in top_features)
                 explanations.append(f"Key contributing factors: {feature_desc}")
         
         if prediction.get("rul"):
             rul = prediction["rul"].get("estimate")
             if rul:
-                if rul < 10:
-                    explanations.append(f"🔴 Critical: Only {rul:.0f} hours of useful life remaining")
-                elif rul < 50:
-                    explanations.append(f"🟡 Warning: {rul:.0f} hours of useful life remaining")
-                else:
-                    explanations.append(f"🟢 Asset health: ~{rul:.0f} hours remaining")
+                for max_hours, template in RUL_EXPLANATIONS:
+                    if rul < max_hours:
+                        explanations.append(template(rul=rul))
+                        break
         
         return " | ".join(explanations) if explanations else "No issues detected"
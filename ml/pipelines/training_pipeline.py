@@ -7,9 +7,11 @@ Supports:
 - MLflow experiment tracking
 """
 import asyncio
+import functools
 import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -19,6 +21,64 @@ from ml.services.ml_service import MLService
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=32)
+def _numeric_feature_cols(schema: Tuple[Tuple[str, Any], ...]) -> List[str]:
+    """
+    Numeric feature columns of a frame schema, as select_dtypes(np.number).
+    
+    Keyed by (column, dtype) pairs, so repeated calls for a tenant's
+    unchanged schema are a cache hit. Callers must not mutate the result.
+    """
+    return [
+        col for col, dtype in schema
+        if pd.api.types.is_numeric_dtype(dtype)
+        and not pd.api.types.is_bool_dtype(dtype)
+        and col != "asset_id"
+    ]
+
+
+def _feature_cols(metrics: pd.DataFrame) -> List[str]:
+    return _numeric_feature_cols(tuple(zip(metrics.columns, metrics.dtypes)))
+
+
+# (level, message) templates for synthetic logs; {sensor} is filled per line
+_LOG_TEMPLATES = [
+    ("INFO", "System started successfully"),
+    ("WARNING", "Temperature threshold exceeded on {sensor}"),
+    ("ERROR", "Connection failed to {sensor}"),
+    ("INFO", "{sensor} reconnected"),
+    ("WARNING", "High vibration detected on {sensor}"),
+    ("ERROR", "Failed to read {sensor}"),
+    ("INFO", "Maintenance scheduled for {sensor}"),
+]
+_LOG_SENSORS = [f"sensor_{i}" for i in range(8)]
+# Every template/sensor combination, indexed by template * n_sensors + sensor
+_LOG_MESSAGES = np.array([
+    f"{level} {message.format(sensor=sensor)}"
+    for level, message in _LOG_TEMPLATES
+    for sensor in _LOG_SENSORS
+])
+
+
+def _synthetic_logs(n: int, seed: int = 42) -> List[str]:
+    """
+    Generate n timestamped log lines from integer draws.
+    
+    Lines are assembled with vectorized string ops over a precomputed
+    message table, so large corpora need no per-line Python formatting.
+    """
+    rng = np.random.default_rng(seed)
+    offsets = np.cumsum(rng.integers(1, 300, n))  # Seconds between lines
+    timestamps = np.datetime_as_string(np.datetime64("2025-01-08T00:00:00") + offsets)
+    codes = rng.integers(0, len(_LOG_MESSAGES), n)
+    # np.char rather than np.strings, which needs NumPy 2
+    lines = np.char.add(
+        np.char.add(np.char.replace(timestamps, "T", " "), " "),
+        _LOG_MESSAGES[codes],
+    )
+    return lines.tolist()
+
+
 class TrainingPipeline:
     """
     Production training pipeline for multi-tenant ML models.
@@ -30,13 +90,19 @@ class TrainingPipeline:
     - Model deployment
     """
     
+    # Rows per partition when streaming metrics from the database
+    FETCH_PARTITION_ROWS = 50_000
+    
     def __init__(
         self,
         ml_service: MLService,
         db_session_factory=None,
+        synthetic_logs: Optional[int] = None,
     ):
         self.ml_service = ml_service
         self.db_session_factory = db_session_factory
+        # Mock log lines per tenant for load tests (None: short fixed corpus)
+        self.synthetic_logs = synthetic_logs
     
     async def train_tenant_models(
         self,
@@ -44,6 +110,8 @@ class TrainingPipeline:
         train_anomaly: bool = True,
         train_rul: bool = True,
         train_logs: bool = True,
+        data: Optional[Tuple[pd.DataFrame, List[str]]] = None,
+        executor: Optional[Executor] = None,
     ) -> Dict[str, Any]:
         """
         Train all models for a tenant.
@@ -53,6 +121,8 @@ class TrainingPipeline:
             train_anomaly: Whether to train anomaly detector
             train_rul: Whether to train RUL forecaster
             train_logs: Whether to train log analyzer
+            data: Prefetched fetch_tenant_data result; fetched here if None
+            executor: Executor to train on (default: the loop's executor)
         
         Returns:
             Training results for all models
@@ -65,9 +135,11 @@ class TrainingPipeline:
             "log_analyzer": None,
         }
         
-        # Fetch tenant data (mock - replace with real database queries)
-        metrics_data = await self._fetch_metrics_data(tenant_id)
-        logs_data = await self._fetch_logs_data(tenant_id)
+        metrics_data, logs_data = data or await self.fetch_tenant_data(tenant_id)
+        loop = asyncio.get_running_loop()
+        
+        def run(func, **kwargs):
+            return loop.run_in_executor(executor, functools.partial(func, **kwargs))
         
         # Train anomaly detector
         if train_anomaly and len(metrics_data) >= 100:
@@ -75,7 +147,10 @@ class TrainingPipeline:
                 # Aggregate metrics to feature matrix
                 feature_df = self._prepare_anomaly_features(metrics_data)
                 
-                result = self.ml_service.train_anomaly_detector(
+                # Training is synchronous and CPU-bound; run it on a worker
+                # thread so other tenants' fetches and training can proceed
+                result = await run(
+                    self.ml_service.train_anomaly_detector,
                     tenant_id=tenant_id,
                     data=feature_df,
                     feature_columns=list(feature_df.columns),
@@ -95,7 +170,8 @@ class TrainingPipeline:
                 if rul_df is not None:
                     feature_cols = [c for c in rul_df.columns if c != "RUL"]
                     
-                    result = self.ml_service.train_rul_forecaster(
+                    result = await run(
+                        self.ml_service.train_rul_forecaster,
                         tenant_id=tenant_id,
                         data=rul_df,
                         feature_columns=feature_cols,
@@ -111,7 +187,8 @@ class TrainingPipeline:
         # Train log analyzer
         if train_logs and len(logs_data) >= 50:
             try:
-                result = self.ml_service.train_log_analyzer(
+                result = await run(
+                    self.ml_service.train_log_analyzer,
                     tenant_id=tenant_id,
                     logs=logs_data,
                 )
@@ -124,34 +201,95 @@ class TrainingPipeline:
         results["completed_at"] = datetime.utcnow().isoformat()
         return results
     
+    async def fetch_tenant_data(self, tenant_id: str) -> Tuple[pd.DataFrame, List[str]]:
+        """Fetch a tenant's metrics and logs concurrently."""
+        # Fetch tenant data (mock - replace with real database queries)
+        metrics_data, logs_data = await asyncio.gather(
+            self._fetch_metrics_data(tenant_id),
+            self._fetch_logs_data(tenant_id),
+        )
+        return metrics_data, logs_data
+    
     async def _fetch_metrics_data(self, tenant_id: str) -> pd.DataFrame:
         """Fetch metrics data for tenant from database."""
-        # TODO: Replace with actual database query
-        # Example with asyncpg:
-        # async with self.db_session_factory() as session:
-        #     result = await session.execute(
-        #         select(Metric).where(Metric.tenant_id == tenant_id)
-        #     )
-        #     return pd.DataFrame([dict(m) for m in result.scalars()])
+        if self.db_session_factory is not None:
+            return await self._query_metrics_data(tenant_id)
         
-        # Mock data for demo
-        np.random.seed(42)
+        # Mock data for demo (a local generator; no global RNG state)
+        rng = np.random.default_rng(42)
         n_samples = 1000
         
-        return pd.DataFrame({
-            "timestamp": pd.date_range(start="2025-01-01", periods=n_samples, freq="H"),
-            "asset_id": np.random.choice(["asset_1", "asset_2", "asset_3"], n_samples),
-            "temperature": np.random.normal(65, 10, n_samples),
-            "vibration": np.random.normal(0.5, 0.1, n_samples),
-            "pressure": np.random.normal(100, 15, n_samples),
-            "rpm": np.random.normal(1500, 100, n_samples),
-            "current": np.random.normal(10, 2, n_samples),
-        })
+        timestamps = (
+            np.datetime64("2025-01-01T00", "h") + np.arange(n_samples)
+        ).astype("datetime64[ns]")
+        asset_ids = rng.choice(["asset_1", "asset_2", "asset_3"], n_samples)
+        
+        # Sensor readings are drawn as one contiguous float32 block (scaled
+        # and shifted in place) that the DataFrame wraps as a single block
+        sensors = {
+            "temperature": (65, 10),
+            "vibration": (0.5, 0.1),
+            "pressure": (100, 15),
+            "rpm": (1500, 100),
+            "current": (10, 2),
+        }
+        means, stds = np.array(list(sensors.values()), dtype=np.float32).T
+        features = rng.standard_normal((n_samples, len(sensors)), dtype=np.float32)
+        features *= stds
+        features += means
+        
+        metrics = pd.DataFrame(features, columns=list(sensors), copy=False)
+        metrics.insert(0, "timestamp", timestamps)
+        metrics.insert(1, "asset_id", asset_ids)
+        return metrics
+    
+    async def _query_metrics_data(self, tenant_id: str) -> pd.DataFrame:
+        """
+        Load a tenant's metrics table, one column per metric name.
+        
+        Rows are streamed through a server-side cursor in partitions and
+        unzipped into per-column NumPy arrays, so no ORM object or per-row
+        dict is built; pandas is only used for the final long-to-wide pivot.
+        """
+        from sqlalchemy import text
+        
+        query = text(
+            "SELECT timestamp, asset_id, metric_name, metric_value FROM metrics "
+            "WHERE tenant_id = :tenant_id ORDER BY timestamp"
+        )
+        columns: List[List[np.ndarray]] = [[], [], [], []]
+        
+        async with self.db_session_factory() as session:
+            result = await session.stream(query, {"tenant_id": tenant_id})
+            async for rows in result.partitions(self.FETCH_PARTITION_ROWS):
+                timestamps, asset_ids, names, values = zip(*rows)
+                columns[0].append(np.array(timestamps, dtype="datetime64[ns]"))
+                columns[1].append(np.array(asset_ids, dtype=str))
+                columns[2].append(np.array(names, dtype=str))
+                columns[3].append(np.array(values, dtype=np.float32))
+        
+        if not columns[0]:
+            return pd.DataFrame(columns=["timestamp", "asset_id"])
+        
+        timestamps, asset_ids, names, values = (np.concatenate(parts) for parts in columns)
+        wide = pd.DataFrame({
+            "timestamp": timestamps,
+            "asset_id": asset_ids,
+            "metric_name": names,
+            "metric_value": values,
+        }).pivot_table(
+            index=["timestamp", "asset_id"], columns="metric_name", values="metric_value",
+        )
+        wide.columns.name = None
+        return wide.reset_index()
     
     async def _fetch_logs_data(self, tenant_id: str) -> List[str]:
         """Fetch log data for tenant from database."""
         # TODO: Replace with actual database query
         
+        if self.synthetic_logs is not None:
+            return _synthetic_logs(self.synthetic_logs)
+        
         # Mock data for demo
         sample_logs = [
             "2025-01-08 10:00:00 INFO System started successfully",
@@ -168,10 +306,13 @@ class TrainingPipeline:
     def _prepare_anomaly_features(self, metrics: pd.DataFrame) -> pd.DataFrame:
         """Prepare features for anomaly detection."""
         # Aggregate metrics into feature vectors
-        numeric_cols = metrics.select_dtypes(include=[np.number]).columns
-        feature_cols = [c for c in numeric_cols if c not in ["asset_id"]]
+        feature_cols = _feature_cols(metrics)
         
-        return metrics[feature_cols].dropna()
+        features = metrics[feature_cols]
+        # dropna always copies; only pay for it when there is something to drop
+        if features.isna().to_numpy().any():
+            features = features.dropna()
+        return features
     
     def _prepare_rul_features(self, metrics: pd.DataFrame) -> Optional[pd.DataFrame]:
         """
@@ -183,15 +324,20 @@ class TrainingPipeline:
         if len(metrics) < 500:
             return None
         
-        numeric_cols = metrics.select_dtypes(include=[np.number]).columns
-        feature_cols = [c for c in numeric_cols if c not in ["asset_id"]]
-        
-        df = metrics[feature_cols].copy()
+        feature_cols = _feature_cols(metrics)
         
-        # Mock RUL (in real case, computed from failure timestamps)
-        df["RUL"] = np.linspace(130, 0, len(df))
+        # Features and the mock RUL (in real case, computed from failure
+        # timestamps) are written straight into one float32 block, the
+        # dtype the forecaster trains in; this is the only copy made
+        values = np.empty((len(metrics), len(feature_cols) + 1), dtype=np.float32)
+        for i, col in enumerate(feature_cols):
+            values[:, i] = metrics[col].to_numpy(dtype=np.float32, na_value=np.nan)
+        values[:, -1] = np.linspace(130, 0, len(metrics))
         
-        return df.dropna()
+        df = pd.DataFrame(values, columns=[*feature_cols, "RUL"], index=metrics.index, copy=False)
+        if np.isnan(values).any():
+            df = df.dropna()
+        return df
 
 
 class ScheduledTrainer:
@@ -204,9 +350,29 @@ class ScheduledTrainer:
     - Multi-tenant batch training
     """
     
-    def __init__(self, training_pipeline: TrainingPipeline):
+    def __init__(
+        self,
+        training_pipeline: TrainingPipeline,
+        max_concurrency: int = 4,
+        prefetch_depth: int = 1,
+    ):
         self.pipeline = training_pipeline
+        # Tenants trained at once during a nightly run
+        self.max_concurrency = max_concurrency
+        # Tenants whose data is fetched ahead of a free training slot
+        self.prefetch_depth = prefetch_depth
         self.is_running = False
+        # Training threads, kept across nightly runs
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the training executor, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="nightly-training",
+            )
+        return self._executor
     
     async def run_nightly_training(self, tenant_ids: List[str]) -> Dict[str, Any]:
         """
@@ -220,14 +386,36 @@ class ScheduledTrainer:
         """
         logger.info(f"Starting nightly training for {len(tenant_ids)} tenants")
         
-        results = {}
-        for tenant_id in tenant_ids:
-            try:
-                result = await self.pipeline.train_tenant_models(tenant_id)
-                results[tenant_id] = result
-            except Exception as e:
-                results[tenant_id] = {"status": "error", "message": str(e)}
-                logger.error(f"Training failed for tenant {tenant_id}: {e}")
+        # The producer starts each tenant's fetch and queues it; the bounded
+        # queue lets fetches run up to prefetch_depth tenants ahead of the
+        # training workers, so fetch latency hides behind training
+        n_workers = max(1, min(self.max_concurrency, len(tenant_ids)))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch_depth)
+        executor = self._get_executor()
+        outcomes: Dict[str, Any] = {}
+        
+        async def produce():
+            for tenant_id in tenant_ids:
+                fetch = asyncio.create_task(self.pipeline.fetch_tenant_data(tenant_id))
+                await queue.put((tenant_id, fetch))
+            for _ in range(n_workers):
+                await queue.put(None)
+        
+        async def consume():
+            while (item := await queue.get()) is not None:
+                tenant_id, fetch = item
+                try:
+                    data = await fetch
+                    outcomes[tenant_id] = await self.pipeline.train_tenant_models(
+                        tenant_id, data=data, executor=executor
+                    )
+                except Exception as e:
+                    outcomes[tenant_id] = {"status": "error", "message": str(e)}
+                    logger.error(f"Training failed for tenant {tenant_id}: {e}")
+        
+        await asyncio.gather(produce(), *(consume() for _ in range(n_workers)))
+        
+        results = {tenant_id: outcomes[tenant_id] for tenant_id in tenant_ids}
         
         logger.info("Nightly training completed")
         return results
@@ -247,5 +435,8 @@ class ScheduledTrainer:
             await asyncio.sleep(interval_hours * 3600)
     
     def stop_scheduler(self):
-        """Stop the scheduler."""
+        """Stop the scheduler and release its training threads."""
         self.is_running = False
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -8,6 +8,10 @@ Provides a unified interface for:
 - MLflow integration
 """
 import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
@@ -15,19 +19,109 @@ import pandas as pd
 import numpy as np
 import json
 import logging
+import time
 
-from ml.models.anomaly_detector import AnomalyDetector, StreamingAnomalyDetector
+from ml.models.anomaly_detector import AnomalyDetector, RISK_LEVELS
 from ml.models.rul_forecaster import RULForecaster
 from ml.models.log_analyzer import LogAnalyzer
 
 try:
     import mlflow
+    from mlflow.entities import Metric, Param
+    from mlflow.tracking import MlflowClient
     HAS_MLFLOW = True
 except ImportError:
     HAS_MLFLOW = False
 
+_fluent_experiment_id = None
+if HAS_MLFLOW:
+    try:
+        # Private, but the only resolver that also honors mlflow.set_experiment()
+        from mlflow.tracking.fluent import _get_experiment_id as _fluent_experiment_id
+    except ImportError:
+        pass
+
 logger = logging.getLogger(__name__)
 
+# RUL hours below which an asset is critical / warning
+RUL_RISK_THRESHOLDS = np.array([10.0, 50.0])
+
+
+_version_lock = threading.Lock()
+_last_version_ns = 0
+
+
+def _new_version() -> str:
+    """
+    Default model version: nanoseconds since the epoch, zero-padded.
+    
+    Strictly increasing within the process, so two trainings never share a
+    versioned model path, and the strings sort chronologically.
+    """
+    global _last_version_ns
+    with _version_lock:
+        _last_version_ns = max(time.time_ns(), _last_version_ns + 1)
+        return f"{_last_version_ns:020d}"
+
+
+def overall_risk_levels(
+    anomaly_risks: List[Optional[str]],
+    rul_estimates: List[Optional[float]],
+) -> np.ndarray:
+    """
+    Overall risk per asset: the worse of its anomaly and RUL risk.
+    
+    Levels are coded by their index in RISK_LEVELS (normal < warning <
+    critical), so N assets reduce with one np.maximum.
+    
+    Args:
+        anomaly_risks: Anomaly risk level per asset (None if unavailable)
+        rul_estimates: RUL estimate in hours per asset (None if unavailable)
+    
+    Returns:
+        Array of risk level strings
+    """
+    # Unknown levels (including None) match no column and code as normal
+    anomaly_codes = (np.asarray(anomaly_risks, dtype=str)[:, None] == RISK_LEVELS).argmax(axis=1)
+    # NaN (no estimate) sorts past every threshold and codes as normal
+    rul = np.asarray(rul_estimates, dtype=float)
+    rul_codes = len(RUL_RISK_THRESHOLDS) - np.searchsorted(RUL_RISK_THRESHOLDS, rul, side="right")
+    return RISK_LEVELS[np.maximum(anomaly_codes, rul_codes)]
+
+
+class _ModelCache:
+    """
+    Thread-safe LRU map of tenant_id -> model.
+    
+    Past maxsize the least recently used tenant is dropped; its model is
+    reloaded from disk on the next request.
+    """
+    
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, tenant_id: str) -> Optional[Any]:
+        with self._lock:
+            model = self._data.get(tenant_id)
+            if model is not None:
+                self._data.move_to_end(tenant_id)
+            return model
+    
+    def __setitem__(self, tenant_id: str, model: Any):
+        with self._lock:
+            self._data[tenant_id] = model
+            self._data.move_to_end(tenant_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._data
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
 
 class MLService:
     """
@@ -44,24 +138,123 @@ class MLService:
         self,
         models_dir: str = "./models",
         mlflow_tracking_uri: Optional[str] = None,
+        model_cache_size: int = 128,
     ):
         self.models_dir = Path(models_dir)
         self.models_dir.mkdir(parents=True, exist_ok=True)
+        # tenant_id -> model directory, built and created once per tenant
+        self._tenant_dirs: Dict[str, Path] = {}
         
         # MLflow setup
         if HAS_MLFLOW and mlflow_tracking_uri:
             mlflow.set_tracking_uri(mlflow_tracking_uri)
         
-        # Model caches (tenant_id -> model)
-        self._anomaly_detectors: Dict[str, AnomalyDetector] = {}
-        self._streaming_detectors: Dict[str, StreamingAnomalyDetector] = {}
-        self._rul_forecasters: Dict[str, RULForecaster] = {}
-        self._log_analyzers: Dict[str, LogAnalyzer] = {}
+        # Model caches (tenant_id -> model), each holding at most
+        # model_cache_size tenants
+        self._anomaly_detectors = _ModelCache(model_cache_size)
+        self._streaming_detectors = _ModelCache(model_cache_size)
+        self._rul_forecasters = _ModelCache(model_cache_size)
+        self._log_analyzers = _ModelCache(model_cache_size)
+        
+        # Overlaps log analysis with numeric scoring in predict_asset_health;
+        # created on first use and released by close()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ml-service")
+            return self._executor
+    
+    def close(self):
+        """Release the worker threads (call on shutdown)."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    @staticmethod
+    def _publish_latest(model_path: Path, latest_path: Path):
+        """
+        Point latest_path at a freshly saved model without rewriting it.
+        
+        The versioned file is hard-linked under a temporary name and moved
+        over latest_path, so readers see either the old or the new model,
+        never a partial file. Falls back to a copy where hard links are
+        unsupported.
+        """
+        tmp_path = latest_path.with_name(latest_path.name + ".tmp")
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(model_path, tmp_path)
+        except OSError:
+            shutil.copyfile(model_path, tmp_path)
+        os.replace(tmp_path, latest_path)
+    
+    def _log_mlflow_run(
+        self,
+        run_name: str,
+        params: Dict[str, Any],
+        metrics: Dict[str, float],
+        artifact_path: Path,
+    ):
+        """
+        Record a training run in MLflow.
+        
+        Params and metrics go in a single log_batch request. The client API
+        is used instead of the fluent active run, which is per-thread state,
+        since tenants now train concurrently on worker threads.
+        
+        Args:
+            run_name: MLflow run name
+            params: Run parameters
+            metrics: Final metric values
+            artifact_path: Model file to attach
+        """
+        client = MlflowClient()
+        experiment_id = self._mlflow_experiment_id(client)
+        run_id = client.create_run(experiment_id, run_name=run_name).info.run_id
+        
+        try:
+            timestamp = int(time.time() * 1000)
+            client.log_batch(
+                run_id,
+                metrics=[Metric(k, float(v), timestamp, 0) for k, v in metrics.items()],
+                params=[Param(k, str(v)) for k, v in params.items()],
+            )
+            client.log_artifact(run_id, str(artifact_path))
+        except Exception:
+            client.set_terminated(run_id, status="FAILED")
+            raise
+        client.set_terminated(run_id)
+    
+    @staticmethod
+    def _mlflow_experiment_id(client: "MlflowClient") -> str:
+        """
+        Experiment for new runs, resolved the way mlflow.start_run does.
+        
+        Honors mlflow.set_experiment(), MLFLOW_EXPERIMENT_NAME and
+        MLFLOW_EXPERIMENT_ID, falling back to the default experiment.
+        """
+        if _fluent_experiment_id is not None:
+            return _fluent_experiment_id()
+        
+        name = os.getenv("MLFLOW_EXPERIMENT_NAME")
+        if name:
+            experiment = client.get_experiment_by_name(name)
+            if experiment is not None:
+                return experiment.experiment_id
+        return os.getenv("MLFLOW_EXPERIMENT_ID", "0")
     
     def _get_tenant_dir(self, tenant_id: str) -> Path:
         """Get or create tenant model directory."""
-        tenant_dir = self.models_dir / tenant_id
-        tenant_dir.mkdir(parents=True, exist_ok=True)
+        tenant_dir = self._tenant_dirs.get(tenant_id)
+        if tenant_dir is None:
+            tenant_dir = self.models_dir / tenant_id
+            tenant_dir.mkdir(parents=True, exist_ok=True)
+            self._tenant_dirs[tenant_id] = tenant_dir
         return tenant_dir
     
     # ==================== Anomaly Detection ====================
@@ -87,7 +280,7 @@ class MLService:
         Returns:
             Training results and metrics
         """
-        version = version or datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        version = version or _new_version()
         
         logger.info(f"Training anomaly detector for tenant {tenant_id}")
         
@@ -106,26 +299,27 @@ class MLService:
         model_path = tenant_dir / f"anomaly_detector_{version}.joblib"
         detector.save(str(model_path))
         
-        # Also save as latest
-        latest_path = tenant_dir / "anomaly_detector_latest.joblib"
-        detector.save(str(latest_path))
+        # Also publish as latest
+        self._publish_latest(model_path, tenant_dir / "anomaly_detector_latest.joblib")
         
         # Cache
         self._anomaly_detectors[tenant_id] = detector
         
         # Log to MLflow
         if HAS_MLFLOW:
-            with mlflow.start_run(run_name=f"anomaly_detector_{tenant_id}"):
-                mlflow.log_params({
+            self._log_mlflow_run(
+                run_name=f"anomaly_detector_{tenant_id}",
+                params={
                     "tenant_id": tenant_id,
                     "contamination": contamination,
                     "n_features": len(feature_columns),
                     "n_samples": len(data),
-                })
-                mlflow.log_metrics({
+                },
+                metrics={
                     "training_samples": len(data),
-                })
-                mlflow.log_artifact(str(model_path))
+                },
+                artifact_path=model_path,
+            )
         
         return {
             "status": "success",
@@ -167,15 +361,17 @@ class MLService:
     
     def _get_anomaly_detector(self, tenant_id: str) -> Optional[AnomalyDetector]:
         """Get cached or load anomaly detector."""
-        if tenant_id in self._anomaly_detectors:
-            return self._anomaly_detectors[tenant_id]
+        cached = self._anomaly_detectors.get(tenant_id)
+        if cached is not None:
+            return cached
         
         # Try to load from disk
         tenant_dir = self._get_tenant_dir(tenant_id)
         latest_path = tenant_dir / "anomaly_detector_latest.joblib"
         
         if latest_path.exists():
-            detector = AnomalyDetector.load(str(latest_path))
+            # Memory-mapped so processes serving the same tenant share pages
+            detector = AnomalyDetector.load(str(latest_path), mmap_mode="r")
             self._anomaly_detectors[tenant_id] = detector
             return detector
         
@@ -208,7 +404,7 @@ class MLService:
         Returns:
             Training results
         """
-        version = version or datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        version = version or _new_version()
         
         logger.info(f"Training RUL forecaster for tenant {tenant_id}")
         
@@ -227,27 +423,28 @@ class MLService:
         model_path = tenant_dir / f"rul_forecaster_{version}.pt"
         forecaster.save(str(model_path))
         
-        # Also save as latest
-        latest_path = tenant_dir / "rul_forecaster_latest.pt"
-        forecaster.save(str(latest_path))
+        # Also publish as latest
+        self._publish_latest(model_path, tenant_dir / "rul_forecaster_latest.pt")
         
         # Cache
         self._rul_forecasters[tenant_id] = forecaster
         
         # Log to MLflow
         if HAS_MLFLOW:
-            with mlflow.start_run(run_name=f"rul_forecaster_{tenant_id}"):
-                mlflow.log_params({
+            self._log_mlflow_run(
+                run_name=f"rul_forecaster_{tenant_id}",
+                params={
                     "tenant_id": tenant_id,
                     "sequence_length": sequence_length,
                     "epochs": epochs,
                     "n_features": len(feature_columns),
-                })
-                mlflow.log_metrics({
+                },
+                metrics={
                     "final_train_loss": forecaster.training_stats.get("final_train_loss", 0),
                     "final_val_loss": forecaster.training_stats.get("final_val_loss", 0),
-                })
-                mlflow.log_artifact(str(model_path))
+                },
+                artifact_path=model_path,
+            )
         
         return {
             "status": "success",
@@ -282,10 +479,21 @@ class MLService:
         
         return forecaster.predict(sequences, return_confidence=True)
     
+    def rul_sequence_length(self, tenant_id: str) -> Optional[int]:
+        """Sequence length the tenant's RUL forecaster expects (None if no model)."""
+        forecaster = self._get_rul_forecaster(tenant_id)
+        return forecaster.sequence_length if forecaster is not None else None
+    
+    def rul_feature_names(self, tenant_id: str) -> Optional[List[str]]:
+        """Feature columns, in order, the tenant's RUL forecaster expects."""
+        forecaster = self._get_rul_forecaster(tenant_id)
+        return forecaster.feature_names if forecaster is not None else None
+    
     def _get_rul_forecaster(self, tenant_id: str) -> Optional[RULForecaster]:
         """Get cached or load RUL forecaster."""
-        if tenant_id in self._rul_forecasters:
-            return self._rul_forecasters[tenant_id]
+        cached = self._rul_forecasters.get(tenant_id)
+        if cached is not None:
+            return cached
         
         tenant_dir = self._get_tenant_dir(tenant_id)
         latest_path = tenant_dir / "rul_forecaster_latest.pt"
@@ -318,7 +526,7 @@ class MLService:
         Returns:
             Training results with cluster information
         """
-        version = version or datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        version = version or _new_version()
         
         logger.info(f"Training log analyzer for tenant {tenant_id}")
         
@@ -332,11 +540,12 @@ class MLService:
         # Save model
         tenant_dir = self._get_tenant_dir(tenant_id)
         model_path = tenant_dir / f"log_analyzer_{version}.joblib"
-        analyzer.save(str(model_path))
+        # The pickled HDBSCAN clusterer dominates the file and compresses
+        # ~100x; the embeddings sidecar stays uncompressed for mmap
+        analyzer.save(str(model_path), compress=("zlib", 3))
         
-        # Also save as latest
-        latest_path = tenant_dir / "log_analyzer_latest.joblib"
-        analyzer.save(str(latest_path))
+        # Also publish as latest
+        self._publish_latest(model_path, tenant_dir / "log_analyzer_latest.joblib")
         
         # Cache
         self._log_analyzers[tenant_id] = analyzer
@@ -382,13 +591,15 @@ class MLService:
     
     def _get_log_analyzer(self, tenant_id: str) -> Optional[LogAnalyzer]:
         """Get cached or load log analyzer."""
-        if tenant_id in self._log_analyzers:
-            return self._log_analyzers[tenant_id]
+        cached = self._log_analyzers.get(tenant_id)
+        if cached is not None:
+            return cached
         
         tenant_dir = self._get_tenant_dir(tenant_id)
         latest_path = tenant_dir / "log_analyzer_latest.joblib"
         
         if latest_path.exists():
+            # Compressed, so not memory-mapped (the embeddings file still is)
             analyzer = LogAnalyzer.load(str(latest_path))
             self._log_analyzers[tenant_id] = analyzer
             return analyzer
@@ -431,14 +642,21 @@ class MLService:
             "overall_risk": "normal",
         }
         
-        # Anomaly detection
+        # Log analysis runs on a worker thread while the numeric models score
+        log_future = None
+        if logs:
+            log_future = self._get_executor().submit(self.analyze_logs, tenant_id, logs)
+        
+        # Anomaly detection. Scores are normalized over the whole batch, so
+        # every row is scored, but only the reported (first) row is explained
         try:
-            anomaly_result = self.predict_anomalies(tenant_id, metrics, with_explanation=True)
-            if "error" not in anomaly_result.get("status", ""):
+            detector = self._get_anomaly_detector(tenant_id)
+            if detector is not None:
+                anomaly_result = detector.predict_with_explanation(metrics, explain_rows=[0])
                 result["anomaly"] = {
-                    "score": anomaly_result.get("anomaly_scores", [0])[0],
-                    "risk_level": anomaly_result.get("risk_levels", ["normal"])[0],
-                    "top_features": anomaly_result.get("explanations", [{}])[0].get("top_features", []),
+                    "score": anomaly_result["anomaly_scores"][0],
+                    "risk_level": anomaly_result["risk_levels"][0],
+                    "top_features": anomaly_result["explanations"][0]["top_features"],
                 }
         except Exception as e:
             logger.warning(f"Anomaly detection failed: {e}")
@@ -457,10 +675,9 @@ class MLService:
         except Exception as e:
             logger.warning(f"RUL prediction failed: {e}")
         
-        # Log analysis
-        if logs:
+        if log_future is not None:
             try:
-                log_result = self.analyze_logs(tenant_id, logs)
+                log_result = log_future.result()
                 if "error" not in log_result.get("status", ""):
                     result["logs"] = {
                         "num_clusters": log_result.get("num_clusters", 0),
@@ -470,20 +687,9 @@ class MLService:
                 logger.warning(f"Log analysis failed: {e}")
         
         # Determine overall risk
-        risks = []
-        if result["anomaly"]:
-            risks.append(result["anomaly"]["risk_level"])
-        if result["rul"] and result["rul"]["estimate"]:
-            if result["rul"]["estimate"] < 10:
-                risks.append("critical")
-            elif result["rul"]["estimate"] < 50:
-                risks.append("warning")
-        
-        if "critical" in risks:
-            result["overall_risk"] = "critical"
-        elif "warning" in risks:
-            result["overall_risk"] = "warning"
-        else:
-            result["overall_risk"] = "normal"
+        result["overall_risk"] = str(overall_risk_levels(
+            [result["anomaly"]["risk_level"] if result["anomaly"] else None],
+            [result["rul"]["estimate"] if result["rul"] else None],
+        )[0])
         
         return result